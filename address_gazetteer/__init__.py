@@ -0,0 +1,24 @@
+"""
+address_gazetteer - Japanese municipality gazetteer
+
+A bundled list of every prefecture → (county) → city/ward/town/village name
+in Japan, used to check that an extracted or compared address starts with a
+real municipality (and to reject regex candidates such as "東京都内の各区").
+
+The data file (municipalities.txt) is a sorted list of lookup keys.  It is
+memory-mapped on first use and searched with a binary search, so loading is
+lazy and the resident memory is only the pages a lookup touches.
+
+Example:
+    >>> from address_gazetteer import known_prefix, is_municipality
+    >>> known_prefix("東京都渋谷区道玄坂1-2-3")
+    '東京都渋谷区'
+    >>> is_municipality("六戸町", prefecture="青森県")
+    True
+    >>> known_prefix("東京都内の各区") is None
+    True
+"""
+
+from .gazetteer import Gazetteer, get_gazetteer, is_municipality, known_prefix, normalize_name
+
+__all__ = ['Gazetteer', 'get_gazetteer', 'is_municipality', 'known_prefix', 'normalize_name']
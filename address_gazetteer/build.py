@@ -0,0 +1,76 @@
+"""Build municipalities.txt from Japan Post's KEN_ALL postal code data.
+
+Download utf_ken_all.zip (UTF-8) or ken_all.zip (Shift_JIS) from
+https://www.post.japanpost.jp/zipcode/download.html, unzip it and run:
+
+    python -m address_gazetteer.build utf_ken_all.csv
+    python -m address_gazetteer.build KEN_ALL.CSV --encoding cp932
+
+Columns used: 7 (prefecture) and 8 (city/ward/town/village, including the
+county for towns and villages and the ward for designated cities).
+
+Japan Post does not claim copyright on the postal code data and allows it
+to be redistributed freely.
+"""
+
+import argparse
+import csv
+import re
+import sys
+
+from .gazetteer import DATA_PATH, WITH_PREFECTURE, WITHOUT_PREFECTURE, normalize_name
+
+# "上北郡六戸町" → ("上北郡", "六戸町"); "大阪市北区" → ("大阪市", "北区")
+_COUNTY_RE = re.compile(r'^(.+?郡)(.+[町村])$')
+_WARD_RE = re.compile(r'^(.+?市)(.+区)$')
+# Tokyo island municipalities listed under their island: "三宅島三宅村" → "三宅村"
+_ISLAND_RE = re.compile(r'^(.+)島(\1[町村])$')
+
+
+def municipality_names(city: str) -> set:
+    """Every form of a KEN_ALL city name that an address may start with."""
+    names = {city}
+    county = _COUNTY_RE.match(city)
+    if county:
+        names.add(county.group(2))
+    ward = _WARD_RE.match(city)
+    if ward:
+        names.add(ward.group(1))
+    island = _ISLAND_RE.match(city)
+    if island:
+        names.add(island.group(2))
+    return names
+
+
+def build_keys(rows) -> list:
+    """Sorted data file keys for (prefecture, city) rows."""
+    keys = set()
+    for prefecture, city in rows:
+        for name in municipality_names(city):
+            keys.add(f'{WITH_PREFECTURE}\t{normalize_name(prefecture + name)}')
+            keys.add(f'{WITHOUT_PREFECTURE}\t{normalize_name(name)}')
+    return sorted(keys, key=lambda key: key.encode('utf-8'))
+
+
+def read_ken_all(path: str, encoding: str):
+    with open(path, encoding=encoding, newline='') as f:
+        for row in csv.reader(f):
+            yield row[6], row[7]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Build the municipality gazetteer from KEN_ALL.CSV')
+    parser.add_argument('ken_all', help='Path to utf_ken_all.csv / KEN_ALL.CSV')
+    parser.add_argument('--encoding', default='utf-8', help='CSV encoding (cp932 for KEN_ALL.CSV)')
+    parser.add_argument('--output', default=DATA_PATH, help='Output file')
+    args = parser.parse_args()
+
+    keys = build_keys(read_ken_all(args.ken_all, args.encoding))
+    with open(args.output, 'w', encoding='utf-8', newline='\n') as f:
+        f.write('\n'.join(keys) + '\n')
+    print(f'{len(keys)} keys written to {args.output}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
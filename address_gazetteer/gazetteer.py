@@ -0,0 +1,141 @@
+"""Memory-mapped municipality gazetteer.
+
+municipalities.txt holds one UTF-8 key per line, sorted by bytes:
+
+    1<TAB><prefecture><county?><municipality>   e.g. "1\t青森県上北郡六戸町"
+    2<TAB><county?><municipality>               e.g. "2\t上北郡六戸町"
+
+Municipality names are stored with and without their county
+("青森県六戸町"), and wards of designated cities are stored with and without
+the ward ("大阪府大阪市北区", "大阪府大阪市").  Keys are normalized with
+normalize_name(), so "茅ヶ崎市" and "茅ケ崎市" are the same entry.
+
+Regenerate the file with build.py from Japan Post's KEN_ALL data.
+"""
+
+import mmap
+import os
+import threading
+import unicodedata
+from typing import Optional
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'municipalities.txt')
+
+# Namespaces of the keys in the data file
+WITH_PREFECTURE = '1'
+WITHOUT_PREFECTURE = '2'
+
+_SUFFIXES = frozenset('市区町村')
+_VARIANTS = str.maketrans({'ヶ': 'ケ', 'ヵ': 'カ'})
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a place name for lookups (NFKC, no whitespace, ヶ/ヵ → ケ/カ)."""
+    return unicodedata.normalize('NFKC', ''.join(name.split())).translate(_VARIANTS)
+
+
+class Gazetteer:
+    """
+    Lookups in a sorted key file, memory-mapped on first use.
+
+    Args:
+        path: Data file (default: the bundled municipalities.txt).
+    """
+
+    def __init__(self, path: str = DATA_PATH):
+        self.path = path
+        self._map: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+
+    def _data(self) -> mmap.mmap:
+        if self._map is None:
+            with self._lock:
+                if self._map is None:
+                    with open(self.path, 'rb') as f:
+                        self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _contains(self, key: str) -> bool:
+        """Binary search for a whole line equal to *key*."""
+        data = self._data()
+        target = key.encode('utf-8')
+        lo, hi = 0, len(data)
+        # lo and hi are always line starts
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = data.rfind(b'\n', 0, mid) + 1
+            end = data.find(b'\n', start)
+            if end < 0:
+                end = len(data)
+            line = data[start:end]
+            if line == target:
+                return True
+            if line < target:
+                lo = end + 1
+            else:
+                hi = start
+        return False
+
+    def is_municipality(self, name: str, prefecture: Optional[str] = None) -> bool:
+        """
+        True if *name* (optionally with its county) is a municipality.
+
+        Args:
+            name: City/ward/town/village name, e.g. "六戸町", "上北郡六戸町"
+                or "大阪市北区".
+            prefecture: Restrict the lookup to this prefecture.
+        """
+        if prefecture:
+            return self._contains(f'{WITH_PREFECTURE}\t{normalize_name(prefecture + name)}')
+        return self._contains(f'{WITHOUT_PREFECTURE}\t{normalize_name(name)}')
+
+    def known_prefix(self, address: str) -> Optional[str]:
+        """
+        Return the longest prefix of *address* that is a known municipality.
+
+        The prefix may start with a prefecture ("東京都渋谷区") or not
+        ("渋谷区").  Only prefixes ending in 市/区/町/村 are looked up, so the
+        cost is a few binary searches per address.
+
+        Args:
+            address: Address string, e.g. "東京都渋谷区道玄坂1-2-3".
+
+        Returns:
+            The normalized municipality prefix, or None.
+        """
+        normalized = normalize_name(address)
+        for end in range(len(normalized), 0, -1):
+            if normalized[end - 1] not in _SUFFIXES:
+                continue
+            prefix = normalized[:end]
+            if (self._contains(f'{WITH_PREFECTURE}\t{prefix}')
+                    or self._contains(f'{WITHOUT_PREFECTURE}\t{prefix}')):
+                return prefix
+        return None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+
+_default: Optional[Gazetteer] = None
+
+
+def get_gazetteer() -> Gazetteer:
+    """The shared Gazetteer over the bundled data file."""
+    global _default
+    if _default is None:
+        _default = Gazetteer()
+    return _default
+
+
+def is_municipality(name: str, prefecture: Optional[str] = None) -> bool:
+    """Gazetteer.is_municipality() on the bundled data."""
+    return get_gazetteer().is_municipality(name, prefecture)
+
+
+def known_prefix(address: str) -> Optional[str]:
+    """Gazetteer.known_prefix() on the bundled data."""
+    return get_gazetteer().known_prefix(address)
@@ -0,0 +1,76 @@
+"""Tests for address_gazetteer."""
+
+import pytest
+
+from address_gazetteer import Gazetteer, is_municipality, known_prefix, normalize_name
+from address_gazetteer.build import build_keys, municipality_names
+
+
+class TestBundledGazetteer:
+    """Lookups in the bundled municipalities.txt."""
+
+    @pytest.mark.parametrize("address,prefix", [
+        ("東京都渋谷区道玄坂1-2-3", "東京都渋谷区"),
+        ("青森県上北郡六戸町大字犬落瀬", "青森県上北郡六戸町"),
+        ("青森県六戸町", "青森県六戸町"),
+        ("大阪府大阪市北区梅田2-4-9", "大阪府大阪市北区"),
+        ("大阪府大阪市", "大阪府大阪市"),
+        ("札幌市中央区北1条西2丁目", "札幌市中央区"),
+        ("神奈川県茅ヶ崎市", "神奈川県茅ケ崎市"),
+        ("東京都　港区芝公園4-2-8", "東京都港区"),
+        ("東京都三宅村阿古", "東京都三宅村"),
+        ("東京都三宅島三宅村阿古", "東京都三宅島三宅村"),
+        ("八丈町大賀郷", "八丈町"),
+    ])
+    def test_known_prefix(self, address, prefix):
+        assert known_prefix(address) == prefix
+
+    @pytest.mark.parametrize("address", ["東京都内の各区", "住所東京都港区", "今日の市", ""])
+    def test_unknown(self, address):
+        assert known_prefix(address) is None
+
+    def test_is_municipality(self):
+        assert is_municipality("六戸町", prefecture="青森県")
+        assert is_municipality("上北郡六戸町")
+        assert not is_municipality("六戸町", prefecture="東京都")
+        assert not is_municipality("内の各区")
+
+    def test_every_prefecture_has_municipalities(self):
+        from extract_full_address_tool.extract import PREFECTURES
+        with open(Gazetteer().path, encoding="utf-8") as f:
+            keys = f.read().splitlines()
+        for prefecture in PREFECTURES:
+            assert any(k.startswith(f"1\t{prefecture}") for k in keys), prefecture
+
+
+class TestBuild:
+    """Key generation and the sorted-file binary search."""
+
+    def test_municipality_names(self):
+        assert municipality_names("上北郡六戸町") == {"上北郡六戸町", "六戸町"}
+        assert municipality_names("大阪市北区") == {"大阪市北区", "大阪市"}
+        assert municipality_names("渋谷区") == {"渋谷区"}
+        assert municipality_names("三宅島三宅村") == {"三宅島三宅村", "三宅村"}
+        assert municipality_names("御蔵島村") == {"御蔵島村"}
+
+    def test_every_key_is_found(self, tmp_path):
+        rows = [("青森県", "上北郡六戸町"), ("大阪府", "大阪市北区"), ("東京都", "渋谷区"), ("千葉県", "鎌ヶ谷市")]
+        keys = build_keys(rows)
+        path = tmp_path / "municipalities.txt"
+        path.write_text("\n".join(keys) + "\n", encoding="utf-8")
+        gazetteer = Gazetteer(str(path))
+        for prefecture, city in rows:
+            for name in municipality_names(city):
+                assert gazetteer.is_municipality(name, prefecture)
+                assert gazetteer.is_municipality(name)
+        assert gazetteer.is_municipality("鎌ケ谷市")
+        assert not gazetteer.is_municipality("港区")
+        assert not gazetteer.is_municipality("北区", "大阪府")
+        gazetteer.close()
+
+    def test_normalize_name(self):
+        assert normalize_name("茅ヶ崎 市") == normalize_name("茅ケ崎市") == "茅ケ崎市"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
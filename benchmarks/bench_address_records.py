@@ -0,0 +1,80 @@
+"""Benchmark: Address records vs JSON round trips for in-process callers.
+
+For pages with many addresses, compares
+  - json.loads(extract_full_addresses(text)) (the previous
+    extract_full_addresses_list) with extract_full_addresses_list(text),
+  - json.loads(extract_full_addresses_detailed(text)) with
+    extract_address_records(text),
+and prints the time per page, the peak memory allocated during the call
+(tracemalloc) and the memory retained by the result.
+
+Usage:
+    python benchmarks/bench_address_records.py
+    python benchmarks/bench_address_records.py --addresses 5000 --repeat 10
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from extract_full_address_tool import extract  # noqa: E402
+
+TSV_PATH = PROJECT_ROOT / "tests" / "resource" / "sample_from_scuel.tsv"
+
+
+def address_page(addresses, seed=0):
+    """A page listing *addresses* facilities (e.g. a store locator)."""
+    rng = random.Random(seed)
+    with open(TSV_PATH, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f, delimiter="\t"))
+    lines = []
+    for i in range(addresses):
+        row = rng.choice(rows)
+        lines.append(f"店舗{i} 所在地 {row['都道府県']}{row['住所']}{i}号 TEL 03-0000-0000")
+    return "\n".join(lines)
+
+
+def bench(func, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = func(text)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, retained, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Address records vs JSON round trips")
+    parser.add_argument("--addresses", type=int, default=2000, help="Addresses on the page")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    text = address_page(args.addresses)
+    cases = [
+        ("list via JSON round trip", lambda t: json.loads(extract.extract_full_addresses(t))),
+        ("extract_full_addresses_list", extract.extract_full_addresses_list),
+        ("detailed via JSON round trip", lambda t: json.loads(extract.extract_full_addresses_detailed(t))),
+        ("extract_address_records", extract.extract_address_records),
+    ]
+    print(f"{len(text):,} chars, {args.addresses} addresses")
+    print(f"{'':30s} {'ms':>8s} {'peak KiB':>10s} {'result KiB':>11s} {'items':>6s}")
+    for name, func in cases:
+        elapsed, peak, retained, items = bench(func, text, args.repeat)
+        print(f"{name:30s} {elapsed * 1000:8.2f} {peak / 1024:10.1f} {retained / 1024:11.1f} {items:6d}")
+
+
+if __name__ == "__main__":
+    main()
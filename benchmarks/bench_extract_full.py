@@ -0,0 +1,122 @@
+"""Benchmark: extract_full_addresses with and without the run pre-filter.
+
+Compares the current implementation (scan only runs that contain 市/区/町/村)
+with the previous one (re.finditer over the whole text), checks that both
+return identical results, and prints the time per page.
+
+Usage:
+    python benchmarks/bench_extract_full.py                 # synthetic pages
+    python benchmarks/bench_extract_full.py page1.txt ...   # real page dumps
+    python benchmarks/bench_extract_full.py --repeat 20
+
+Page dumps are the plain text of rendered pages, e.g.
+    python playwright_download_tool/download.py https://example.com > page1.txt
+"""
+
+import argparse
+import csv
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from extract_full_address_tool import extract  # noqa: E402
+
+TSV_PATH = PROJECT_ROOT / "tests" / "resource" / "sample_from_scuel.tsv"
+
+FILLER = [
+    "ホーム", "診療科のご案内", "外来受診について", "お知らせ", "アクセス", "採用情報",
+    "当院は地域の皆様に信頼される医療を提供することを目指しています",
+    "受付時間 8時30分から11時まで", "休診日 土曜日 日曜日 祝日", "Copyright 2024 All Rights Reserved",
+    "新型コロナウイルス感染症に関するお知らせ", "交通案内 最寄り駅から徒歩5分",
+    "駐車場のご案内", "個人情報保護方針", "サイトマップ", "お問い合わせ", "TEL 011-611-2111",
+    "病院長あいさつ", "理念と基本方針", "医療安全管理指針", "地域医療連携室",
+]
+
+
+def reference_extract(text):
+    """Previous implementation: scan the whole text."""
+    addresses = []
+    seen = set()
+    for match in extract.BASIC_REGEX.finditer(text):
+        address = match.group(0)
+        if address not in seen:
+            addresses.append(address)
+            seen.add(address)
+    return addresses
+
+
+def current_extract(text):
+    """Current implementation without the JSON round trip."""
+    addresses = []
+    seen = set()
+    for match in extract._iter_matches(extract.BASIC_REGEX, text):
+        address = match.group(0)
+        if address not in seen:
+            addresses.append(address)
+            seen.add(address)
+    return addresses
+
+
+def synthetic_pages(count=20, size=200_000, seed=0):
+    """Page-like texts: navigation/body filler with facility addresses mixed in."""
+    rng = random.Random(seed)
+    with open(TSV_PATH, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f, delimiter="\t"))
+    pages = []
+    for _ in range(count):
+        parts = []
+        length = 0
+        while length < size:
+            if rng.random() < 0.05:
+                row = rng.choice(rows)
+                part = f"所在地 {row['都道府県']}{row['住所']}"
+            else:
+                part = rng.choice(FILLER)
+            parts.append(part)
+            length += len(part) + 1
+        pages.append("\n".join(parts))
+    return pages
+
+
+def bench(func, pages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            func(page)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extract_full_addresses pre-filter")
+    parser.add_argument("pages", nargs="*", help="Plain-text page dumps (default: synthetic pages)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = [Path(p).read_text(encoding="utf-8") for p in args.pages]
+        source = f"{len(pages)} page dumps"
+    else:
+        pages = synthetic_pages()
+        source = f"{len(pages)} synthetic pages"
+
+    for page in pages:
+        if current_extract(page) != reference_extract(page):
+            print("MISMATCH: results differ from the reference implementation", file=sys.stderr)
+            sys.exit(1)
+
+    chars = sum(len(p) for p in pages) / len(pages)
+    ref = bench(reference_extract, pages, args.repeat)
+    cur = bench(current_extract, pages, args.repeat)
+    print(f"{source}, {chars:,.0f} chars/page, results identical")
+    print(f"reference (whole text): {ref * 1000:8.2f} ms/page")
+    print(f"current   (pre-filter): {cur * 1000:8.2f} ms/page  ({ref / cur:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
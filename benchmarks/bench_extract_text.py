@@ -0,0 +1,87 @@
+"""Benchmark: extract_text throughput per backend (bs4 vs lxml).
+
+Builds large portal-style pages (navigation, store tables, inline markup,
+scripts and styles), checks that every backend returns the same text as the
+bs4 backend, and prints the throughput in MB of HTML per second.
+
+Usage:
+    python benchmarks/bench_extract_text.py                   # synthetic pages
+    python benchmarks/bench_extract_text.py page1.html ...    # saved pages
+    python benchmarks/bench_extract_text.py --repeat 10
+
+Saved pages are raw HTML, e.g.
+    python playwright_download_tool/download.py https://example.com --format=html > page1.html
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "playwright_download_tool"))
+
+from extract import BACKENDS, extract_text  # noqa: E402
+
+PREFECTURES = ["東京都港区芝公園", "大阪府大阪市北区梅田", "北海道札幌市中央区北1条西", "福岡県福岡市博多区博多駅前"]
+
+NAV = "".join(f'<li><a href="/menu/{i}">メニュー{i}</a></li>\n' for i in range(200))
+
+
+def synthetic_page(rng, stores):
+    """A portal page listing *stores* stores (about 150 bytes of HTML each)."""
+    rows = []
+    for i in range(stores):
+        address = f"{rng.choice(PREFECTURES)}{rng.randint(1, 9)}丁目{rng.randint(1, 30)}番{rng.randint(1, 20)}号"
+        rows.append(
+            f'<tr class="store">\n  <td class="name"><a href="/store/{i}">店舗 {i}</a></td>\n'
+            f'  <td><span class="addr">{address}</span>&nbsp;<br>\n'
+            f'  TEL <b>03-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}</b></td>\n</tr>\n'
+        )
+    return (
+        "<!DOCTYPE html>\n<html lang=\"ja\"><head><meta charset=\"utf-8\"><title>店舗一覧</title>\n"
+        "<style>.store td { padding: 4px }</style>\n"
+        "<script>window.dataLayer = window.dataLayer || [];</script></head>\n"
+        f"<body><!-- header --><nav><ul>\n{NAV}</ul></nav>\n"
+        f"<main><h1>店舗一覧</h1>\n<table>\n{''.join(rows)}</table></main>\n"
+        "<footer><p>Copyright &copy; 2024 Example Inc.  All Rights Reserved.</p></footer></body></html>"
+    )
+
+
+def mb_per_second(html, backend, repeat):
+    size = len(html.encode("utf-8")) / 1e6
+    start = time.perf_counter()
+    for _ in range(repeat):
+        extract_text(html, backend=backend)
+    return size * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extract_text backends")
+    parser.add_argument("pages", nargs="*", help="HTML files (default: synthetic pages)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per page and backend")
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = [(Path(p).name, Path(p).read_text(encoding="utf-8", errors="replace")) for p in args.pages]
+    else:
+        rng = random.Random(0)
+        pages = [(f"{stores} stores", synthetic_page(rng, stores)) for stores in (100, 1000, 5000)]
+
+    for name, html in pages:
+        expected = extract_text(html, backend="bs4")
+        for backend in BACKENDS:
+            if extract_text(html, backend=backend) != expected:
+                print(f"{name}: {backend} output differs from bs4 (invalid markup?)", file=sys.stderr)
+
+    print(f"{'':16s} {'KB':>7s} " + " ".join(f"{b + ' MB/s':>10s}" for b in BACKENDS) + f" {'speedup':>8s}")
+    for name, html in pages:
+        rates = [mb_per_second(html, backend, args.repeat) for backend in BACKENDS]
+        size_kb = len(html.encode("utf-8")) / 1e3
+        print(f"{name:16s} {size_kb:7.0f} " + " ".join(f"{r:10.2f}" for r in rates)
+              + f" {rates[-1] / rates[0]:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark: normalize_many vs a normalize_address loop over a column.
+
+Normalizes a column of facility addresses (with full-width digits, kanji
+numerals, spaces and missing values) row by row and in bulk, checks that both
+give identical results, and prints rows per second.
+
+Usage:
+    python benchmarks/bench_normalize.py
+    python benchmarks/bench_normalize.py --rows 1000000 --repeat 3
+"""
+
+import argparse
+import csv
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from compare_address_full_tool import normalize_address, normalize_many  # noqa: E402
+
+TSV_PATH = PROJECT_ROOT / "tests" / "resource" / "sample_from_scuel.tsv"
+
+FULL_WIDTH = str.maketrans("0123456789-", "０１２３４５６７８９－")
+
+
+def address_column(rows, seed=0):
+    """A column of *rows* addresses written in the usual mix of styles."""
+    rng = random.Random(seed)
+    with open(TSV_PATH, encoding="utf-8") as f:
+        facilities = list(csv.DictReader(f, delimiter="\t"))
+    column = []
+    for i in range(rows):
+        if rng.random() < 0.02:
+            column.append(None)
+            continue
+        row = rng.choice(facilities)
+        address = f"{row['都道府県']}{row['住所']}"
+        style = i % 4
+        if style == 1:
+            address = address.translate(FULL_WIDTH)
+        elif style == 2:
+            address = f"{row['都道府県']}　{row['住所']}{rng.randint(1, 30)}番{rng.randint(1, 20)}号"
+        elif style == 3:
+            address = f"{address} {rng.choice(['一', '二', '三'])}丁目"
+        column.append(address)
+    return column
+
+
+def loop_normalize(column):
+    return [None if address is None else normalize_address(address) for address in column]
+
+
+def bench(func, column, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(column)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk address normalization")
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows in the column")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    column = address_column(args.rows)
+    if normalize_many(column) != loop_normalize(column):
+        print("MISMATCH: normalize_many differs from normalize_address", file=sys.stderr)
+        sys.exit(1)
+
+    loop = bench(loop_normalize, column, args.repeat)
+    bulk = bench(normalize_many, column, args.repeat)
+    print(f"{args.rows:,} rows, results identical")
+    print(f"normalize_address loop: {args.rows / loop:12,.0f} rows/s")
+    print(f"normalize_many:         {args.rows / bulk:12,.0f} rows/s  ({loop / bulk:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark: fused normalize_address vs the previous step-by-step chain.
+
+The previous implementation made about nine string copies per call
+(split/join, NFKC, replace, kanji substitution, five banchi substitutions,
+lower()).  The current one folds whitespace, width, U+2212 and case in one
+str.translate and only runs the passes an address needs.  Checks that both
+give identical results on the address variants and prints the time per call.
+
+Usage:
+    python benchmarks/bench_normalize_address.py
+    python benchmarks/bench_normalize_address.py --calls 200000
+"""
+
+import argparse
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from compare_address_full_tool import (  # noqa: E402
+    _BANCHI_PATTERNS,
+    _normalize_kanji_numbers,
+    normalize_address,
+)
+
+ADDRESSES = [
+    ("hyphenated", "東京都港区芝公園4-2-8"),
+    ("full-width + U+2212", "東京都港区芝公園４丁目２−８"),
+    ("banchi notation", "東京都港区芝公園4丁目2番8号"),
+    ("kanji numerals", "東京都港区芝公園四丁目二番八号"),
+    ("spaces + building", "東京都 港区芝公園4-2-8 ABCビル 5F"),
+    ("city only", "東京都港区"),
+]
+
+
+def reference_normalize(address):
+    """Previous implementation: one full pass per step."""
+    normalized = "".join(address.split())
+    normalized = unicodedata.normalize("NFKC", normalized)
+    normalized = normalized.replace("\u2212", "-")
+    normalized = _normalize_kanji_numbers(normalized)
+    for pattern, replacement in _BANCHI_PATTERNS:
+        normalized = pattern.sub(replacement, normalized)
+    return normalized.lower()
+
+
+def per_call_us(func, address, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func(address)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fused normalize_address")
+    parser.add_argument("--calls", type=int, default=50000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    for _, address in ADDRESSES:
+        if normalize_address(address) != reference_normalize(address):
+            print(f"MISMATCH on {address!r}", file=sys.stderr)
+            sys.exit(1)
+
+    print(f"{'':22s} {'reference us':>12s} {'fused us':>9s} {'speedup':>8s}")
+    for label, address in ADDRESSES:
+        ref = per_call_us(reference_normalize, address, args.calls)
+        cur = per_call_us(normalize_address, address, args.calls)
+        print(f"{label:22s} {ref:12.2f} {cur:9.2f} {ref / cur:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
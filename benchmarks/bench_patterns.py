@@ -0,0 +1,97 @@
+"""Benchmark: address pattern compile (cold start) and per-call costs.
+
+Prints
+  - the time to compile each address pattern,
+  - the cold-start cost of a fresh interpreter importing each extractor
+    (what every subprocess pays once),
+  - the per-call cost of extracting from a short text with the module's
+    compiled pattern objects vs passing the pattern string to re.finditer
+    (re module cache lookup) and vs recompiling on every call (what happens
+    once the re cache has been evicted by other patterns).
+
+Usage:
+    python benchmarks/bench_patterns.py
+    python benchmarks/bench_patterns.py --calls 20000
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from extract_address_tool import extract as city_extract  # noqa: E402
+from extract_full_address_tool import extract as full_extract  # noqa: E402
+
+SHORT_TEXT = "本社は東京都渋谷区道玄坂1丁目2番3号です。支社は大阪府大阪市北区梅田2-4-9。"
+
+
+def compile_ms(pattern, repeat=5):
+    """Best time in ms to compile *pattern* without the re cache."""
+    best = float("inf")
+    for _ in range(repeat):
+        re.purge()
+        start = time.perf_counter()
+        re.compile(pattern)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def interpreter_ms(code, repeat=5):
+    """Best wall time in ms to run *code* in a fresh interpreter."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def per_call_us(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark address pattern compile and call costs")
+    parser.add_argument("--calls", type=int, default=5000, help="Calls per per-call measurement")
+    args = parser.parse_args()
+
+    print("Compile (ms):")
+    for name, pattern in [
+        ("extract_full_address_tool basic", full_extract._BASIC_PATTERN),
+        ("extract_full_address_tool detail", full_extract._DETAIL_PATTERN),
+        ("extract_full_address_tool city", full_extract._CITY_PATTERN),
+        ("extract_address_tool basic", city_extract._BASIC_PATTERN),
+        ("extract_address_tool detail", city_extract._DETAIL_PATTERN),
+    ]:
+        print(f"  {name:34s} {compile_ms(pattern):8.2f}")
+
+    print("Cold start in a fresh interpreter (ms):")
+    print(f"  {'python -c pass':34s} {interpreter_ms('pass'):8.2f}")
+    for module in ["extract_address_tool", "extract_full_address_tool"]:
+        print(f"  {'import ' + module:34s} {interpreter_ms(f'import {module}'):8.2f}")
+
+    print(f"Per call on a {len(SHORT_TEXT)}-character text (us):")
+    regex = full_extract.BASIC_REGEX
+    pattern = full_extract._BASIC_PATTERN
+    expected = regex.findall(SHORT_TEXT)
+    assert re.findall(pattern, SHORT_TEXT) == expected
+    print(f"  {'compiled pattern object':34s} {per_call_us(lambda: regex.findall(SHORT_TEXT), args.calls):8.2f}")
+    print(f"  {'pattern string (re cache hit)':34s} {per_call_us(lambda: re.findall(pattern, SHORT_TEXT), args.calls):8.2f}")
+
+    def recompile():
+        re.purge()
+        return re.findall(pattern, SHORT_TEXT)
+
+    print(f"  {'pattern string (re cache miss)':34s} {per_call_us(recompile, max(1, args.calls // 100)):8.2f}")
+
+
+if __name__ == "__main__":
+    main()
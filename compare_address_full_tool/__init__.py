@@ -0,0 +1,619 @@
+"""
+compare_address_full_tool - Japanese Full Address Comparison Tool
+
+Compares Japanese addresses including block/lot numbers (丁目・番地・号),
+normalizing:
+  - Full-width / half-width character differences (NFKC)
+  - Whitespace differences
+  - Kanji numeral vs Arabic numeral (一→1, 十一→11, ...)
+  - Banchi notation vs hyphenated notation (1丁目2番3号 ↔ 1-2-3)
+
+Matching strategy: prefix/containment matching.
+One address is considered a match if it is equal to, or a prefix of, the other
+after normalization.  This handles the common case where a web page carries only
+the prefecture+city portion of an address while the facility's full street-level
+address is known.
+"""
+
+import bisect
+import functools
+import re
+import unicodedata
+from typing import Iterable, Literal, NamedTuple, Optional, Sequence
+
+
+# ---------------------------------------------------------------------------
+# Kanji numeral conversion
+# ---------------------------------------------------------------------------
+
+_KANJI_DIGIT: dict[str, int] = {
+    '一': 1, '二': 2, '三': 3, '四': 4, '五': 5,
+    '六': 6, '七': 7, '八': 8, '九': 9,
+}
+_KANJI_MAG: dict[str, int] = {'十': 10, '百': 100, '千': 1000}
+_KANJI_NUM_RE = re.compile(r'[一二三四五六七八九十百千]+')
+
+
+def _kanji_to_int(s: str) -> int:
+    """Convert a kanji numeral string to an integer.
+
+    Examples:
+        '一' → 1, '十一' → 11, '二十三' → 23, '百五十' → 150
+    """
+    total = 0
+    current = 0
+    for ch in s:
+        if ch in _KANJI_DIGIT:
+            current = _KANJI_DIGIT[ch]
+        elif ch in _KANJI_MAG:
+            mag = _KANJI_MAG[ch]
+            total += (current if current else 1) * mag
+            current = 0
+    total += current
+    return total
+
+
+def _normalize_kanji_numbers(text: str) -> str:
+    """Replace kanji numeral sequences in *text* with Arabic numerals."""
+    return _KANJI_NUM_RE.sub(lambda m: str(_kanji_to_int(m.group(0))), text)
+
+
+# ---------------------------------------------------------------------------
+# Banchi notation normalization (丁目/番地/号 → hyphenated)
+# ---------------------------------------------------------------------------
+
+# Apply patterns from most specific to least specific.
+_BANCHI_PATTERNS = [
+    # 1丁目2番地3号 / 1丁目2番3号 → 1-2-3
+    (re.compile(r'(\d+)丁目(\d+)番地?(\d+)号'), r'\1-\2-\3'),
+    # 1丁目2-3 (丁目 then already-hyphenated part) → 1-2-3
+    (re.compile(r'(\d+)丁目(\d+)-(\d+)'), r'\1-\2-\3'),
+    # 1丁目2番地 / 1丁目2番 (no 号) → 1-2
+    (re.compile(r'(\d+)丁目(\d+)番地?'), r'\1-\2'),
+    # 2番地3号 / 2番3号 (no 丁目) → 2-3
+    (re.compile(r'(\d+)番地?(\d+)号'), r'\1-\2'),
+    # 1番地 / 1番 (banchi only) → 1
+    (re.compile(r'(\d+)番地?'), r'\1'),
+]
+
+
+def _normalize_banchi(text: str) -> str:
+    """Unify 丁目/番地/号 notation to hyphenated form.
+
+    The 丁目 patterns and the 番 patterns are only run when the text contains
+    that marker, so already hyphenated addresses are not scanned at all.
+    """
+    if '丁目' in text:
+        for pattern, replacement in _BANCHI_PATTERNS[:3]:
+            text = pattern.sub(replacement, text)
+    if '番' in text:
+        for pattern, replacement in _BANCHI_PATTERNS[3:]:
+            text = pattern.sub(replacement, text)
+    return text
+
+
+# ---------------------------------------------------------------------------
+# Character folding (single str.translate)
+# ---------------------------------------------------------------------------
+
+# Characters str.split() treats as whitespace
+_WHITESPACE_TABLE = dict.fromkeys(map(ord, (
+    '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680'
+    '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+    '\u2028\u2029\u202f\u205f\u3000'
+)))
+
+# Whitespace removal, full-width ASCII → half-width, U+2212 → '-' and ASCII
+# lowercasing in one pass; these give the same result as the NFKC/lower steps
+_FOLD_TABLE: dict[int, Optional[str]] = {
+    **{c: chr(c - 0xFEE0).lower() for c in range(0xFF01, 0xFF5F)},
+    **{c: chr(c).lower() for c in range(ord('A'), ord('Z') + 1)},
+    0x2212: '-',
+    **_WHITESPACE_TABLE,
+}
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def normalize_address(address: str) -> str:
+    """
+    Normalize a Japanese full address for comparison.
+
+    Normalization steps:
+    1. Remove all whitespace (including full-width spaces)
+    2. NFKC normalization (full-width → half-width, etc.)
+    3. Replace U+2212 MINUS SIGN with U+002D HYPHEN-MINUS
+    4. Convert kanji numerals to Arabic (一→1, 十一→11, …)
+    5. Convert 丁目/番地/号 notation to hyphenated form (1丁目2番3号→1-2-3)
+    6. Lowercase
+
+    Args:
+        address: The address string to normalize.
+
+    Returns:
+        Normalized address string.
+
+    Examples:
+        >>> normalize_address("東京都　渋谷区道玄坂１丁目２番３号")
+        '東京都渋谷区道玄坂1-2-3'
+        >>> normalize_address("東京都渋谷区道玄坂一丁目二番三号")
+        '東京都渋谷区道玄坂1-2-3'
+    """
+    if not isinstance(address, str):
+        raise TypeError(f"Address must be a string, got {type(address).__name__}")
+
+    # 1-3, 6. Whitespace, full-width ASCII, U+2212 and ASCII case in one pass
+    normalized = address.translate(_FOLD_TABLE)
+
+    if not normalized.isascii():
+        # 2-3. NFKC for what the table does not cover (half-width katakana,
+        #      compatibility characters, …); it may produce U+2212 again
+        normalized = unicodedata.normalize('NFKC', normalized).replace('\u2212', '-')
+        # 4. Kanji numerals → Arabic
+        normalized = _normalize_kanji_numbers(normalized)
+        # 6. Lowercase (non-ASCII letters; never affects the banchi patterns)
+        normalized = normalized.lower()
+
+    # 5. 丁目/番地/号 → hyphenated
+    return _normalize_banchi(normalized)
+
+
+# ---------------------------------------------------------------------------
+# Bulk normalization
+# ---------------------------------------------------------------------------
+
+# Joins the rows of a column; not whitespace, unchanged by NFKC and lower(),
+# and never part of a numeral or banchi match, so rows cannot affect each other
+_ROW_SEPARATOR = '\x00'
+
+
+def normalize_many(addresses: Sequence[Optional[str]], output: Optional[str] = None):
+    """
+    Normalize a whole column of addresses at once.
+
+    Gives the same result as normalize_address for every row, but runs each
+    normalization step once over the joined column instead of once per row:
+    one str.translate for whitespace/width/case, one NFKC pass, one regex
+    pass per numeral/banchi rule and one lower().  None values are kept.
+
+    Args:
+        addresses: Address strings (a list, tuple, NumPy array, pandas Series
+            or pyarrow Array); None for missing values.
+        output: None for a list, 'numpy' for a NumPy string array or 'arrow'
+            for a pyarrow string array (these need numpy / pyarrow).
+
+    Returns:
+        The normalized addresses, in input order.
+
+    Examples:
+        >>> normalize_many(["東京都　渋谷区道玄坂１丁目２番３号", None, "大阪府大阪市北区梅田二丁目4番9号"])
+        ['東京都渋谷区道玄坂1-2-3', None, '大阪府大阪市北区梅田2-4-9']
+    """
+    if output not in (None, 'numpy', 'arrow'):
+        raise ValueError(f"output must be None, 'numpy' or 'arrow', got {output!r}")
+    if hasattr(addresses, 'to_pylist'):  # pyarrow Array / ChunkedArray
+        addresses = addresses.to_pylist()
+    values = list(addresses)
+    rows = [value for value in values if value is not None]
+    for value in rows:
+        if not isinstance(value, str):
+            raise TypeError(f"Address must be a string, got {type(value).__name__}")
+
+    joined = _ROW_SEPARATOR.join(rows)
+    if joined.count(_ROW_SEPARATOR) != max(len(rows) - 1, 0):
+        # A row contains the separator itself: normalize row by row
+        normalized = [normalize_address(row) for row in rows]
+    elif rows:
+        joined = unicodedata.normalize('NFKC', joined.translate(_FOLD_TABLE)).replace('\u2212', '-')
+        joined = _normalize_banchi(_normalize_kanji_numbers(joined).lower())
+        normalized = joined.split(_ROW_SEPARATOR)
+    else:
+        normalized = []
+
+    it = iter(normalized)
+    result = [None if value is None else next(it) for value in values]
+
+    if output == 'numpy':
+        import numpy
+        string_dtype = getattr(getattr(numpy, 'dtypes', None), 'StringDType', None)
+        return numpy.array(result, dtype=string_dtype(na_object=None) if string_dtype else object)
+    if output == 'arrow':
+        import pyarrow
+        return pyarrow.array(result, type=pyarrow.string())
+    return result
+
+
+MatchType = Literal['exact', 'address1_is_prefix', 'address2_is_prefix', 'no_match']
+
+# Page addresses repeat across comparisons (and across pages of one site),
+# so their normalized forms are kept in a bounded LRU cache.
+NORMALIZE_CACHE_SIZE = 4096
+
+_normalize_cached = functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(normalize_address)
+
+
+def _match_type(n1: str, n2: str) -> MatchType:
+    """Match type of two normalized addresses."""
+    if n1 == n2:
+        return 'exact'
+    elif n1.startswith(n2):
+        return 'address2_is_prefix'
+    elif n2.startswith(n1):
+        return 'address1_is_prefix'
+    return 'no_match'
+
+
+def compare_addresses(address1: str, address2: str) -> bool:
+    """
+    Compare two Japanese addresses using prefix/containment matching.
+
+    Returns True when:
+    - The normalized addresses are identical (exact match), OR
+    - address1 is a prefix of address2 (address1 has less detail), OR
+    - address2 is a prefix of address1 (address2 has less detail)
+
+    This handles the common scenario where a web page only carries a
+    prefecture+city address while the target has a full street-level address.
+
+    Args:
+        address1: First address to compare.
+        address2: Second address to compare.
+
+    Returns:
+        True if the addresses are compatible, False otherwise.
+
+    Examples:
+        >>> compare_addresses("東京都渋谷区道玄坂1丁目2番3号", "東京都渋谷区道玄坂1-2-3")
+        True
+        >>> compare_addresses("東京都渋谷区道玄坂1丁目2番3号", "東京都渋谷区")
+        True
+        >>> compare_addresses("東京都渋谷区", "大阪府大阪市北区")
+        False
+    """
+    if not isinstance(address1, str):
+        raise TypeError(f"address1 must be a string, got {type(address1).__name__}")
+    if not isinstance(address2, str):
+        raise TypeError(f"address2 must be a string, got {type(address2).__name__}")
+
+    n1 = _normalize_cached(address1)
+    n2 = _normalize_cached(address2)
+
+    return n1 == n2 or n1.startswith(n2) or n2.startswith(n1)
+
+
+def get_normalized_diff(address1: str, address2: str) -> dict:
+    """
+    Return detailed comparison information between two addresses.
+
+    Args:
+        address1: First address to compare.
+        address2: Second address to compare.
+
+    Returns:
+        Dictionary containing:
+        - 'equal':               bool — True if addresses are compatible
+        - 'match_type':          str  — 'exact' | 'address1_is_prefix' |
+                                        'address2_is_prefix' | 'no_match'
+        - 'address1_original':   str  — Original first address
+        - 'address2_original':   str  — Original second address
+        - 'address1_normalized': str  — Normalized first address
+        - 'address2_normalized': str  — Normalized second address
+
+    Examples:
+        >>> r = get_normalized_diff("東京都渋谷区道玄坂1丁目2番3号", "東京都渋谷区")
+        >>> r['equal']
+        True
+        >>> r['match_type']
+        'address2_is_prefix'
+    """
+    n1 = normalize_address(address1)
+    n2 = normalize_address(address2)
+    match_type = _match_type(n1, n2)
+
+    return {
+        'equal': match_type != 'no_match',
+        'match_type': match_type,
+        'address1_original': address1,
+        'address2_original': address2,
+        'address1_normalized': n1,
+        'address2_normalized': n2,
+    }
+
+
+
+class AddressMatcher:
+    """
+    Compare one target address against many candidate addresses.
+
+    The target is normalized once when the matcher is built.  Candidates are
+    normalized through a bounded LRU cache (NORMALIZE_CACHE_SIZE entries)
+    shared by all matchers.  Matching is the same prefix/containment rule as
+    compare_addresses(target, candidate).
+
+    Args:
+        target: The address to match candidates against.
+
+    Examples:
+        >>> matcher = AddressMatcher("東京都渋谷区道玄坂1丁目2番3号")
+        >>> matcher.matches("東京都渋谷区道玄坂1-2-3")
+        True
+        >>> matcher.match_many(["東京都渋谷区", "大阪府大阪市北区"])
+        [True, False]
+    """
+
+    __slots__ = ('target', 'normalized')
+
+    def __init__(self, target: str):
+        if not isinstance(target, str):
+            raise TypeError(f"target must be a string, got {type(target).__name__}")
+        self.target = target
+        self.normalized = normalize_address(target)
+
+    def _normalize_candidate(self, candidate: str) -> str:
+        if not isinstance(candidate, str):
+            raise TypeError(f"candidate must be a string, got {type(candidate).__name__}")
+        return _normalize_cached(candidate)
+
+    def match_type(self, candidate: str) -> MatchType:
+        """Match type of (target, candidate), as in get_normalized_diff."""
+        return _match_type(self.normalized, self._normalize_candidate(candidate))
+
+    def matches(self, candidate: str) -> bool:
+        """True if *candidate* is compatible with the target."""
+        n = self._normalize_candidate(candidate)
+        return self.normalized == n or self.normalized.startswith(n) or n.startswith(self.normalized)
+
+    def match_many(self, candidates: Iterable[str]) -> list[bool]:
+        """Match every candidate; one bool per candidate, in order."""
+        return [self.matches(candidate) for candidate in candidates]
+
+
+# ---------------------------------------------------------------------------
+# One-to-many matching
+# ---------------------------------------------------------------------------
+
+class AddressMatch(NamedTuple):
+    """A candidate that matched the target (see match_any / best_match)."""
+    index: int               # Position of the candidate in the input
+    address: str             # The candidate address (original form)
+    match_type: MatchType    # 'exact' | 'address1_is_prefix' | 'address2_is_prefix'
+
+
+class AddressIndex:
+    """
+    Sorted-prefix index over candidate addresses for containment matching.
+
+    Candidates are normalized once.  A lookup finds, for a target address,
+    every candidate that equals it, is a prefix of it (one dict lookup per
+    prefix of the normalized target) or extends it (a bisect range over the
+    sorted normalized candidates), instead of comparing with each candidate.
+
+    Match types are from the target's point of view, as in
+    get_normalized_diff(target, candidate): 'address2_is_prefix' means the
+    candidate has less detail than the target.
+
+    Args:
+        candidates: Candidate addresses (e.g. the addresses found on a page).
+        validate: Leave out candidates that do not start with a real
+            municipality (checked against address_gazetteer).
+    """
+
+    def __init__(self, candidates: Iterable[str], validate: bool = False):
+        self.candidates = list(candidates)
+        self._positions: dict[str, list[int]] = {}
+        if validate:
+            from address_gazetteer import known_prefix
+        for i, candidate in enumerate(self.candidates):
+            if not isinstance(candidate, str):
+                raise TypeError(f"candidate must be a string, got {type(candidate).__name__}")
+            if validate and known_prefix(candidate) is None:
+                continue
+            self._positions.setdefault(_normalize_cached(candidate), []).append(i)
+        self._sorted = sorted(self._positions)
+
+    def lookup(self, target: str) -> list[AddressMatch]:
+        """Every candidate compatible with *target*, in input order."""
+        if not isinstance(target, str):
+            raise TypeError(f"target must be a string, got {type(target).__name__}")
+        n = normalize_address(target)
+        found: list[tuple[int, MatchType]] = []
+
+        # Candidates equal to the target or a prefix of it
+        for length in range(len(n) + 1):
+            match_type: MatchType = 'exact' if length == len(n) else 'address2_is_prefix'
+            found.extend((i, match_type) for i in self._positions.get(n[:length], ()))
+
+        # Candidates the target is a prefix of: a contiguous sorted range
+        pos = bisect.bisect_right(self._sorted, n)
+        while pos < len(self._sorted) and self._sorted[pos].startswith(n):
+            found.extend((i, 'address1_is_prefix') for i in self._positions[self._sorted[pos]])
+            pos += 1
+
+        found.sort()
+        return [AddressMatch(i, self.candidates[i], match_type) for i, match_type in found]
+
+
+_MATCH_TYPE_RANK = {'exact': 0, 'address1_is_prefix': 1, 'address2_is_prefix': 2}
+
+
+def _match_rank(match: AddressMatch) -> tuple:
+    """Sort key for best_match (smaller is better)."""
+    length = len(_normalize_cached(match.address))
+    if match.match_type == 'address2_is_prefix':
+        length = -length     # longer partial address = more of the target confirmed
+    return (_MATCH_TYPE_RANK[match.match_type], length, match.index)
+
+
+def match_any(target: str, candidates: Iterable[str], validate: bool = False) -> Optional[AddressMatch]:
+    """
+    Return the first candidate (in input order) compatible with *target*.
+
+    Same result as calling compare_addresses(target, candidate) for each
+    candidate in turn and stopping at the first True, but every address is
+    normalized only once.
+
+    Args:
+        target: The address to match.
+        candidates: Candidate addresses.
+        validate: Ignore candidates that are not real municipalities
+            (see AddressIndex).
+
+    Returns:
+        AddressMatch(index, address, match_type), or None if nothing matches.
+
+    Examples:
+        >>> match_any("東京都渋谷区道玄坂1丁目2番3号", ["大阪府大阪市北区", "東京都渋谷区"])
+        AddressMatch(index=1, address='東京都渋谷区', match_type='address2_is_prefix')
+    """
+    matches = AddressIndex(candidates, validate).lookup(target)
+    return matches[0] if matches else None
+
+
+def best_match(target: str, candidates: Iterable[str], validate: bool = False) -> Optional[AddressMatch]:
+    """
+    Return the candidate that best matches *target*.
+
+    An exact match wins.  Next comes a candidate that contains the whole
+    target (the shortest such candidate), then the longest candidate that is
+    a prefix of the target.  Ties go to the earliest candidate.
+
+    Args:
+        target: The address to match.
+        candidates: Candidate addresses.
+        validate: Ignore candidates that are not real municipalities
+            (see AddressIndex).
+
+    Returns:
+        AddressMatch(index, address, match_type), or None if nothing matches.
+
+    Examples:
+        >>> best_match("東京都渋谷区道玄坂1丁目2番3号", ["東京都", "東京都渋谷区道玄坂1-2"])
+        AddressMatch(index=1, address='東京都渋谷区道玄坂1-2', match_type='address2_is_prefix')
+    """
+    matches = AddressIndex(candidates, validate).lookup(target)
+    return min(matches, key=_match_rank) if matches else None
+
+
+# ---------------------------------------------------------------------------
+# Canonical hierarchical key
+# ---------------------------------------------------------------------------
+
+class AddressKey(NamedTuple):
+    """
+    Canonical hierarchical key of an address (see address_key).
+
+    Keys can be hashed, compared and sorted; key[:1], key[:2] and key[:3]
+    group addresses by prefecture, city and town.  Missing parts are '' (names)
+    or 0 (numbers).
+    """
+    prefecture: str  # e.g. "東京都"
+    city: str        # City/ward/town/village without county, e.g. "渋谷区", "大阪市北区"
+    town: str        # e.g. "道玄坂", "北1条西"
+    chome: int       # First number of the hyphenated form
+    banchi: int      # Second number
+    go: int          # Third number
+
+
+_PREFECTURE_RE = re.compile(r'^(?:北海道|東京都|京都府|大阪府|.{2,3}?県)')
+# Used when the city is not in address_gazetteer
+_CITY_RE = re.compile(r'^(?:\D+?郡)?(?:\D+?市(?:\D+?区)?|\D+?[区町村])')
+_COUNTY_RE = re.compile(r'^.+?郡(?=.+[町村]$)')
+# Start of the street number: Arabic digits (not the 1 of 北1条西 or 東2線),
+# or kanji numerals followed by 丁目/番/号 (not the 八 of 八丁堀 or 二番町)
+_STREET_RE = re.compile(
+    r'\d+(?![\d条線])'
+    r'|[一二三四五六七八九十百千]+(?=丁目|番地?[\d一二三四五六七八九十]|番地?$|号)'
+)
+_NUMBERS_RE = re.compile(r'(\d+)(?:-(\d+))?(?:-(\d+))?')
+_CHOME_RE = re.compile(r'\d+丁目')
+# Markers followed directly by a number (16丁目291, 2番地8, 2335番地の1);
+# _normalize_banchi would drop or merge those numbers
+_BARE_NUMBER_RE = re.compile(r'(?:丁目|番地?の?)(?=\d)')
+_KANA_VARIANTS = str.maketrans({'ヶ': 'ケ', 'ヵ': 'カ'})
+
+
+def _split_city(rest: str, prefecture: str) -> int:
+    """Length of the city part at the start of *rest* (0 if not found)."""
+    try:
+        from address_gazetteer import known_prefix
+    except ImportError:
+        known = None
+    else:
+        known = known_prefix(prefecture + rest)
+    if known is not None and len(known) > len(prefecture):
+        return len(known) - len(prefecture)
+    match = _CITY_RE.match(rest)
+    return match.end() if match else 0
+
+
+def address_key(address: str) -> AddressKey:
+    """
+    Return the canonical hierarchical key of an address.
+
+    The address is split into prefecture, city (using address_gazetteer when
+    the city is known, with the county dropped), town and up to three
+    numbers.  Names are compared after NFKC, whitespace removal and
+    lowercasing (kanji numerals in names such as 六戸町 or 八丁堀 are kept);
+    the street number is normalized as in normalize_address (一丁目2番3号 →
+    1-2-3).  The first number is the chome only when it is marked 丁目 or
+    the hyphenated form has three parts; otherwise the numbers are the
+    banchi and go, so 芝1番地 and 芝1丁目 get different keys.  Anything after
+    them (building, room) is ignored.
+
+    Args:
+        address: The address string.
+
+    Returns:
+        AddressKey(prefecture, city, town, chome, banchi, go)
+
+    Examples:
+        >>> address_key("東京都渋谷区道玄坂一丁目2番3号")
+        AddressKey(prefecture='東京都', city='渋谷区', town='道玄坂', chome=1, banchi=2, go=3)
+        >>> address_key("青森県上北郡六戸町") == address_key("青森県六戸町")
+        True
+    """
+    if not isinstance(address, str):
+        raise TypeError(f"Address must be a string, got {type(address).__name__}")
+
+    normalized = unicodedata.normalize('NFKC', ''.join(address.split()))
+    normalized = normalized.replace('\u2212', '-').translate(_KANA_VARIANTS).lower()
+
+    match = _PREFECTURE_RE.match(normalized)
+    prefecture = match.group(0) if match else ''
+    rest = normalized[len(prefecture):]
+
+    city_length = _split_city(rest, prefecture)
+    city = _COUNTY_RE.sub('', rest[:city_length])
+    rest = rest[city_length:]
+
+    street = _STREET_RE.search(rest)
+    if street is None:
+        return AddressKey(prefecture, city, rest, 0, 0, 0)
+    town = rest[:street.start()]
+    street_number = _normalize_kanji_numbers(rest[street.start():])
+    numbers = _NUMBERS_RE.match(_normalize_banchi(_BARE_NUMBER_RE.sub('-', street_number)))
+    chome, banchi, go = (int(n) if n else 0 for n in numbers.groups())
+    # Without 丁目 the first number is the banchi, unless the hyphenated
+    # form has all three parts (芝1番地 is banchi 1, 箱根ケ崎2335-1 is 2335-1)
+    if not _CHOME_RE.match(street_number) and not numbers.group(3):
+        chome, banchi, go = 0, chome, banchi
+
+    return AddressKey(prefecture, city, town, chome, banchi, go)
+
+
+__all__ = [
+    'normalize_address',
+    'normalize_many',
+    'compare_addresses',
+    'get_normalized_diff',
+    'AddressMatcher',
+    'AddressIndex',
+    'AddressMatch',
+    'match_any',
+    'best_match',
+    'AddressKey',
+    'address_key',
+    'NORMALIZE_CACHE_SIZE',
+]
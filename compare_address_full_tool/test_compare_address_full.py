@@ -0,0 +1,601 @@
+"""Tests for compare_address_full_tool.
+
+Tests cover the three additions over compare_address_tool:
+  1. Kanji numeral normalization (一→1, 十一→11, …)
+  2. Banchi notation normalization (1丁目2番3号 ↔ 1-2-3)
+  3. Prefix/containment matching (partial addresses still match)
+
+Plus regression coverage for the base behaviour inherited from
+compare_address_tool (zenkaku/hankaku, whitespace, case, exact match).
+"""
+
+import random
+import unicodedata
+
+import pytest
+from compare_address_full_tool import (
+    AddressIndex,
+    AddressKey,
+    AddressMatch,
+    AddressMatcher,
+    address_key,
+    best_match,
+    match_any,
+    normalize_address,
+    normalize_many,
+    compare_addresses,
+    get_normalized_diff,
+    _normalize_cached,
+    _normalize_kanji_numbers,
+    _BANCHI_PATTERNS,
+)
+
+
+# ===========================================================================
+# 1. normalize_address — base behaviour (same as compare_address_tool)
+# ===========================================================================
+
+class TestNormalizeBase:
+    """Inherited normalization behaviour unchanged from compare_address_tool."""
+
+    def test_removes_spaces(self):
+        assert normalize_address("東京都 渋谷区") == "東京都渋谷区"
+
+    def test_removes_fullwidth_space(self):
+        assert normalize_address("東京都　渋谷区") == "東京都渋谷区"
+
+    def test_removes_tabs_and_newlines(self):
+        assert normalize_address("東京都\t渋谷区\n恵比寿") == "東京都渋谷区恵比寿"
+
+    def test_fullwidth_digits_to_halfwidth(self):
+        # NFKC: １２３ → 123
+        assert normalize_address("渋谷区１２３") == "渋谷区123"
+
+    def test_fullwidth_hyphen_to_halfwidth(self):
+        # NFKC: － → -, U+2212 → -
+        assert normalize_address("東京都渋谷区１－２－３") == "東京都渋谷区1-2-3"
+
+    def test_fullwidth_parentheses(self):
+        assert normalize_address("渋谷区（恵比寿）") == "渋谷区(恵比寿)"
+
+    def test_lowercase(self):
+        assert normalize_address("ＡＢＣ１２３") == "abc123"
+
+    def test_empty_string(self):
+        assert normalize_address("") == ""
+
+    def test_type_error(self):
+        with pytest.raises(TypeError, match="Address must be a string"):
+            normalize_address(None)
+
+
+# ===========================================================================
+# 2. normalize_address — kanji numeral normalization
+# ===========================================================================
+
+class TestNormalizeKanjiNumerals:
+    """Kanji → Arabic numeral conversion."""
+
+    def test_single_digit(self):
+        assert normalize_address("一丁目") == "1丁目"
+
+    def test_all_single_digits(self):
+        for kanji, arabic in zip("一二三四五六七八九", "123456789"):
+            result = normalize_address(f"{kanji}番地")
+            assert result == f"{arabic}"  # 番地 stripped by banchi normalizer
+
+    def test_juu_alone(self):
+        assert normalize_address("十丁目") == "10丁目"
+
+    def test_compound_juu_ichi(self):
+        assert normalize_address("十一丁目") == "11丁目"
+
+    def test_compound_niju(self):
+        assert normalize_address("二十丁目") == "20丁目"
+
+    def test_compound_niju_san(self):
+        assert normalize_address("二十三番地") == "23"
+
+    def test_hyaku(self):
+        assert normalize_address("百番地") == "100"
+
+    def test_compound_address(self):
+        # 一丁目二番三号 → after kanji norm → 1丁目2番3号 → after banchi → 1-2-3
+        assert normalize_address("東京都渋谷区道玄坂一丁目二番三号") == "東京都渋谷区道玄坂1-2-3"
+
+    def test_mixed_kanji_arabic(self):
+        # 1丁目二番3号 → 1-2-3
+        assert normalize_address("東京都渋谷区道玄坂1丁目二番3号") == "東京都渋谷区道玄坂1-2-3"
+
+
+# ===========================================================================
+# 3. normalize_address — banchi notation normalization
+# ===========================================================================
+
+class TestNormalizeBanchi:
+    """丁目/番地/号 → hyphenated normalization."""
+
+    def test_choume_banchi_go_full(self):
+        assert normalize_address("道玄坂1丁目2番3号") == "道玄坂1-2-3"
+
+    def test_choume_banchichi_go(self):
+        # 番地 (with 地)
+        assert normalize_address("道玄坂1丁目2番地3号") == "道玄坂1-2-3"
+
+    def test_choume_hyphenated_suffix(self):
+        # extractor output: 1丁目2-3
+        assert normalize_address("道玄坂1丁目2-3") == "道玄坂1-2-3"
+
+    def test_choume_banchi_no_go(self):
+        assert normalize_address("道玄坂1丁目2番地") == "道玄坂1-2"
+
+    def test_choume_ban_no_chi_no_go(self):
+        # 番 without 地
+        assert normalize_address("道玄坂1丁目2番") == "道玄坂1-2"
+
+    def test_banchi_go_no_choume(self):
+        assert normalize_address("山下町1番3号") == "山下町1-3"
+
+    def test_banchi_only(self):
+        assert normalize_address("山下町1番地") == "山下町1"
+
+    def test_banchi_no_chi(self):
+        assert normalize_address("山下町1番") == "山下町1"
+
+    def test_choume_alone_unchanged(self):
+        # 1丁目 without following banchi: keep as-is
+        assert normalize_address("渋谷一丁目") == "渋谷1丁目"
+
+    def test_fullwidth_before_banchi(self):
+        # NFKC first, then banchi
+        assert normalize_address("道玄坂１丁目２番３号") == "道玄坂1-2-3"
+
+    def test_kanji_then_banchi(self):
+        assert normalize_address("道玄坂一丁目二番三号") == "道玄坂1-2-3"
+
+
+# ===========================================================================
+# 4. compare_addresses — prefix/containment matching
+# ===========================================================================
+
+class TestComparePrefixMatching:
+    """Prefix/containment matching: the key new behaviour."""
+
+    def test_exact_match(self):
+        assert compare_addresses("東京都渋谷区道玄坂1丁目2番3号",
+                                  "東京都渋谷区道玄坂1丁目2番3号") is True
+
+    def test_target_longer_page_is_prefix(self):
+        """Page has only city-level address → should match."""
+        assert compare_addresses("東京都渋谷区道玄坂1丁目2番3号",
+                                  "東京都渋谷区") is True
+
+    def test_target_shorter_page_has_more_detail(self):
+        """Target has only city-level, page has full address → should match."""
+        assert compare_addresses("東京都渋谷区",
+                                  "東京都渋谷区道玄坂1丁目2番3号") is True
+
+    def test_different_wards_no_match(self):
+        assert compare_addresses("東京都渋谷区道玄坂1丁目2番3号",
+                                  "東京都新宿区西新宿2-8-1") is False
+
+    def test_different_prefectures_no_match(self):
+        assert compare_addresses("東京都渋谷区", "大阪府大阪市北区") is False
+
+    def test_same_city_different_ward(self):
+        assert compare_addresses("大阪府大阪市北区", "大阪府大阪市中央区") is False
+
+    def test_empty_strings(self):
+        assert compare_addresses("", "") is True
+
+    def test_empty_vs_nonempty(self):
+        # Empty string is a prefix of everything
+        assert compare_addresses("", "東京都渋谷区") is True
+
+
+# ===========================================================================
+# 5. compare_addresses — notation equivalence
+# ===========================================================================
+
+class TestCompareNotationEquivalence:
+    """Different notations for the same address must compare equal."""
+
+    def test_kanji_vs_arabic(self):
+        assert compare_addresses("東京都渋谷区道玄坂一丁目二番三号",
+                                  "東京都渋谷区道玄坂1丁目2番3号") is True
+
+    def test_banchi_vs_hyphen(self):
+        assert compare_addresses("東京都渋谷区道玄坂1丁目2番3号",
+                                  "東京都渋谷区道玄坂1-2-3") is True
+
+    def test_choume_hyphen_vs_banchi(self):
+        assert compare_addresses("東京都渋谷区道玄坂1丁目2-3",
+                                  "東京都渋谷区道玄坂1丁目2番3号") is True
+
+    def test_fullwidth_vs_halfwidth(self):
+        assert compare_addresses("東京都新宿区西新宿２－８－１",
+                                  "東京都新宿区西新宿2-8-1") is True
+
+    def test_kanji_full_vs_hyphen(self):
+        assert compare_addresses("東京都渋谷区道玄坂一丁目二番三号",
+                                  "東京都渋谷区道玄坂1-2-3") is True
+
+    def test_banchi_vs_hyphen_no_choume(self):
+        assert compare_addresses("神奈川県横浜市中区山下町1番地",
+                                  "神奈川県横浜市中区山下町1") is True
+
+    def test_city_ward_banchi(self):
+        assert compare_addresses("大阪府大阪市北区梅田2-4-9",
+                                  "大阪府大阪市北区梅田2丁目4番9号") is True
+
+    def test_whitespace_ignored(self):
+        assert compare_addresses("東京都 渋谷区　道玄坂 1丁目2番3号",
+                                  "東京都渋谷区道玄坂1-2-3") is True
+
+
+# ===========================================================================
+# 6. get_normalized_diff — match_type field
+# ===========================================================================
+
+class TestGetNormalizedDiff:
+    """Detailed comparison including match_type."""
+
+    def test_exact_match_type(self):
+        result = get_normalized_diff("東京都渋谷区", "東京都渋谷区")
+        assert result['equal'] is True
+        assert result['match_type'] == 'exact'
+
+    def test_address2_is_prefix_type(self):
+        result = get_normalized_diff("東京都渋谷区道玄坂1-2-3", "東京都渋谷区")
+        assert result['equal'] is True
+        assert result['match_type'] == 'address2_is_prefix'
+
+    def test_address1_is_prefix_type(self):
+        result = get_normalized_diff("東京都渋谷区", "東京都渋谷区道玄坂1-2-3")
+        assert result['equal'] is True
+        assert result['match_type'] == 'address1_is_prefix'
+
+    def test_no_match_type(self):
+        result = get_normalized_diff("東京都渋谷区", "大阪府大阪市")
+        assert result['equal'] is False
+        assert result['match_type'] == 'no_match'
+
+    def test_all_keys_present(self):
+        result = get_normalized_diff("addr1", "addr2")
+        assert set(result.keys()) == {
+            'equal', 'match_type',
+            'address1_original', 'address2_original',
+            'address1_normalized', 'address2_normalized',
+        }
+
+    def test_originals_preserved(self):
+        a1 = "東京都　渋谷区道玄坂１丁目２番３号"
+        a2 = "東京都渋谷区"
+        result = get_normalized_diff(a1, a2)
+        assert result['address1_original'] == a1
+        assert result['address2_original'] == a2
+
+    def test_normalized_shows_banchi_converted(self):
+        result = get_normalized_diff("東京都渋谷区道玄坂1丁目2番3号", "東京都渋谷区")
+        assert result['address1_normalized'] == "東京都渋谷区道玄坂1-2-3"
+        assert result['address2_normalized'] == "東京都渋谷区"
+
+    def test_normalized_shows_kanji_converted(self):
+        result = get_normalized_diff("東京都渋谷区道玄坂一丁目二番三号", "x")
+        assert result['address1_normalized'] == "東京都渋谷区道玄坂1-2-3"
+
+    def test_type_error(self):
+        with pytest.raises(TypeError):
+            get_normalized_diff(123, "東京都")
+
+
+# ===========================================================================
+# 7. Real-world integration scenarios (officialsite_finder use case)
+# ===========================================================================
+
+class TestRealWorldScenarios:
+    """Scenarios that arise when compare_address_full_tool is used inside
+    officialsite_finder_tool: target from user input vs address extracted
+    from a web page."""
+
+    def test_full_vs_city_level(self):
+        """Page extracted only prefecture+city from HTML."""
+        target = "東京都渋谷区道玄坂1丁目2番3号"
+        page   = "東京都渋谷区"
+        assert compare_addresses(target, page) is True
+
+    def test_full_vs_full_hyphen(self):
+        """Page uses hyphenated form; target uses 丁目/番地/号 form."""
+        target = "東京都新宿区西新宿2丁目8番1号"
+        page   = "東京都新宿区西新宿2-8-1"
+        assert compare_addresses(target, page) is True
+
+    def test_osaka_city_ward(self):
+        """Two-layer city+ward address with hyphen."""
+        target = "大阪府大阪市北区梅田2丁目4番9号"
+        page   = "大阪府大阪市北区梅田2-4-9"
+        assert compare_addresses(target, page) is True
+
+    def test_kanagawa_banchi(self):
+        """Banchi-only address comparison."""
+        target = "神奈川県横浜市中区山下町1番地"
+        page   = "神奈川県横浜市中区山下町1"
+        assert compare_addresses(target, page) is True
+
+    def test_different_facility_no_match(self):
+        """Two completely different facilities."""
+        target = "東京都渋谷区道玄坂1丁目2番3号"
+        page   = "大阪府大阪市北区梅田2-4-9"
+        assert compare_addresses(target, page) is False
+
+    def test_kanji_user_input(self):
+        """User supplied address with kanji numerals."""
+        target = "東京都渋谷区道玄坂一丁目二番三号"
+        page   = "東京都渋谷区道玄坂1-2-3"
+        assert compare_addresses(target, page) is True
+
+
+
+# ===========================================================================
+# 8. AddressMatcher — one target against many candidates
+# ===========================================================================
+
+class TestAddressMatcher:
+    """AddressMatcher gives the same answers as compare_addresses."""
+
+    TARGET = "東京都渋谷区道玄坂一丁目二番三号"
+    CANDIDATES = [
+        "東京都渋谷区",
+        "東京都渋谷区道玄坂1-2-3",
+        "東京都　渋谷区道玄坂１丁目２番３号",
+        "東京都渋谷区道玄坂1-2-4",
+        "大阪府大阪市北区梅田2-4-9",
+        "東京都",
+        "",
+    ]
+
+    def test_parity_with_compare_addresses(self):
+        matcher = AddressMatcher(self.TARGET)
+        assert matcher.normalized == normalize_address(self.TARGET)
+        assert matcher.match_many(self.CANDIDATES) == [
+            compare_addresses(self.TARGET, c) for c in self.CANDIDATES
+        ]
+
+    def test_match_type(self):
+        matcher = AddressMatcher(self.TARGET)
+        for candidate in self.CANDIDATES:
+            assert matcher.match_type(candidate) == get_normalized_diff(self.TARGET, candidate)['match_type']
+
+    def test_candidates_are_normalized_once(self):
+        _normalize_cached.cache_clear()
+        matcher = AddressMatcher(self.TARGET)
+        for _ in range(3):
+            matcher.match_many(self.CANDIDATES)
+        info = _normalize_cached.cache_info()
+        assert info.misses == len(self.CANDIDATES)
+        assert info.hits == 2 * len(self.CANDIDATES)
+
+    def test_non_string_raises(self):
+        with pytest.raises(TypeError):
+            AddressMatcher(None)
+        with pytest.raises(TypeError):
+            AddressMatcher("東京都").matches(123)
+
+
+
+# ===========================================================================
+# 9. match_any / best_match — indexed one-to-many matching
+# ===========================================================================
+
+class TestOneToManyMatching:
+    """match_any / best_match agree with pairwise compare_addresses."""
+
+    TARGET = "東京都渋谷区道玄坂1丁目2番3号"
+    CANDIDATES = [
+        "大阪府大阪市北区梅田2-4-9",
+        "東京都",
+        "東京都渋谷区道玄坂1-2",
+        "東京都渋谷区道玄坂一丁目二番三号",
+        "東京都渋谷区道玄坂1-2-3-101",
+        "東京都渋谷区道玄坂1-2-30",
+        "東京都渋谷区",
+    ]
+
+    def test_lookup_equals_pairwise_comparison(self):
+        matches = AddressIndex(self.CANDIDATES).lookup(self.TARGET)
+        expected = [
+            AddressMatch(i, c, get_normalized_diff(self.TARGET, c)['match_type'])
+            for i, c in enumerate(self.CANDIDATES) if compare_addresses(self.TARGET, c)
+        ]
+        assert matches == expected
+
+    def test_match_any_is_first_pairwise_match(self):
+        assert match_any(self.TARGET, self.CANDIDATES) == AddressMatch(1, "東京都", 'address2_is_prefix')
+        assert match_any(self.TARGET, self.CANDIDATES[:1]) is None
+        assert match_any(self.TARGET, []) is None
+
+    def test_best_match_prefers_exact(self):
+        assert best_match(self.TARGET, self.CANDIDATES) == \
+            AddressMatch(3, "東京都渋谷区道玄坂一丁目二番三号", 'exact')
+
+    def test_best_match_prefers_more_specific_partial_match(self):
+        assert best_match(self.TARGET, ["東京都", "東京都渋谷区", "東京都渋谷区道玄坂1-2"]).index == 2
+        assert best_match("東京都渋谷区", ["東京都", "東京都渋谷区道玄坂1-2-3", "東京都渋谷区道玄坂1"]).index == 2
+
+    def test_validate_skips_unknown_municipalities(self):
+        candidates = ["東京都内", "東京都渋谷区道玄坂1-2-3"]
+        assert match_any("東京都内の各区", candidates) == AddressMatch(0, "東京都内", 'address2_is_prefix')
+        assert match_any("東京都内の各区", candidates, validate=True) is None
+        assert match_any(self.TARGET, candidates, validate=True).index == 1
+
+    def test_duplicate_candidates_keep_input_order(self):
+        matches = AddressIndex(["東京都渋谷区", "大阪府", "東京都 渋谷区"]).lookup(self.TARGET)
+        assert [m.index for m in matches] == [0, 2]
+
+
+
+# ===========================================================================
+# 10. address_key — canonical hierarchical key
+# ===========================================================================
+
+class TestAddressKey:
+    """Notation variants share one hashable, sortable key."""
+
+    def test_components(self):
+        assert address_key("東京都渋谷区道玄坂1丁目2番3号") == \
+            AddressKey("東京都", "渋谷区", "道玄坂", 1, 2, 3)
+        assert address_key("北海道札幌市中央区北1条西2丁目1番地") == \
+            AddressKey("北海道", "札幌市中央区", "北1条西", 2, 1, 0)
+
+    @pytest.mark.parametrize("a,b", [
+        ("東京都渋谷区道玄坂1丁目2番3号", "東京都　渋谷区道玄坂１－２－３"),
+        ("東京都渋谷区道玄坂一丁目二番三号", "東京都渋谷区道玄坂1-2-3"),
+        ("青森県上北郡六戸町大字犬落瀬字権現沢4-1", "青森県六戸町大字犬落瀬字権現沢4-1"),
+        ("神奈川県茅ヶ崎市本村1-1", "神奈川県茅ケ崎市本村1-1"),
+        ("東京都港区芝公園4-2-8 東京タワー", "東京都港区芝公園4丁目2番8号"),
+    ])
+    def test_variants_share_a_key(self, a, b):
+        assert address_key(a) == address_key(b)
+        assert len({address_key(a), address_key(b)}) == 1
+
+    def test_kanji_numerals_in_names_are_kept(self):
+        assert address_key("東京都中央区八丁堀三丁目5番") == AddressKey("東京都", "中央区", "八丁堀", 3, 5, 0)
+        assert address_key("東京都港区三田2-15-45").town == "三田"
+
+    def test_sort_and_group(self):
+        addresses = [
+            "東京都渋谷区道玄坂1-2-10",
+            "大阪府大阪市北区梅田2-4-9",
+            "東京都渋谷区道玄坂1-2-3",
+            "東京都渋谷区宇田川町15-1",
+        ]
+        keys = sorted(address_key(a) for a in addresses)
+        assert [k[:3] for k in keys] == [
+            ("大阪府", "大阪市北区", "梅田"),
+            ("東京都", "渋谷区", "宇田川町"),
+            ("東京都", "渋谷区", "道玄坂"),
+            ("東京都", "渋谷区", "道玄坂"),
+        ]
+        assert keys[2].go == 3 and keys[3].go == 10
+        assert len({k[:2] for k in keys}) == 2
+
+    def test_banchi_without_chome(self):
+        assert address_key("東京都港区芝1番地") != address_key("東京都港区芝1丁目")
+        assert address_key("東京都港区芝1番地") == AddressKey("東京都", "港区", "芝", 0, 1, 0)
+        assert address_key("東京都西多摩郡瑞穂町箱根ケ崎2335") == \
+            AddressKey("東京都", "瑞穂町", "箱根ケ崎", 0, 2335, 0)
+        assert address_key("東京都渋谷区宇田川町15-1") == AddressKey("東京都", "渋谷区", "宇田川町", 0, 15, 1)
+
+    def test_numbers_written_after_a_marker(self):
+        assert address_key("北海道札幌市中央区南１条西１６丁目２９１") == \
+            AddressKey("北海道", "札幌市中央区", "南1条西", 16, 291, 0)
+        assert address_key("北海道札幌市中央区南１条西１６丁目３").banchi == 3
+        assert address_key("東京都港区芝公園4丁目2番地8") == address_key("東京都港区芝公園4-2-8")
+        assert address_key("東京都港区芝公園4丁目2番地8") != address_key("東京都港区芝公園4丁目28番")
+        assert address_key("東京都西多摩郡瑞穂町箱根ヶ崎2335番地の1") == \
+            AddressKey("東京都", "瑞穂町", "箱根ケ崎", 0, 2335, 1)
+        assert address_key("東京都西多摩郡瑞穂町箱根ヶ崎2335番地の1") == address_key("東京都瑞穂町箱根ケ崎2335-1")
+
+    def test_partial_addresses(self):
+        assert address_key("東京都") == AddressKey("東京都", "", "", 0, 0, 0)
+        assert address_key("") == AddressKey("", "", "", 0, 0, 0)
+
+
+# ===========================================================================
+# 11. normalize_many — bulk normalization
+# ===========================================================================
+
+class TestNormalizeMany:
+    """normalize_many must agree with normalize_address row by row."""
+
+    ALPHABET = (
+        "東京都渋谷区道玄坂大阪市北区梅田字番地号丁目の"
+        "一二三四五六七八九十〇"
+        "0123456789０１２３４５６７８９"
+        "-－ー−‐⁻₋ 　\t\nＡａBΣς"
+    )
+
+    def test_matches_normalize_address_on_random_rows(self):
+        rng = random.Random(0)
+        rows = [
+            "".join(rng.choice(self.ALPHABET) for _ in range(rng.randint(0, 20)))
+            for _ in range(2000)
+        ]
+        assert normalize_many(rows) == [normalize_address(r) for r in rows]
+
+    def test_nulls_are_kept(self):
+        assert normalize_many([None, "東京都　渋谷区１丁目", None]) == [None, "東京都渋谷区1丁目", None]
+        assert normalize_many([]) == []
+        assert normalize_many([None]) == [None]
+        assert normalize_many([""]) == [""]
+
+    def test_row_containing_the_separator(self):
+        rows = ["東京都\x00渋谷区一丁目", "Ａ"]
+        assert normalize_many(rows) == [normalize_address(r) for r in rows]
+
+    def test_non_string_raises(self):
+        with pytest.raises(TypeError):
+            normalize_many(["東京都", 1])
+
+    def test_unknown_output_raises(self):
+        with pytest.raises(ValueError):
+            normalize_many(["東京都"], output="pandas")
+
+    def test_numpy_output(self):
+        numpy = pytest.importorskip("numpy")
+        result = normalize_many(numpy.array(["東京都渋谷区１丁目２番", "大阪府"], dtype=object), output="numpy")
+        assert list(result) == ["東京都渋谷区1-2", "大阪府"]
+
+    def test_arrow_input_and_output(self):
+        pyarrow = pytest.importorskip("pyarrow")
+        result = normalize_many(pyarrow.array(["東京都渋谷区１丁目２番", None]), output="arrow")
+        assert result.to_pylist() == ["東京都渋谷区1-2", None]
+        assert result.type == pyarrow.string()
+
+
+# ===========================================================================
+# 12. normalize_address — fused implementation vs the step-by-step chain
+# ===========================================================================
+
+def _reference_normalize(address: str) -> str:
+    """The original one-step-at-a-time normalize_address."""
+    normalized = ''.join(address.split())
+    normalized = unicodedata.normalize('NFKC', normalized)
+    normalized = normalized.replace('\u2212', '-')
+    normalized = _normalize_kanji_numbers(normalized)
+    for pattern, replacement in _BANCHI_PATTERNS:
+        normalized = pattern.sub(replacement, normalized)
+    return normalized.lower()
+
+
+class TestFusedNormalize:
+    """The single-translate normalizer must match the original chain."""
+
+    ALPHABET = (
+        "東京都港区芝公園字丁目番地号の"
+        "一二三四五六七八九十百千"
+        "0123456789０１２３４５６７８９"
+        "-－−⁻₋ー 　\t\xa0"
+        "AaＡａZｚΣİKⅫ¨ｶﾞﾊﾟ㈱①"
+    )
+
+    def test_matches_reference_on_random_addresses(self):
+        rng = random.Random(1)
+        for _ in range(20000):
+            address = "".join(rng.choice(self.ALPHABET) for _ in range(rng.randint(0, 16)))
+            assert normalize_address(address) == _reference_normalize(address), repr(address)
+
+    @pytest.mark.parametrize("address", [
+        "東京都港区芝公園４丁目２−８",
+        "東京都港区芝公園四丁目二番八号",
+        "1丁目2丁目3番4号",
+        "ABC Building 4F",
+        "Ⅻ番地",
+        "ｶﾞｰﾃﾞﾝ⁻1",
+    ])
+    def test_matches_reference_on_known_cases(self, address):
+        assert normalize_address(address) == _reference_normalize(address)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
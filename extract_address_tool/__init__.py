@@ -5,6 +5,20 @@ Street-level details (丁目・番地・号) are intentionally omitted.
 Use extract_full_address_tool to include those.
 """
 
-from .extract import extract_addresses, extract_addresses_list, extract_addresses_detailed
+from .extract import (
+    BASIC_REGEX,
+    DETAIL_REGEX,
+    extract_addresses,
+    extract_addresses_list,
+    extract_addresses_detailed,
+    iter_addresses,
+)
 
-__all__ = ['extract_addresses', 'extract_addresses_list', 'extract_addresses_detailed']
+__all__ = [
+    'BASIC_REGEX',
+    'DETAIL_REGEX',
+    'extract_addresses',
+    'extract_addresses_list',
+    'extract_addresses_detailed',
+    'iter_addresses',
+]
@@ -2,16 +2,21 @@
 import sys
 import io
 import json
-from extract_address_tool.extract import extract_addresses
+from extract_address_tool.extract import iter_addresses
 
 if sys.platform == 'win32':
     sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-if len(sys.argv) > 1:
-    with open(sys.argv[1], 'r', encoding='utf-8') as f:
-        text_content = f.read()
-else:
-    text_content = sys.stdin.read()
+# --stream: one {"address", "start", "end"} object per occurrence (byte offsets) per line
+stream = '--stream' in sys.argv[1:]
+args = [arg for arg in sys.argv[1:] if arg != '--stream']
+source = args[0] if args else sys.stdin.buffer
 
-print(extract_addresses(text_content))
+if stream:
+    for address, start, end in iter_addresses(source):
+        print(json.dumps({"address": address, "start": start, "end": end}, ensure_ascii=False))
+else:
+    # Streamed, so large inputs are not read into memory at once
+    addresses = list(dict.fromkeys(address for address, _, _ in iter_addresses(source)))
+    print(json.dumps(addresses, ensure_ascii=False, indent=2))
@@ -6,8 +6,10 @@ intentionally omitted; use extract_full_address_tool if those are needed.
 """
 
 import re
+import codecs
 import json
-from typing import List
+import os
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
 
 
 # 47 prefectures in Japan
@@ -53,6 +55,11 @@ def _build_patterns():
 
 _BASIC_PATTERN, _DETAIL_PATTERN = _build_patterns()
 
+# Compiled once at import and shared by every call (the alternations are
+# large, so they are not left to the re module's internal cache)
+BASIC_REGEX = re.compile(_BASIC_PATTERN)
+DETAIL_REGEX = re.compile(_DETAIL_PATTERN)
+
 
 def extract_addresses(text: str) -> str:
     """
@@ -76,15 +83,12 @@ def extract_addresses(text: str) -> str:
     if not text:
         return json.dumps([], ensure_ascii=False)
 
-    addresses = []
-    seen = set()
-    for match in re.finditer(_BASIC_PATTERN, text):
-        address = match.group(0)
-        if address not in seen:
-            addresses.append(address)
-            seen.add(address)
+    return json.dumps(_addresses(text), ensure_ascii=False, indent=2)
 
-    return json.dumps(addresses, ensure_ascii=False, indent=2)
+
+def _addresses(text: str) -> List[str]:
+    """Unique basic-pattern matches of *text* in order of appearance."""
+    return list(dict.fromkeys(BASIC_REGEX.findall(text)))
 
 
 def extract_addresses_list(text: str) -> List[str]:
@@ -99,7 +103,9 @@ def extract_addresses_list(text: str) -> List[str]:
     Returns:
         List of extracted addresses
     """
-    return json.loads(extract_addresses(text))
+    if not text:
+        return []
+    return _addresses(text)
 
 
 def extract_addresses_detailed(text: str) -> str:
@@ -124,7 +130,7 @@ def extract_addresses_detailed(text: str) -> str:
 
     addresses = []
     seen = set()
-    for match in re.finditer(_DETAIL_PATTERN, text):
+    for match in DETAIL_REGEX.finditer(text):
         full_address = match.group(0)
         if full_address in seen:
             continue
@@ -151,6 +157,99 @@ def extract_addresses_detailed(text: str) -> str:
     return json.dumps(addresses, ensure_ascii=False, indent=2)
 
 
+# Streaming: no address contains whitespace, "、" or "。", so the text after
+# the last delimiter of a chunk is carried over to the next chunk
+_RUN_RE = re.compile(r'[^\s、。]+')
+STREAM_CHUNK_SIZE = 1 << 20
+STREAM_MAX_CARRY = 1 << 20
+
+
+def iter_stream_matches(
+    source: Union[str, os.PathLike, BinaryIO],
+    regex: re.Pattern,
+    run_filter: Optional[re.Pattern] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    max_carry: int = STREAM_MAX_CARRY,
+) -> Iterator[Tuple[str, int, int]]:
+    """
+    Stream the matches of an address *regex* from a UTF-8 file of any size.
+
+    Reads the input chunk by chunk and carries the characters after the last
+    delimiter over to the next chunk, so addresses crossing a chunk boundary
+    are found as if the whole text had been scanned.  Memory stays at about
+    chunk_size + max_carry.  Shared by iter_addresses and
+    extract_full_address_tool.iter_full_addresses.
+
+    Args:
+        source: File path, or a binary file object opened for reading
+        regex: Compiled address pattern; its matches must not contain
+            whitespace, "、" or "。"
+        run_filter: Optional pattern; delimiter-free runs without a match of
+            it are skipped without running *regex*
+        chunk_size: Bytes read per chunk
+        max_carry: Longest delimiter-free run (in characters) carried over;
+            a longer run at a chunk boundary is scanned as is, so an address
+            crossing that point may be cut
+
+    Yields:
+        (match text, start_byte, end_byte) for every match
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield from iter_stream_matches(f, regex, run_filter, chunk_size, max_carry)
+        return
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    carry = ''
+    base = 0  # byte offset of carry[0]
+    while True:
+        data = source.read(chunk_size)
+        final = not data
+        text = carry + decoder.decode(data, final=final)
+
+        # Byte offsets are advanced incrementally from (cursor, offset)
+        cursor, offset = 0, base
+        tail = len(text)
+        for run in _RUN_RE.finditer(text):
+            start, end = run.span()
+            if end == len(text) and not final and end - start <= max_carry:
+                tail = start
+                break
+            if run_filter is not None and not run_filter.search(text, start, end):
+                continue
+            for match in regex.finditer(text, start, end):
+                offset += len(text[cursor:match.start()].encode('utf-8'))
+                cursor = match.start()
+                address = match.group(0)
+                yield address, offset, offset + len(address.encode('utf-8'))
+
+        if final:
+            return
+        base = offset + len(text[cursor:tail].encode('utf-8'))
+        carry = text[tail:]
+
+
+def iter_addresses(
+    source: Union[str, os.PathLike, BinaryIO],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    max_carry: int = STREAM_MAX_CARRY,
+) -> Iterator[Tuple[str, int, int]]:
+    """
+    Stream city-level addresses from a UTF-8 file of any size.
+
+    Every occurrence is yielded (no deduplication); see iter_stream_matches.
+
+    Args:
+        source: File path, or a binary file object opened for reading
+        chunk_size: Bytes read per chunk
+        max_carry: Longest delimiter-free run (in characters) carried over
+
+    Yields:
+        (address, start_byte, end_byte)
+    """
+    return iter_stream_matches(source, BASIC_REGEX, None, chunk_size, max_carry)
+
+
 if __name__ == "__main__":
     import sys
     import io
@@ -160,10 +259,15 @@ if __name__ == "__main__":
         sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-    if len(sys.argv) > 1:
-        with open(sys.argv[1], 'r', encoding='utf-8') as f:
-            text_content = f.read()
-    else:
-        text_content = sys.stdin.read()
+    # --stream: one {"address", "start", "end"} object per occurrence (byte offsets) per line
+    stream = '--stream' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != '--stream']
+    source = args[0] if args else sys.stdin.buffer
 
-    print(extract_addresses(text_content))
+    if stream:
+        for address, start, end in iter_addresses(source):
+            print(json.dumps({"address": address, "start": start, "end": end}, ensure_ascii=False))
+    else:
+        # Streamed, so large inputs are not read into memory at once
+        addresses = list(dict.fromkeys(address for address, _, _ in iter_addresses(source)))
+        print(json.dumps(addresses, ensure_ascii=False, indent=2))
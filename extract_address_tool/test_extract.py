@@ -9,14 +9,20 @@ Covers:
   6. Multiple addresses and deduplication
   7. Edge cases (empty text, no match, particles)
   8. extract_addresses_list and extract_addresses_detailed
+  9. Compiled pattern objects
+  10. Streaming extraction with byte offsets
 """
 
+import io
 import json
+
 import pytest
 from extract_address_tool import (
+    BASIC_REGEX,
     extract_addresses,
     extract_addresses_list,
     extract_addresses_detailed,
+    iter_addresses,
 )
 
 
@@ -248,5 +254,34 @@ class TestExtractAddressesDetailed:
         assert result == []
 
 
+# ===========================================================================
+# 9. Compiled patterns
+# ===========================================================================
+
+class TestCompiledPatterns:
+
+    def test_basic_regex_matches_extract_addresses(self):
+        text = "本社は東京都渋谷区道玄坂1丁目2番3号です。支社は大阪府大阪市北区梅田2-4-9。"
+        assert BASIC_REGEX.findall(text) == extract_addresses_list(text)
+
+
+# ===========================================================================
+# 10. Streaming
+# ===========================================================================
+
+class TestIterAddresses:
+
+    TEXT = "本社は東京都渋谷区道玄坂1丁目2番3号です。支社は大阪府大阪市北区梅田2-4-9\n工場 青森県上北郡六戸町" * 3
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+    def test_chunk_boundaries_do_not_lose_matches(self, chunk_size):
+        data = self.TEXT.encode("utf-8")
+        results = list(iter_addresses(io.BytesIO(data), chunk_size=chunk_size))
+        assert [a for a, _, _ in results] == BASIC_REGEX.findall(self.TEXT)
+        for address, start, end in results:
+            assert data[start:end].decode("utf-8") == address
+        assert list(dict.fromkeys(a for a, _, _ in results)) == extract_addresses_list(self.TEXT)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -5,13 +5,33 @@ This module provides functionality to extract Japanese full addresses
 """
 
 from .extract import (
+    BASIC_REGEX,
+    DETAIL_REGEX,
+    CITY_REGEX,
+    Address,
     extract_full_addresses,
     extract_full_addresses_list,
     extract_full_addresses_detailed,
+    extract_address_records,
+    extract_full_addresses_batch,
+    iter_full_addresses,
+    extract_combined_addresses,
+    extract_combined_addresses_list,
+    split_address_levels,
 )
 
 __all__ = [
+    'BASIC_REGEX',
+    'DETAIL_REGEX',
+    'CITY_REGEX',
+    'Address',
     'extract_full_addresses',
     'extract_full_addresses_list',
     'extract_full_addresses_detailed',
+    'extract_address_records',
+    'extract_full_addresses_batch',
+    'iter_full_addresses',
+    'extract_combined_addresses',
+    'extract_combined_addresses_list',
+    'split_address_levels',
 ]
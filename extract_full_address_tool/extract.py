@@ -6,7 +6,13 @@ This module extracts Japanese addresses including block/lot numbers
 
 import re
 import json
-from typing import List
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from extract_address_tool.extract import STREAM_CHUNK_SIZE, STREAM_MAX_CARRY, iter_stream_matches
 
 
 # 47 prefectures in Japan
@@ -90,10 +96,39 @@ def _build_patterns():
         f'{county_nopref_cap}({city_name_nopref})(区|町|村)({addr_ext})'
     )
 
-    return basic_pattern, detail_pattern
+    # City-level pattern (same as extract_address_tool): prefecture matches
+    # of the basic pattern without the street number
+    city_pattern = (
+        f'(?:{prefecture_pattern})(?:[^と、。\\s]*郡)?(?:{city_name})市(?:{city_name}区)?'
+        f'|'
+        f'(?:{prefecture_pattern})(?:[^と、。\\s]*郡)?(?:{city_name})(?:区|町|村)'
+    )
+
+    return basic_pattern, detail_pattern, city_pattern
+
+
+_BASIC_PATTERN, _DETAIL_PATTERN, _CITY_PATTERN = _build_patterns()
+
+# Module-level compiled patterns, as in extract_address_tool
+BASIC_REGEX = re.compile(_BASIC_PATTERN)
+DETAIL_REGEX = re.compile(_DETAIL_PATTERN)
+CITY_REGEX = re.compile(_CITY_PATTERN)
 
+# Pre-filter for large texts.  No address can contain whitespace, "、" or "。"
+# (none of the pattern's character classes allow them), and every address
+# contains 市, 区, 町 or 村.  So the text is split into runs of other
+# characters, and the address pattern only runs inside runs that contain one
+# of those suffixes.  Results are identical to scanning the whole text.
+_RUN_RE = re.compile(r'[^\s、。]+')
+_SUFFIX_RE = re.compile(r'[市区町村]')
 
-_BASIC_PATTERN, _DETAIL_PATTERN = _build_patterns()
+
+def _iter_matches(regex: re.Pattern, text: str):
+    """Yield the regex.finditer(text) matches, scanning only candidate runs."""
+    for run in _RUN_RE.finditer(text):
+        start, end = run.span()
+        if _SUFFIX_RE.search(text, start, end):
+            yield from regex.finditer(text, start, end)
 
 
 def extract_full_addresses(text: str) -> str:
@@ -119,15 +154,19 @@ def extract_full_addresses(text: str) -> str:
     if not text:
         return json.dumps([], ensure_ascii=False)
 
+    return json.dumps(_full_addresses(text), ensure_ascii=False, indent=2)
+
+
+def _full_addresses(text: str) -> List[str]:
+    """Unique basic-pattern matches of *text* in order of appearance."""
     addresses = []
     seen = set()
-    for match in re.finditer(_BASIC_PATTERN, text):
+    for match in _iter_matches(BASIC_REGEX, text):
         address = match.group(0)
         if address not in seen:
             addresses.append(address)
             seen.add(address)
-
-    return json.dumps(addresses, ensure_ascii=False, indent=2)
+    return addresses
 
 
 def extract_full_addresses_list(text: str) -> List[str]:
@@ -142,7 +181,121 @@ def extract_full_addresses_list(text: str) -> List[str]:
     Returns:
         List of extracted full addresses
     """
-    return json.loads(extract_full_addresses(text))
+    if not text:
+        return []
+    return _full_addresses(text)
+
+
+class Address(NamedTuple):
+    """
+    One extracted address (see extract_address_records).
+
+    Attributes:
+        full_address: Complete address string
+        city_address: Address up to city/ward/town/village (the form
+            extract_address_tool returns), or None
+        prefecture: Prefecture name (e.g., "東京都"), or None
+        county: County name if present (e.g., "上北郡"), or None
+        city: City/ward/town/village (e.g., "渋谷区")
+        street_number: Street/block/lot info (e.g., "道玄坂1丁目2番3号"), or None
+        span: (start, end) of full_address in the text
+    """
+    full_address: str
+    city_address: Optional[str]
+    prefecture: Optional[str]
+    county: Optional[str]
+    city: str
+    street_number: Optional[str]
+    span: Tuple[int, int]
+
+
+def _detail_components(match):
+    """Return (prefecture, county, city, street_number) group numbers of a _DETAIL_PATTERN match.
+
+    The city group number is a tuple of the groups that make up the city
+    (name + 市/区/町/村 [+ ward]).
+    """
+    if match.group(1):       # Pattern 1: pref + 市
+        return 1, 2, (3, 4, 5), 6
+    elif match.group(7):     # Pattern 2: pref + 区|町|村
+        return 7, 8, (9, 10), 11
+    elif match.group(13):    # Pattern 3: no pref + 市
+        return None, 12, (13, 14, 15), 16
+    else:                    # Pattern 4: no pref + 区|町|村
+        return None, 17, (18, 19), 20
+
+
+def _span(match, group):
+    if group is None or match.group(group) is None:
+        return None
+    return list(match.span(group))
+
+
+def _iter_records(text: str):
+    """Yield (match, Address) for each unique _DETAIL_PATTERN match of *text*."""
+    seen = set()
+    for match in _iter_matches(DETAIL_REGEX, text):
+        full_address = match.group(0)
+        if full_address in seen:
+            continue
+        seen.add(full_address)
+
+        pref_group, county_group, city_groups, street_group = _detail_components(match)
+        prefecture = match.group(pref_group) if pref_group else None
+        city_end = max(match.end(g) for g in city_groups if match.group(g) is not None)
+        if prefecture:
+            city_address = text[match.start():city_end]
+        else:
+            # A prefecture can hide inside a no-prefecture match
+            # ("住所東京都港区芝公園4-2-8"); extract_address_tool finds it there.
+            inner = CITY_REGEX.search(text, match.start(), match.end())
+            city_address = inner.group(0) if inner else None
+
+        yield match, Address(
+            full_address,
+            city_address,
+            prefecture,
+            match.group(county_group) or None,
+            ''.join(match.group(g) or '' for g in city_groups),
+            match.group(street_group) or None,
+            match.span(),
+        )
+
+
+def _is_known_address(record: Address) -> bool:
+    """True if the record starts with a municipality in address_gazetteer."""
+    from address_gazetteer import known_prefix
+
+    return bool(known_prefix(record.full_address)
+                or (record.city_address and known_prefix(record.city_address)))
+
+
+def extract_address_records(text: str, validate: bool = False) -> List[Address]:
+    """
+    Extract Japanese full addresses as Address records.
+
+    The native API for in-process callers: one pass with the detailed
+    pattern, no JSON serialization.  The other extractors' JSON output is
+    derived from the same records.
+
+    Args:
+        text: Plain text to extract addresses from
+        validate: Drop addresses that do not start with a real municipality
+            (checked against address_gazetteer), e.g. "東京都内の各区1-2"
+
+    Returns:
+        List of Address records, one per unique full address
+
+    Example:
+        >>> extract_address_records("本社は東京都渋谷区道玄坂1丁目2番3号です。")[0].city
+        '渋谷区'
+    """
+    if not text:
+        return []
+    records = [record for _, record in _iter_records(text)]
+    if validate:
+        records = [record for record in records if _is_known_address(record)]
+    return records
 
 
 def extract_full_addresses_detailed(text: str) -> str:
@@ -165,48 +318,220 @@ def extract_full_addresses_detailed(text: str) -> str:
     if not text:
         return json.dumps([], ensure_ascii=False)
 
-    addresses = []
-    seen = set()
-    for match in re.finditer(_DETAIL_PATTERN, text):
-        full_address = match.group(0)
-        if full_address in seen:
-            continue
+    addresses = [
+        {
+            "full_address": record.full_address,
+            "prefecture": record.prefecture,
+            "county": record.county,
+            "city": record.city,
+            "street_number": record.street_number,
+        }
+        for record in extract_address_records(text)
+    ]
+    return json.dumps(addresses, ensure_ascii=False, indent=2)
 
-        if match.group(1):       # Pattern 1: pref + 市
-            prefecture = match.group(1)
-            county = match.group(2)
-            city = match.group(3) + match.group(4)  # name + 市
-            if match.group(5):
-                city += match.group(5)               # + ward (区)
-            street_number = match.group(6)
-        elif match.group(7):     # Pattern 2: pref + 区|町|村
-            prefecture = match.group(7)
-            county = match.group(8)
-            city = match.group(9) + match.group(10)  # name + 区/町/村
-            street_number = match.group(11)
-        elif match.group(13):    # Pattern 3: no pref + 市
-            prefecture = None
-            county = match.group(12)
-            city = match.group(13) + match.group(14)  # name + 市
-            if match.group(15):
-                city += match.group(15)                # + ward (区)
-            street_number = match.group(16)
-        else:                    # Pattern 4: no pref + 区|町|村
-            prefecture = None
-            county = match.group(17)
-            city = match.group(18) + match.group(19)  # name + 区/町/村
-            street_number = match.group(20)
 
+def extract_combined_addresses(text: str) -> str:
+    """
+    Extract full and city-level addresses from plain text in a single pass.
+
+    Scans the text once with the detailed pattern and derives, for each
+    address, both the full form (as returned by extract_full_addresses) and
+    the city-level form: prefecture + county + city of that full match,
+    without street details (the format of extract_address_tool).  The
+    city-level form is null for addresses without a prefecture (unless a
+    prefecture address is embedded in the match, e.g.
+    "住所東京都港区芝公園4-2-8" → "東京都港区").  split_address_levels()
+    turns the result into two flat lists.
+
+    Because the city-level form is taken from the full match, it can differ
+    from what extract_address_tool finds on its own when the text after the
+    street number looks like a municipality: for "東京都港区芝公園4丁目2番8号町田ビル"
+    it is "東京都港区", where extract_address_tool returns
+    "東京都港区芝公園4丁目2番8号町".
+
+    Args:
+        text: Plain text to extract addresses from
+
+    Returns:
+        JSON string containing array of address objects:
+        - full_address: Complete address string
+        - city_address: Address up to city/ward/town/village, or null
+        - prefecture / county / city / street_number: Components, or null
+        - span: [start, end] of full_address in text
+        - spans: {"prefecture", "county", "city", "street_number"} → [start, end] or null
+
+    Example:
+        >>> text = "本社は東京都渋谷区道玄坂1丁目2番3号です。"
+        >>> json.loads(extract_combined_addresses(text))[0]["city_address"]
+        '東京都渋谷区'
+    """
+    if not text:
+        return json.dumps([], ensure_ascii=False)
+
+    return json.dumps(extract_combined_addresses_list(text), ensure_ascii=False, indent=2)
+
+
+def extract_combined_addresses_list(text: str) -> List[dict]:
+    """
+    Extract full and city-level addresses from plain text in a single pass.
+
+    Returns results as a Python list (see extract_combined_addresses).
+
+    Args:
+        text: Plain text to extract addresses from
+
+    Returns:
+        List of address objects
+    """
+    if not text:
+        return []
+
+    addresses = []
+    for match, record in _iter_records(text):
+        pref_group, county_group, city_groups, street_group = _detail_components(match)
         addresses.append({
-            "full_address": full_address,
-            "prefecture": prefecture,
-            "county": county if county else None,
-            "city": city,
-            "street_number": street_number if street_number else None,
+            "full_address": record.full_address,
+            "city_address": record.city_address,
+            "prefecture": record.prefecture,
+            "county": record.county,
+            "city": record.city,
+            "street_number": record.street_number,
+            "span": list(record.span),
+            "spans": {
+                "prefecture": _span(match, pref_group),
+                "county": _span(match, county_group) if record.county else None,
+                "city": [
+                    match.start(city_groups[0]),
+                    max(match.end(g) for g in city_groups if match.group(g) is not None),
+                ],
+                "street_number": _span(match, street_group) if record.street_number else None,
+            },
         })
-        seen.add(full_address)
+    return addresses
 
-    return json.dumps(addresses, ensure_ascii=False, indent=2)
+
+def split_address_levels(combined: List[dict]):
+    """
+    Split extract_combined_addresses_list output into the two flat lists.
+
+    Args:
+        combined: Address objects from extract_combined_addresses_list
+
+    Returns:
+        (full_addresses, city_addresses): the list extract_full_addresses_list
+        returns for the same text, and the distinct city-level forms in
+        order.  On ordinary addresses the latter equals
+        extract_address_tool.extract_addresses_list, but it is derived from
+        the full matches (see extract_combined_addresses), so the two can
+        differ.
+    """
+    full_addresses = [a["full_address"] for a in combined]
+    city_addresses = []
+    for a in combined:
+        if a["city_address"] and a["city_address"] not in city_addresses:
+            city_addresses.append(a["city_address"])
+    return full_addresses, city_addresses
+
+
+def _extract_chunk(texts: List[str]) -> List[List[str]]:
+    """Process pool task: extract full addresses from a chunk of texts."""
+    return [_full_addresses(text) if text else [] for text in texts]
+
+
+def extract_full_addresses_batch(
+    texts: Iterable[str],
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+) -> Iterator[List[str]]:
+    """
+    Extract Japanese full addresses from many texts using a process pool.
+
+    Yields one list per text (the same list extract_full_addresses_list
+    returns), in input order.  Texts are sent to the workers in chunks and
+    only a few chunks per worker are in flight at a time, so *texts* may be
+    a long iterator (e.g. lines of a page corpus).
+
+    Args:
+        texts: Plain texts to extract addresses from
+        workers: Worker processes (default: os.cpu_count()); 1 runs in-process
+        chunksize: Texts per task sent to a worker
+
+    Yields:
+        List of extracted full addresses for each text
+
+    Example:
+        >>> list(extract_full_addresses_batch(["東京都港区芝公園4-2-8", "住所なし"], workers=2))
+        [['東京都港区芝公園4-2-8'], []]
+    """
+    workers = workers or os.cpu_count() or 1
+    texts = iter(texts)
+    if workers == 1:
+        for text in texts:
+            yield _full_addresses(text) if text else []
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        while True:
+            chunk = list(islice(texts, chunksize))
+            if chunk:
+                pending.append(pool.submit(_extract_chunk, chunk))
+            if pending and (not chunk or len(pending) >= workers * 2):
+                yield from pending.popleft().result()
+            if not chunk and not pending:
+                break
+
+
+def iter_full_addresses(
+    source: Union[str, os.PathLike, BinaryIO],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    max_carry: int = STREAM_MAX_CARRY,
+) -> Iterator[Tuple[str, int, int]]:
+    """
+    Stream full addresses from a UTF-8 file of any size.
+
+    The input is read and decoded chunk by chunk.  Because no address can
+    contain whitespace, "、" or "。", the characters after the last delimiter
+    of a chunk are carried over and scanned together with the next chunk, so
+    addresses that cross a chunk boundary are found exactly as in
+    extract_full_addresses.  Memory stays at about chunk_size + max_carry
+    regardless of the input size.
+
+    Every occurrence is yielded (no deduplication) with its byte offsets in
+    the input.
+
+    Args:
+        source: File path, or a binary file object opened for reading
+        chunk_size: Bytes read per chunk
+        max_carry: Longest delimiter-free run (in characters) carried over;
+            a longer run at a chunk boundary is scanned as is, so an address
+            crossing that point may be cut
+
+    Yields:
+        (address, start_byte, end_byte)
+
+    Example:
+        >>> list(iter_full_addresses(io.BytesIO("本社 東京都港区芝公園4-2-8".encode())))
+        [('東京都港区芝公園4-2-8', 7, 36)]
+    """
+    return iter_stream_matches(source, BASIC_REGEX, _SUFFIX_RE, chunk_size, max_carry)
+
+
+def _run_jsonl(lines: Iterable[str], workers: Optional[int]) -> None:
+    """Read {"id", "text"} JSON lines and print {"id", "addresses"} JSON lines."""
+    ids = deque()
+
+    def _texts():
+        for line in lines:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            ids.append(record.get("id"))
+            yield record.get("text") or ""
+
+    for addresses in extract_full_addresses_batch(_texts(), workers=workers):
+        print(json.dumps({"id": ids.popleft(), "addresses": addresses}, ensure_ascii=False))
 
 
 if __name__ == "__main__":
@@ -218,10 +543,45 @@ if __name__ == "__main__":
         sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-    if len(sys.argv) > 1:
-        with open(sys.argv[1], 'r', encoding='utf-8') as f:
-            text_content = f.read()
+    # --combined: one pass, full + city-level forms with spans
+    combined = '--combined' in sys.argv[1:]
+    # --stream: read the input in chunks; one {"address", "start", "end"}
+    # object per occurrence (byte offsets) per line
+    stream = '--stream' in sys.argv[1:]
+    # --jsonl: one {"id", "text"} object per line in, {"id", "addresses"} per line out
+    jsonl = '--jsonl' in sys.argv[1:]
+    # --workers=N: worker processes for --jsonl (default: CPU count)
+    workers = None
+    args = []
+    for arg in sys.argv[1:]:
+        if arg.startswith('--workers='):
+            workers = int(arg.split('=', 1)[1])
+        elif arg not in ('--combined', '--jsonl', '--stream'):
+            args.append(arg)
+
+    if jsonl:
+        if args:
+            with open(args[0], 'r', encoding='utf-8') as f:
+                _run_jsonl(f, workers)
+        else:
+            _run_jsonl(sys.stdin, workers)
+        sys.exit(0)
+
+    source = args[0] if args else sys.stdin.buffer
+
+    if stream:
+        for address, start, end in iter_full_addresses(source):
+            print(json.dumps({"address": address, "start": start, "end": end}, ensure_ascii=False))
+        sys.exit(0)
+
+    if combined:
+        if args:
+            with open(args[0], 'r', encoding='utf-8') as f:
+                text_content = f.read()
+        else:
+            text_content = sys.stdin.read()
+        print(extract_combined_addresses(text_content))
     else:
-        text_content = sys.stdin.read()
-
-    print(extract_full_addresses(text_content))
+        # Streamed, so large inputs are not read into memory at once
+        addresses = list(dict.fromkeys(address for address, _, _ in iter_full_addresses(source)))
+        print(json.dumps(addresses, ensure_ascii=False, indent=2))
@@ -1,12 +1,27 @@
 """Tests for Japanese full address extraction (including block/lot numbers)."""
 
+import io
 import json
+import random
+
 import pytest
 from extract_full_address_tool.extract import (
+    BASIC_REGEX,
+    DETAIL_REGEX,
+    Address,
+    _iter_matches,
+    _run_jsonl,
+    extract_full_addresses_batch,
+    extract_address_records,
+    iter_full_addresses,
     extract_full_addresses,
     extract_full_addresses_list,
     extract_full_addresses_detailed,
+    extract_combined_addresses,
+    extract_combined_addresses_list,
+    split_address_levels,
 )
+from extract_address_tool import extract_addresses_list
 
 
 class TestExtractFullAddresses:
@@ -274,5 +289,195 @@ class TestNoPrefectureAddresses:
         assert addresses[0] == "札幌市中央区南1条西16丁目291番地"
 
 
+
+class TestExtractCombinedAddresses:
+    """Test suite for the single-pass full + city-level extractor."""
+
+    TEXTS = [
+        "本社は東京都渋谷区道玄坂1丁目2番3号です。支社は大阪府大阪市北区梅田2-4-9。",
+        "青森県上北郡六戸町大字犬落瀬字前谷地1-2",
+        "東京都港区",
+        "本社: 東京都新宿区西新宿2-8-1、支社: 横浜市中区山下町1番地",
+        "060-8543札幌市中央区南1条西16丁目291番地",
+        "住所東京都港区芝公園4-2-8",
+        "東京都港区芝公園4-2-8と東京都港区芝公園4丁目2番8号",
+        "",
+    ]
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_levels_match_separate_extractors(self, text):
+        """On ordinary addresses both lists equal the two separate extractors."""
+        full, city = split_address_levels(extract_combined_addresses_list(text))
+        assert full == extract_full_addresses_list(text)
+        assert city == extract_addresses_list(text)
+
+    def test_city_level_is_taken_from_the_full_match(self):
+        """The city-level form comes from the full match, not from a separate scan."""
+        text = "住所東京都港区芝公園4丁目2番8号町田ビル"
+        full, city = split_address_levels(extract_combined_addresses_list(text))
+        assert full == extract_full_addresses_list(text) == ["住所東京都港区芝公園4丁目2番8号"]
+        assert city == ["東京都港区"]
+        assert extract_addresses_list(text) == ["東京都港区芝公園4丁目2番8号町"]
+
+    def test_components_and_spans(self):
+        """Components are returned with their spans in the text."""
+        text = "本社は東京都渋谷区道玄坂1丁目2番3号です。"
+        address = extract_combined_addresses_list(text)[0]
+        assert address["full_address"] == "東京都渋谷区道玄坂1丁目2番3号"
+        assert address["city_address"] == "東京都渋谷区"
+        assert address["street_number"] == "道玄坂1丁目2番3号"
+        start, end = address["span"]
+        assert text[start:end] == address["full_address"]
+        for component in ("prefecture", "city", "street_number"):
+            start, end = address["spans"][component]
+            assert text[start:end] == address[component]
+        assert address["spans"]["county"] is None
+
+    def test_county_span(self):
+        """County spans point at the 郡 component."""
+        text = "青森県上北郡六戸町大字犬落瀬字前谷地1-2"
+        address = extract_combined_addresses_list(text)[0]
+        start, end = address["spans"]["county"]
+        assert text[start:end] == "上北郡"
+        assert address["city_address"] == "青森県上北郡六戸町"
+
+    def test_no_prefecture_has_no_city_address(self):
+        """Addresses without a prefecture have no city-level form."""
+        address = extract_combined_addresses_list("横浜市中区山下町1番地")[0]
+        assert address["prefecture"] is None
+        assert address["city_address"] is None
+        assert address["city"] == "横浜市中区"
+
+    def test_json_output(self):
+        """The JSON form decodes to the list form."""
+        text = "東京都港区芝公園4-2-8"
+        assert json.loads(extract_combined_addresses(text)) == extract_combined_addresses_list(text)
+
+
+
+class TestExtractAddressRecords:
+    """Test suite for extract_address_records."""
+
+    def test_record_fields(self):
+        """Test that a record carries components and the span."""
+        text = "本社は東京都渋谷区道玄坂1丁目2番3号です。"
+        assert extract_address_records(text) == [
+            Address("東京都渋谷区道玄坂1丁目2番3号", "東京都渋谷区", "東京都", None, "渋谷区", "道玄坂1丁目2番3号", (3, 19))
+        ]
+
+    def test_matches_json_apis(self):
+        """Test that records agree with the detailed and combined JSON output."""
+        text = (
+            "支社は大阪府大阪市北区梅田2-4-9、工場は青森県上北郡六戸町大字犬落瀬字権現沢4-1。"
+            "住所東京都港区芝公園4-2-8 札幌市中央区北1条西2丁目"
+        )
+        records = extract_address_records(text)
+        detailed = json.loads(extract_full_addresses_detailed(text))
+        combined = extract_combined_addresses_list(text)
+        assert [r._asdict() for r in records] == [
+            {**d, "city_address": c["city_address"], "span": tuple(c["span"])} for d, c in zip(detailed, combined)
+        ]
+        assert [r.full_address for r in records] == extract_full_addresses_list(text)
+
+    def test_empty(self):
+        """Test that empty text gives no records."""
+        assert extract_address_records("") == []
+
+    def test_validate_drops_unknown_municipalities(self):
+        """Test that validate=True keeps only addresses of real municipalities."""
+        text = "東京都内の各区1-2と東京都渋谷区道玄坂1丁目2番3号、住所東京都港区芝公園4-2-8"
+        assert [r.full_address for r in extract_address_records(text)] == [
+            "東京都内の各区1-2", "東京都渋谷区道玄坂1丁目2番3号", "住所東京都港区芝公園4-2-8",
+        ]
+        assert [r.full_address for r in extract_address_records(text, validate=True)] == [
+            "東京都渋谷区道玄坂1丁目2番3号", "住所東京都港区芝公園4-2-8",
+        ]
+
+
+class TestExtractFullAddressesBatch:
+    """Test suite for extract_full_addresses_batch and the JSONL CLI mode."""
+
+    TEXTS = [
+        "本社は東京都渋谷区道玄坂1丁目2番3号です。",
+        "",
+        "住所の記載はありません。",
+        "支社は大阪府大阪市北区梅田2-4-9、工場は青森県上北郡六戸町大字犬落瀬字権現沢4-1。",
+    ] * 5
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_matches_single_text_results_in_order(self, workers):
+        """Test that results equal extract_full_addresses_list, in input order."""
+        expected = [extract_full_addresses_list(text) for text in self.TEXTS]
+        results = list(extract_full_addresses_batch(iter(self.TEXTS), workers=workers, chunksize=3))
+        assert results == expected
+
+    def test_empty_input(self):
+        """Test that no texts give no results."""
+        assert list(extract_full_addresses_batch([], workers=2)) == []
+
+    def test_jsonl(self, capsys):
+        """Test that JSONL records keep their ids."""
+        lines = [
+            json.dumps({"id": 1, "text": self.TEXTS[0]}, ensure_ascii=False),
+            "",
+            json.dumps({"id": "b", "text": self.TEXTS[2]}, ensure_ascii=False),
+        ]
+        _run_jsonl(lines, workers=2)
+        out = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert out == [
+            {"id": 1, "addresses": ["東京都渋谷区道玄坂1丁目2番3号"]},
+            {"id": "b", "addresses": []},
+        ]
+
+
+class TestIterFullAddresses:
+    """Test suite for the streaming extractor."""
+
+    TEXT = (
+        "本社は東京都渋谷区道玄坂1丁目2番3号です。支社は大阪府大阪市北区梅田2-4-9\n"
+        "工場　青森県上北郡六戸町大字犬落瀬字権現沢4-1、本社 東京都渋谷区道玄坂1丁目2番3号"
+    ) * 3
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 16, 1 << 20])
+    def test_chunk_boundaries_do_not_lose_matches(self, chunk_size):
+        """Test that every chunk size finds the same matches with correct byte offsets."""
+        data = self.TEXT.encode("utf-8")
+        results = list(iter_full_addresses(io.BytesIO(data), chunk_size=chunk_size))
+        assert [a for a, _, _ in results] == [m.group(0) for m in BASIC_REGEX.finditer(self.TEXT)]
+        for address, start, end in results:
+            assert data[start:end].decode("utf-8") == address
+        assert list(dict.fromkeys(a for a, _, _ in results)) == extract_full_addresses_list(self.TEXT)
+
+    def test_path(self, tmp_path):
+        """Test that a file path is accepted."""
+        path = tmp_path / "page.txt"
+        path.write_text("所在地：東京都港区芝公園4-2-8", encoding="utf-8")
+        assert list(iter_full_addresses(path)) == [("東京都港区芝公園4-2-8", 12, 41)]
+
+    def test_empty(self):
+        """Test that empty input yields nothing."""
+        assert list(iter_full_addresses(io.BytesIO(b""))) == []
+
+
+class TestRunPrefilter:
+    """The run pre-filter returns exactly the matches of a whole-text scan."""
+
+    PIECES = [
+        "東京都", "北海道", "大阪府", "青森県", "上北", "郡", "市", "区", "町", "村", "港", "札幌", "中央",
+        "芝公園", "道玄坂", "丁目", "番地", "番", "号", "条", "西", "1", "２", "十", "-", "－", "\u2212",
+        "と", "や", "及び", "は", "の", "、", "。", " ", "\n", "\u3000", "あ", "ア", "々", "a", "：",
+    ]
+
+    @pytest.mark.parametrize("regex", [BASIC_REGEX, DETAIL_REGEX])
+    def test_random_texts(self, regex):
+        """Random texts built from address fragments and delimiters."""
+        rng = random.Random(0)
+        for _ in range(3000):
+            text = "".join(rng.choice(self.PIECES) for _ in range(rng.randint(0, 40)))
+            expected = [(m.span(), m.groups()) for m in regex.finditer(text)]
+            actual = [(m.span(), m.groups()) for m in _iter_matches(regex, text)]
+            assert actual == expected, text
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -7,11 +7,14 @@ to retrieve information from the internet and return results in JSON format.
 import json
 import os
 import sys
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional
 
 import httpx
 from dotenv import load_dotenv
 
+from google_search_tool.cache import SearchCache
+from google_search_tool.client import AsyncSearchClient, format_results
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -21,23 +24,42 @@ GOOGLE_CSE_ID = os.environ.get("GOOGLE_CSE_ID", "")
 GOOGLE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
 
 
-def search(query: str, num_results: int = 10) -> Dict[str, Any]:
+def search(
+    query: str, num_results: int = 10, cache: Optional[SearchCache] = None
+) -> Dict[str, Any]:
     """Search the web using Google Custom Search.
 
     Args:
         query: The search query string.
         num_results: Number of results to return (1-10, default 10).
+        cache: Optional SearchCache. A cached result is returned without
+            calling the API, and successful results are stored in it.
 
     Returns:
         Dictionary containing either search results or error information.
     """
+    num_results = max(1, min(10, num_results))
+
+    if cache is not None:
+        cached = cache.get(query, num_results)
+        if cached is not None:
+            return cached
+        if cache.cache_only:
+            return {"error": "Query not found in search cache (cache-only mode)"}
+
+    result = _search_api(query, num_results)
+    if cache is not None and "error" not in result:
+        cache.put(query, num_results, result)
+    return result
+
+
+def _search_api(query: str, num_results: int) -> Dict[str, Any]:
+    """Call the Custom Search API once."""
     if not GOOGLE_API_KEY or not GOOGLE_CSE_ID:
         return {
             "error": "GOOGLE_API_KEY and GOOGLE_CSE_ID environment variables must be set."
         }
 
-    num_results = max(1, min(10, num_results))
-
     params = {
         "key": GOOGLE_API_KEY,
         "cx": GOOGLE_CSE_ID,
@@ -59,20 +81,7 @@ def search(query: str, num_results: int = 10) -> Dict[str, Any]:
             except ValueError:
                 return {"error": "Failed to parse response as JSON"}
 
-        items = data.get("items", [])
-        if not items:
-            return {"results": [], "count": 0}
-
-        results: List[Dict[str, str]] = []
-        for item in items:
-            result = {
-                "title": item.get("title", "No title"),
-                "link": item.get("link", "No link"),
-                "snippet": item.get("snippet", "No description"),
-            }
-            results.append(result)
-
-        return {"results": results, "count": len(results)}
+        return format_results(data)
 
     except httpx.TimeoutException:
         return {"error": "Request timeout"}
@@ -111,10 +120,35 @@ def main() -> None:
         action="store_true",
         help="Pretty-print JSON output",
     )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="SQLite search cache file (default: no cache)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=None,
+        help="Seconds a cached result stays valid (default: 30 days)",
+    )
+    parser.add_argument(
+        "--cache-only",
+        action="store_true",
+        help="Answer from --cache only, never call the API",
+    )
 
     args = parser.parse_args()
+    if args.cache_only and not args.cache:
+        parser.error("--cache-only requires --cache")
+
+    cache = None
+    if args.cache:
+        cache_options = {"cache_only": args.cache_only}
+        if args.cache_ttl is not None:
+            cache_options["ttl"] = args.cache_ttl
+        cache = SearchCache(args.cache, **cache_options)
 
-    result = search(args.query, args.num_results)
+    result = search(args.query, args.num_results, cache=cache)
 
     if args.pretty:
         print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -0,0 +1,120 @@
+"""Persistent search result cache.
+
+SearchCache stores successful search() results in a SQLite file, keyed by
+the normalized query and the number of results, so repeated searches (for
+example re-running a batch) do not spend Custom Search API quota again.
+
+Queries are normalized with NFKC, case folding and whitespace collapsing, so
+"東京タワー　東京都港区" and "東京タワー 東京都港区" share one entry.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Optional
+
+DEFAULT_TTL = 30 * 24 * 3600  # 30 days
+DEFAULT_MAX_ENTRIES = 100_000
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    query       TEXT NOT NULL,
+    num         INTEGER NOT NULL,
+    fetched_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    result      TEXT NOT NULL,
+    PRIMARY KEY (query, num)
+);
+CREATE INDEX IF NOT EXISTS searches_accessed_at ON searches (accessed_at);
+"""
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query for cache lookups."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", query)).strip().casefold()
+
+
+class SearchCache:
+    """SQLite-backed search result cache with TTL and a maximum size.
+
+    Args:
+        path: SQLite file (parent directories are created).
+        ttl: Seconds an entry stays valid (None = forever).
+        max_entries: Maximum number of entries; the least recently used
+            entries are removed beyond it.
+        cache_only: Never call the API; a miss returns an error instead.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float] = DEFAULT_TTL,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+        cache_only: bool = False,
+    ) -> None:
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_only = cache_only
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, query: str, num_results: int) -> Optional[Dict[str, Any]]:
+        """Return the cached result for (query, num_results), or None."""
+        key = (normalize_query(query), num_results)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, result FROM searches WHERE query = ? AND num = ?", key
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[0] > self.ttl:
+                self._conn.execute("DELETE FROM searches WHERE query = ? AND num = ?", key)
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE searches SET accessed_at = ? WHERE query = ? AND num = ?", (now, *key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[1])
+
+    def put(self, query: str, num_results: int, result: Dict[str, Any]) -> None:
+        """Store a successful search result."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (query, num, fetched_at, accessed_at, result) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (normalize_query(query), num_results, now, now, json.dumps(result, ensure_ascii=False)),
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM searches WHERE rowid IN ("
+                    "SELECT rowid FROM searches ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and the hit/miss counters of this instance."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,228 @@
+"""Async Google Custom Search client for many queries.
+
+AsyncSearchClient keeps one pooled httpx.AsyncClient for all requests (HTTP/2
+when the optional ``h2`` package is installed), paces requests with a token
+bucket matched to the CSE quota, retries 429 and 5xx responses with
+exponential backoff and full jitter, and runs large query lists under a
+concurrency cap with search_many().
+
+Results have the same shape as google_search_tool.search():
+{"results": [...], "count": N} or {"error": "..."}.
+
+Example:
+    async with AsyncSearchClient(rate=100 / 60) as client:
+        results = await client.search_many(queries, num_results=5)
+"""
+
+import asyncio
+import importlib.util
+import os
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+
+GOOGLE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+
+# CSE default quota: 100 queries per minute per user
+DEFAULT_RATE = 100 / 60
+DEFAULT_BURST = 10
+DEFAULT_CONCURRENCY = 10
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def format_results(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a CSE API response to {"results": [...], "count": N}."""
+    items = data.get("items", [])
+    if not items:
+        return {"results": [], "count": 0}
+
+    results: List[Dict[str, str]] = []
+    for item in items:
+        result = {
+            "title": item.get("title", "No title"),
+            "link": item.get("link", "No link"),
+            "snippet": item.get("snippet", "No description"),
+        }
+        results.append(result)
+
+    return {"results": results, "count": len(results)}
+
+
+class TokenBucket:
+    """Async token bucket: *rate* tokens per second, up to *capacity* at once."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncSearchClient:
+    """Connection-pooled, rate-limited Google Custom Search client.
+
+    Args:
+        api_key: CSE API key (default: GOOGLE_API_KEY environment variable).
+        cse_id: Search engine ID (default: GOOGLE_CSE_ID environment variable).
+        base_url: API endpoint (override to test against a local stub server).
+        rate: Requests per second allowed by the token bucket.
+        burst: Token bucket capacity.
+        concurrency: Maximum requests in flight.
+        max_retries: Retries after a 429/5xx response or a transport error.
+        backoff: Base delay in seconds for exponential backoff.
+        max_backoff: Upper bound on one backoff delay.
+        timeout: Per-request timeout in seconds.
+        http2: Use HTTP/2 (default: when the ``h2`` package is installed).
+        cache: Optional google_search_tool.cache.SearchCache.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cse_id: Optional[str] = None,
+        base_url: str = GOOGLE_SEARCH_URL,
+        rate: float = DEFAULT_RATE,
+        burst: float = DEFAULT_BURST,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_retries: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 30.0,
+        http2: Optional[bool] = None,
+        cache=None,
+    ) -> None:
+        self.api_key = api_key if api_key is not None else os.environ.get("GOOGLE_API_KEY", "")
+        self.cse_id = cse_id if cse_id is not None else os.environ.get("GOOGLE_CSE_ID", "")
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.cache = cache
+        if http2 is None:
+            http2 = importlib.util.find_spec("h2") is not None
+        self._http = httpx.AsyncClient(
+            timeout=timeout,
+            http2=http2,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+        self._bucket = TokenBucket(rate, burst)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.requests = 0
+        self.retries = 0
+
+    async def __aenter__(self) -> "AsyncSearchClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the connection pool."""
+        await self._http.aclose()
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(self.max_backoff, float(retry_after))
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def search(self, query: str, num_results: int = 10) -> Dict[str, Any]:
+        """Search once (with rate limiting, retries and the optional cache)."""
+        num_results = max(1, min(10, num_results))
+
+        if self.cache is not None:
+            cached = self.cache.get(query, num_results)
+            if cached is not None:
+                return cached
+            if self.cache.cache_only:
+                return {"error": "Query not found in search cache (cache-only mode)"}
+
+        if not self.api_key or not self.cse_id:
+            return {
+                "error": "GOOGLE_API_KEY and GOOGLE_CSE_ID environment variables must be set."
+            }
+
+        params = {
+            "key": self.api_key,
+            "cx": self.cse_id,
+            "q": query,
+            "num": num_results,
+        }
+
+        async with self._semaphore:
+            result = await self._request(params)
+
+        if self.cache is not None and "error" not in result:
+            self.cache.put(query, num_results, result)
+        return result
+
+    async def _request(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            await self._bucket.acquire()
+            self.requests += 1
+            response = None
+            try:
+                response = await self._http.get(self.base_url, params=params)
+            except httpx.TimeoutException:
+                error = {"error": "Request timeout"}
+            except httpx.RequestError as e:
+                error = {"error": f"Request error: {str(e)}"}
+            else:
+                if response.status_code == 200:
+                    try:
+                        return format_results(response.json())
+                    except ValueError:
+                        return {"error": "Failed to parse response as JSON"}
+                error = {
+                    "error": f"Search request failed with status {response.status_code}: {response.text}"
+                }
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return error
+
+            if attempt >= self.max_retries:
+                return error
+            self.retries += 1
+            await asyncio.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+
+    async def search_many(
+        self, queries: Iterable[str], num_results: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Run many searches concurrently; results are returned in query order.
+
+        At most ``concurrency`` requests are in flight, and only that many
+        queries are pending at a time, so *queries* may be a long iterator.
+        """
+        results: Dict[int, Dict[str, Any]] = {}
+        queue = iter(enumerate(queries))
+
+        async def _worker() -> None:
+            for index, query in queue:
+                results[index] = await self.search(query, num_results)
+
+        await asyncio.gather(*(_worker() for _ in range(self.concurrency)))
+        return [results[i] for i in range(len(results))]
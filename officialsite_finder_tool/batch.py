@@ -0,0 +1,104 @@
+"""Batch mode for officialsite_finder_tool.
+
+Reads facilities from a TSV file with the columns of
+tests/resource/sample_from_scuel.tsv (施設名 / 都道府県 / 住所) or from a JSONL
+file of {"name": ..., "address": ...} objects, runs the first round of the
+pipeline for many facilities concurrently and streams one JSONL record per
+facility as soon as it is ready:
+
+    {"row": 1, "name": "...", "address": "...", "output": {...}}
+
+"output" is exactly what the single-facility CLI would print: a final result
+({"success": ...}) or a judgment request ({"action": ...}) that can be
+continued with the CLI arguments or the session server.
+"""
+
+import csv
+import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .finder import FinderSession
+from .log import log_print
+
+
+def read_facilities(path):
+    """Yield (row, name, address) from a TSV or JSONL facility list.
+
+    TSV files use the 施設名 column as the name and 都道府県 + 住所 as the
+    address (住所 alone when there is no 都道府県 column).  Files ending in
+    .jsonl / .json are read as one {"name", "address"} object per line.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if str(path).lower().endswith((".jsonl", ".json")):
+            row = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                row += 1
+                record = json.loads(line)
+                yield row, str(record.get("name", "")).strip(), str(record.get("address", "")).strip()
+        else:
+            reader = csv.DictReader(f, delimiter="\t")
+            for row, record in enumerate(reader, start=1):
+                name = (record.get("施設名") or "").strip()
+                address = (record.get("都道府県") or "").strip() + (record.get("住所") or "").strip()
+                yield row, name, address
+
+
+def find_first_round(name, address, engine, criteria_text=None):
+    """Run the first round of the pipeline for one facility and return its output."""
+    if not name or not address:
+        return {
+            "success": False,
+            "facility_name": name,
+            "input_address": address,
+            "message": "入力エラー: 施設名称と住所は必須です"
+        }
+    log_print(f"[INFO] ===== 開始: {name} / {address} =====")
+    return FinderSession(name, address, engine, criteria_text=criteria_text).next()
+
+
+def run_batch(facilities, engine, out, criteria_text=None, workers=4):
+    """Process *facilities* with at most *workers* running at once.
+
+    Records are written to *out* (one JSON line each) in completion order.
+    Only about 2 × workers facilities are held in memory at a time, so the
+    input can be arbitrarily long.
+
+    Returns:
+        Number of facilities processed.
+    """
+    write_lock = threading.Lock()
+    count = 0
+
+    def _process(row, name, address):
+        try:
+            output = find_first_round(name, address, engine, criteria_text)
+        except Exception as e:
+            log_print(f"[ERROR] row {row}: {e}")
+            output = {
+                "success": False,
+                "facility_name": name,
+                "input_address": address,
+                "message": f"処理エラー: {e}"
+            }
+        record = {"row": row, "name": name, "address": address, "output": output}
+        with write_lock:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for row, name, address in facilities:
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(executor.submit(_process, row, name, address))
+            count += 1
+        for future in pending:
+            future.result()
+
+    log_print(f"[INFO] Batch finished: {count} facilities")
+    return count
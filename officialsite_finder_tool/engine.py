@@ -0,0 +1,574 @@
+"""Tool engines for officialsite_finder_tool.
+
+An engine provides the tool operations the finder pipeline needs:
+
+- extract_address(text)        → list of full addresses (extract_full_address_tool)
+- extract_city_address(text)   → list of city-level addresses (extract_address_tool)
+- extract_address_levels(text) → (full addresses, city-level addresses) in one pass
+- google_search(query, n)      → {"results": [...], "count": N} or {"error": ...}
+- download_html(url)           → {"title": ..., "text": ...} or None
+- compare_addresses(a1, a2)    → bool (compare_address_full_tool)
+- match_any(target, addresses) → index of the first compatible address, or None
+
+By default both engines fetch a page with a plain HTTP GET first and render
+it in Chromium only when the static HTML has no usable text or is a
+JavaScript shell (playwright_download_tool/fetch.py); pass http_first=False
+to always render.
+
+Both engines accept an optional page cache (playwright_download_tool/cache.py)
+that is consulted before any browser is started, so a page rendered once is
+served from disk in later judgment rounds and later runs, and an optional
+search cache (google_search_tool/cache.py) that saves Custom Search quota.
+
+SubprocessEngine starts a new ``python`` process for every call, which keeps
+each tool isolated from the orchestrator.  InProcessEngine imports the tools
+once and calls them directly, downloading pages through a pool of warm
+Chromium browsers (playwright_download_tool/pool.py); it returns exactly the
+same values, so the JSON protocol of the CLI does not depend on the engine in
+use.
+"""
+
+import asyncio
+import atexit
+import functools
+import json
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from .log import log_print
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PLAYWRIGHT_TOOL_DIR = PROJECT_ROOT / "playwright_download_tool"
+
+# Per-page download timeout in seconds (same as the subprocess timeout).  In
+# process it is applied once the page has a pooled browser, so pages queued
+# behind a busy pool do not time out without being rendered.
+DOWNLOAD_TIMEOUT = 30
+
+# How Chromium decides a page has loaded: "address" returns as soon as a
+# Japanese address is on the page instead of waiting for the network to go
+# idle (analytics beacons, chat widgets and long polling may never stop).
+# PAGE_DEADLINE is the time budget of one page across the HTTP tier and the
+# browser: the HTTP GET may use at most half of it and the browser load gets
+# the rest, leaving room for starting a browser within DOWNLOAD_TIMEOUT.  A
+# page still loading at the deadline is used as it is.
+WAIT_MODE = "address"
+PAGE_DEADLINE = 20
+
+# Abort image/media/font/stylesheet requests and ad/analytics hosts while
+# rendering (playwright_download_tool/block.py); only the text is needed
+BLOCK_RESOURCES = True
+
+# Extract the page text inside Chromium (innerText) and return only that,
+# instead of copying the serialized DOM to Python and parsing it again
+EXTRACT_IN_BROWSER = True
+
+# Number of warm Chromium instances kept by InProcessEngine
+BROWSER_POOL_SIZE = 2
+
+# Default locations of the on-disk caches
+DEFAULT_PAGE_CACHE = PROJECT_ROOT / "cache" / "pages.sqlite3"
+DEFAULT_SEARCH_CACHE = PROJECT_ROOT / "cache" / "search.sqlite3"
+
+
+def _add_playwright_tool_path():
+    # playwright_download_tool is a script directory (download.py imports
+    # "extract" as a top-level module), so it must be on sys.path.
+    tool_dir = str(PLAYWRIGHT_TOOL_DIR)
+    if tool_dir not in sys.path:
+        sys.path.insert(0, tool_dir)
+
+
+def open_page_cache(path=DEFAULT_PAGE_CACHE):
+    """Open the playwright_download_tool page cache at *path* (None if unavailable)."""
+    try:
+        _add_playwright_tool_path()
+        from cache import PageCache
+        return PageCache(path)
+    except Exception as e:
+        log_print(f"[WARNING] Page cache unavailable ({e}) — pages will not be cached")
+        return None
+
+
+def open_search_cache(path=DEFAULT_SEARCH_CACHE, cache_only=False):
+    """Open the google_search_tool search cache at *path* (None if unavailable)."""
+    try:
+        from google_search_tool.cache import SearchCache
+        return SearchCache(str(path), cache_only=cache_only)
+    except Exception as e:
+        log_print(f"[WARNING] Search cache unavailable ({e}) — searches will not be cached")
+        return None
+
+
+def _cached_download(page_cache, url, download):
+    """Return *url* from *page_cache*, or call download(url) and cache a successful result."""
+    if page_cache is not None:
+        cached = page_cache.get(url)
+        if cached is not None:
+            log_print(f"[INFO] Page cache hit: {url}")
+            return cached
+    result = download(url)
+    if page_cache is not None and result:
+        try:
+            meta = {key: value for key, value in result.items() if key not in ("title", "text")}
+            page_cache.put(url, result.get("title"), result.get("text"), meta=meta)
+        except Exception as e:
+            log_print(f"[WARNING] Page cache write failed for {url}: {e}")
+    return result
+
+
+class SubprocessEngine:
+    """Run every tool step as a separate ``python`` process."""
+
+    name = "subprocess"
+
+    def __init__(self, page_cache=None, search_cache=None, http_first=True):
+        self.page_cache = page_cache
+        self.search_cache = search_cache
+        self.http_first = http_first
+
+    def extract_address(self, text):
+        """Extract Japanese address from text using extract_full_address_tool."""
+        try:
+            result = subprocess.run(
+                ["python", "-m", "extract_full_address_tool.extract"],
+                input=text,
+                capture_output=True,
+                text=True,
+                timeout=10,
+                encoding="utf-8"
+            )
+
+            if result.returncode != 0:
+                return []
+
+            addresses = json.loads(result.stdout.strip())
+            return addresses if isinstance(addresses, list) else []
+
+        except Exception as e:
+            log_print(f"[WARNING] Address extraction failed: {e}")
+            return []
+
+    def extract_city_address(self, text):
+        """Extract Japanese address up to city/ward level using extract_address_tool."""
+        try:
+            result = subprocess.run(
+                ["python", "-m", "extract_address_tool"],
+                input=text,
+                capture_output=True,
+                text=True,
+                timeout=10,
+                encoding="utf-8"
+            )
+
+            if result.returncode != 0:
+                return []
+
+            addresses = json.loads(result.stdout.strip())
+            return addresses if isinstance(addresses, list) else []
+
+        except Exception as e:
+            log_print(f"[WARNING] City address extraction failed: {e}")
+            return []
+
+    def extract_address_levels(self, text):
+        """Extract full and city-level addresses in one pass (extract_full_address_tool --combined)."""
+        try:
+            result = subprocess.run(
+                ["python", "-m", "extract_full_address_tool.extract", "--combined"],
+                input=text,
+                capture_output=True,
+                text=True,
+                timeout=10,
+                encoding="utf-8"
+            )
+
+            if result.returncode != 0:
+                return [], []
+
+            combined = json.loads(result.stdout.strip())
+            full_addresses = [a["full_address"] for a in combined]
+            city_addresses = []
+            for a in combined:
+                if a["city_address"] and a["city_address"] not in city_addresses:
+                    city_addresses.append(a["city_address"])
+            return full_addresses, city_addresses
+
+        except Exception as e:
+            log_print(f"[WARNING] Address extraction failed: {e}")
+            return [], []
+
+    def google_search(self, query, num_results=5):
+        """Search Google using google_search_tool."""
+        command = ["python", "-m", "google_search_tool", query, "-n", str(num_results)]
+        if self.search_cache is not None:
+            command += ["--cache", self.search_cache.path]
+            if self.search_cache.cache_only:
+                command.append("--cache-only")
+        try:
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                timeout=30,
+                encoding="utf-8"
+            )
+
+            if result.returncode != 0:
+                return {"error": f"Search failed: {result.stderr}"}
+
+            search_results = json.loads(result.stdout.strip())
+            return search_results
+
+        except Exception as e:
+            return {"error": f"Search error: {e}"}
+
+    def download_html(self, url):
+        """Download HTML using playwright_download_tool, returning {"title": ..., "text": ...} or None."""
+        return _cached_download(self.page_cache, url, self._download)
+
+    def _download(self, url):
+        command = ["python", "download.py", url, "--format=json",
+                   f"--wait={WAIT_MODE}", f"--deadline={PAGE_DEADLINE}"]
+        if BLOCK_RESOURCES:
+            command.append("--block")
+        if EXTRACT_IN_BROWSER:
+            command.append("--in-browser")
+        if self.http_first:
+            command.append("--http-first")
+        try:
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                timeout=DOWNLOAD_TIMEOUT,
+                cwd=str(PLAYWRIGHT_TOOL_DIR),
+                encoding="utf-8"
+            )
+
+            if result.returncode != 0:
+                return None
+
+            return json.loads(result.stdout.strip())
+
+        except Exception as e:
+            log_print(f"[WARNING] HTML download failed for {url}: {e}")
+            return None
+
+    def compare_addresses(self, addr1, addr2):
+        """Compare two addresses using compare_address_full_tool (prefix/containment matching).
+
+        compare_address_full_tool handles:
+        - Full-width/half-width normalization
+        - Kanji numeral conversion
+        - Banchi notation differences (1丁目2番3号 ↔ 1-2-3)
+        - Prefix/containment matching (city-level matches full street address)
+        """
+        try:
+            result = subprocess.run(
+                ["python", "-m", "compare_address_full_tool", addr1, addr2],
+                capture_output=True,
+                text=True,
+                timeout=10,
+                encoding="utf-8"
+            )
+
+            # Exit code 0 means match, 1 means no match
+            return result.returncode == 0
+
+        except Exception as e:
+            log_print(f"[WARNING] Address comparison failed: {e}")
+            return False
+
+    def match_any(self, target, candidates):
+        """Index of the first candidate compatible with *target*, or None.
+
+        One compare_address_full_tool process for all candidates.
+        """
+        if not candidates:
+            return None
+        try:
+            result = subprocess.run(
+                ["python", "-m", "compare_address_full_tool", "--first", target, *candidates],
+                capture_output=True,
+                text=True,
+                timeout=10,
+                encoding="utf-8"
+            )
+            match = json.loads(result.stdout)
+            return match["index"] if match else None
+
+        except Exception as e:
+            log_print(f"[WARNING] Address comparison failed: {e}")
+            return None
+
+
+# ---------------------------------------------------------------------------
+# In-process engine
+# ---------------------------------------------------------------------------
+
+def _import_extract_full():
+    from extract_full_address_tool.extract import extract_full_addresses_list
+    return extract_full_addresses_list
+
+
+def _import_extract_levels():
+    from extract_full_address_tool.extract import extract_address_records
+
+    def _extract_levels(text):
+        records = extract_address_records(text)
+        full_addresses = [r.full_address for r in records]
+        city_addresses = list(dict.fromkeys(r.city_address for r in records if r.city_address))
+        return full_addresses, city_addresses
+
+    return _extract_levels
+
+
+def _import_extract_city():
+    from extract_address_tool.extract import extract_addresses_list
+    return extract_addresses_list
+
+
+def _import_search():
+    from google_search_tool import search
+    return search
+
+
+class _PooledDownloader:
+    """Run a BrowserPool on a background event loop shared by all callers.
+
+    The loop thread and the browsers stay alive for the life of the process,
+    so every download after the first reuses a running Chromium.  Calls are
+    thread-safe: batch mode and the session server download concurrently
+    through the same pool.  The pool bounds each page (see _browser_pool);
+    a call waits while the page is queued for a free browser.
+    """
+
+    def __init__(self, pool_cls, size=BROWSER_POOL_SIZE):
+        self._pool = pool_cls(size=size)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="browser-pool", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __call__(self, url, output_format="json"):
+        future = asyncio.run_coroutine_threadsafe(self._pool.fetch(url, output_format), self._loop)
+        return future.result()
+
+    def close(self):
+        """Close the browsers and stop the loop thread."""
+        if not self._loop.is_running():
+            return
+        if hasattr(self._pool, "stats"):
+            log_print(f"[INFO] Download stats: {json.dumps(self._pool.stats())}")
+        try:
+            asyncio.run_coroutine_threadsafe(self._pool.close(), self._loop).result(DOWNLOAD_TIMEOUT)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(DOWNLOAD_TIMEOUT)
+
+
+def _log_tier(url, tier, reason):
+    if tier == "http":
+        log_print(f"[INFO] Static HTML used (no browser): {url}")
+    else:
+        log_print(f"[INFO] Rendering in browser ({reason}): {url}")
+
+
+def _log_requests(url, stats):
+    if stats["blocked"]:
+        log_print(f"[INFO] Blocked {stats['blocked']} requests {json.dumps(stats['blocked_by_type'])}, "
+                  f"loaded {stats['bytes_loaded'] / 1024:.0f} KiB: {url}")
+
+
+def _browser_pool(size):
+    from pool import BrowserPool
+
+    blocker = None
+    if BLOCK_RESOURCES:
+        from block import RequestBlocker
+        blocker = RequestBlocker(on_page=_log_requests)
+    return BrowserPool(size=size, wait=WAIT_MODE, deadline=PAGE_DEADLINE, blocker=blocker,
+                       in_browser=EXTRACT_IN_BROWSER, timeout=DOWNLOAD_TIMEOUT)
+
+
+def _import_download():
+    _add_playwright_tool_path()
+    from fetch import TieredFetcher
+
+    def _fetcher(size):
+        return TieredFetcher(_browser_pool(size), on_decision=_log_tier, deadline=PAGE_DEADLINE)
+
+    return _PooledDownloader(_fetcher)
+
+
+def _import_download_browser():
+    _add_playwright_tool_path()
+    return _PooledDownloader(_browser_pool)
+
+
+def _import_compare():
+    from compare_address_full_tool import AddressMatcher
+
+    # The finder compares one target address with every page address, so
+    # keep a matcher (with the normalized target) per recent target
+    matcher = functools.lru_cache(maxsize=64)(AddressMatcher)
+    return lambda addr1, addr2: matcher(addr1).matches(addr2)
+
+
+def _import_match_any():
+    from compare_address_full_tool import match_any
+    return match_any
+
+
+_IMPORTERS = {
+    "extract_full": _import_extract_full,
+    "extract_city": _import_extract_city,
+    "extract_levels": _import_extract_levels,
+    "search": _import_search,
+    "download": _import_download,
+    "download_browser": _import_download_browser,
+    "compare": _import_compare,
+    "match_any": _import_match_any,
+}
+
+
+class InProcessEngine:
+    """Import the tools once and call them directly in this interpreter.
+
+    Tools are imported lazily on first use.  If a tool cannot be imported
+    (e.g. Playwright is not installed in this environment), that operation
+    falls back to the subprocess engine.
+    """
+
+    name = "inprocess"
+
+    def __init__(self, fallback=None, page_cache=None, search_cache=None, http_first=True):
+        self._fallback = fallback or SubprocessEngine(search_cache=search_cache, http_first=http_first)
+        self.page_cache = page_cache
+        self.search_cache = search_cache
+        self.http_first = http_first
+        self._tools = {}
+        self._tools_lock = threading.Lock()
+
+    def _tool(self, key):
+        """Return the imported tool function for *key*, or None if unavailable.
+
+        Created once per engine even when several threads ask at once (the
+        downloader owns a browser pool and a loop thread).
+        """
+        if key not in self._tools:
+            with self._tools_lock:
+                if key not in self._tools:
+                    try:
+                        tool = _IMPORTERS[key]()
+                    except Exception as e:
+                        log_print(f"[WARNING] In-process {key} unavailable ({e}) — using subprocess")
+                        tool = None
+                    self._tools[key] = tool
+        return self._tools[key]
+
+    def extract_address(self, text):
+        """Extract Japanese full addresses from text."""
+        extract = self._tool("extract_full")
+        if extract is None:
+            return self._fallback.extract_address(text)
+        try:
+            return extract(text)
+        except Exception as e:
+            log_print(f"[WARNING] Address extraction failed: {e}")
+            return []
+
+    def extract_city_address(self, text):
+        """Extract Japanese addresses up to city/ward level from text."""
+        extract = self._tool("extract_city")
+        if extract is None:
+            return self._fallback.extract_city_address(text)
+        try:
+            return extract(text)
+        except Exception as e:
+            log_print(f"[WARNING] City address extraction failed: {e}")
+            return []
+
+    def extract_address_levels(self, text):
+        """Extract full and city-level addresses from text in one pass."""
+        extract = self._tool("extract_levels")
+        if extract is None:
+            return self._fallback.extract_address_levels(text)
+        try:
+            return extract(text)
+        except Exception as e:
+            log_print(f"[WARNING] Address extraction failed: {e}")
+            return [], []
+
+    def google_search(self, query, num_results=5):
+        """Search Google via google_search_tool.search."""
+        search = self._tool("search")
+        if search is None:
+            return self._fallback.google_search(query, num_results)
+        try:
+            return search(query, num_results, cache=self.search_cache)
+        except Exception as e:
+            return {"error": f"Search error: {e}"}
+
+    def download_html(self, url):
+        """Download a page, returning {"title": ..., "text": ...} or None."""
+        return _cached_download(self.page_cache, url, self._download)
+
+    def _download(self, url):
+        fetch = self._tool("download" if self.http_first else "download_browser")
+        if fetch is None:
+            return self._fallback.download_html(url)
+        try:
+            return fetch(url, "json")
+        except Exception as e:
+            log_print(f"[WARNING] HTML download failed for {url}: {e}")
+            return None
+
+    def compare_addresses(self, addr1, addr2):
+        """Compare two addresses with prefix/containment matching."""
+        compare = self._tool("compare")
+        if compare is None:
+            return self._fallback.compare_addresses(addr1, addr2)
+        try:
+            return compare(addr1, addr2)
+        except Exception as e:
+            log_print(f"[WARNING] Address comparison failed: {e}")
+            return False
+
+    def match_any(self, target, candidates):
+        """Index of the first candidate compatible with *target*, or None."""
+        match_any = self._tool("match_any")
+        if match_any is None:
+            return self._fallback.match_any(target, candidates)
+        try:
+            match = match_any(target, candidates)
+            return match.index if match else None
+        except Exception as e:
+            log_print(f"[WARNING] Address comparison failed: {e}")
+            return None
+
+
+ENGINES = {
+    InProcessEngine.name: InProcessEngine,
+    SubprocessEngine.name: SubprocessEngine,
+}
+
+
+def create_engine(name="inprocess", page_cache=None, search_cache=None, http_first=True):
+    """Create the tool engine registered under *name*.
+
+    Args:
+        name: Engine name (see ENGINES).
+        page_cache: Optional PageCache (see open_page_cache) used by download_html.
+        search_cache: Optional SearchCache (see open_search_cache) used by google_search.
+        http_first: Try a plain HTTP GET before rendering a page in Chromium.
+    """
+    try:
+        engine_cls = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown engine: {name} (choose from {', '.join(ENGINES)})")
+    return engine_cls(page_cache=page_cache, search_cache=search_cache, http_first=http_first)
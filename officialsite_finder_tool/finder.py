@@ -0,0 +1,383 @@
+"""Official site finder pipeline (Steps 2–7) as a resumable session.
+
+A FinderSession holds everything one facility needs between judgment
+rounds: the target address, the search results, the downloaded pages, the
+addresses extracted from them and the set of URLs to skip.  The CLI builds a
+fresh session for every invocation from its arguments; the session server
+(officialsite_finder_tool.server) keeps sessions in memory so that the next
+round resumes in place instead of searching, downloading and extracting again.
+
+On the first pass over the search results every candidate URL is
+downloaded, extracted and compared concurrently (prefetch), and the judgment
+request goes to the best candidate: address-matched pages first, then search
+rank.  Later rounds are served from the pages already in the session.
+
+Every step returns the same JSON-compatible output dicts as the CLI protocol.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .log import log_print
+
+# Candidate URLs downloaded at the same time during prefetch
+PREFETCH_WORKERS = 5
+
+CRITERIA_QUESTION = (
+    "このページは criteria.txt の「URL収集対象」に該当しますか？"
+    "「eligible」（収集対象）または「not_eligible」（収集対象外）で回答し、理由を列挙して添えてください。"
+)
+
+
+def load_criteria(criteria_file):
+    """Load criteria.txt content. Returns None if file not found."""
+    try:
+        with open(criteria_file, encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log_print(f"[WARNING] Failed to read criteria file {criteria_file}: {e}")
+        return None
+
+
+def exit_code(output):
+    """CLI exit code for an output dict: 1 for failures, 0 otherwise."""
+    return 1 if output.get("success") is False else 0
+
+
+class FinderSession:
+    """State and steps of the official site search for one facility.
+
+    Args:
+        facility_name:    Facility name.
+        facility_address: Facility address as given by the user.
+        engine:           Tool engine (see officialsite_finder_tool.engine).
+        criteria_text:    Content of criteria.txt, or None to skip Step 7.
+        target_address:   Pre-extracted target address (skips Step 2).
+        search_results:   Previous search results, as a list of result dicts
+                          or a {"results": [...], "count": N} dict (skips Step 3).
+        skip_urls:        URLs that were already rejected.
+        prefetch:         Download and analyse all candidate URLs concurrently
+                          and offer the best candidate first (False = one URL
+                          at a time, in search rank order).
+    """
+
+    def __init__(self, facility_name, facility_address, engine, criteria_text=None,
+                 target_address=None, search_results=None, skip_urls=(), prefetch=True):
+        self.facility_name = facility_name
+        self.facility_address = facility_address
+        self.engine = engine
+        self.criteria_text = criteria_text
+        self.target_address = target_address or None
+        if isinstance(search_results, list):
+            search_results = {"results": search_results, "count": len(search_results)}
+        self.search_results = search_results
+        self.skip_urls = set(skip_urls)
+        self.prefetch = prefetch
+        # url → {"title": ..., "text": ...} (None when the download failed)
+        self.pages = {}
+        # url → addresses extracted from the page text
+        self.page_addresses = {}
+        # url → [(page address, matched), ...] up to the first match
+        self.comparisons = {}
+        # (full addresses, city-level addresses) of facility_address
+        self._input_levels = None
+        # Last judgment request returned to the caller (None when finished)
+        self.pending = None
+
+    # ------------------------------------------------------------------
+    # Output helpers
+    # ------------------------------------------------------------------
+
+    def _failure(self, message):
+        return {
+            "success": False,
+            "facility_name": self.facility_name,
+            "input_address": self.facility_address,
+            "message": message
+        }
+
+    def _success(self, url, matched_address):
+        log_print(f"[INFO] === 結果: 成功 — {url} (matched: {matched_address})")
+        return {
+            "success": True,
+            "facility_name": self.facility_name,
+            "input_address": self.facility_address,
+            "official_site_url": url,
+            "matched_address": matched_address,
+            "message": "公式サイトのトップページを発見しました"
+        }
+
+    def _request(self, output):
+        self.pending = output
+        return output
+
+    # ------------------------------------------------------------------
+    # Cached tool calls
+    # ------------------------------------------------------------------
+
+    def fetch_page(self, url):
+        """Download *url* once per session (failures are remembered too)."""
+        if url not in self.pages:
+            self.pages[url] = self.engine.download_html(url)
+        return self.pages[url]
+
+    def extract_page_addresses(self, url, text):
+        """Extract addresses from a page text once per session."""
+        if url not in self.page_addresses:
+            self.page_addresses[url] = self.engine.extract_address(text)
+        return self.page_addresses[url]
+
+    def compare_page_addresses(self, url, page_addresses):
+        """Compare page addresses with the target until the first match (once per session)."""
+        if url not in self.comparisons:
+            # One call for all page addresses; the result is recorded as if
+            # they had been compared one by one up to the first match
+            index = self.engine.match_any(self.target_address, page_addresses)
+            compared = page_addresses if index is None else page_addresses[:index + 1]
+            self.comparisons[url] = [(page_addr, i == index) for i, page_addr in enumerate(compared)]
+        return self.comparisons[url]
+
+    def analyse_page(self, url):
+        """Steps 4–6a for one URL without logging: download, extract, compare."""
+        page_result = self.fetch_page(url)
+        if page_result:
+            page_addresses = self.extract_page_addresses(url, page_result["text"])
+            self.compare_page_addresses(url, page_addresses)
+        return page_result
+
+    def address_matched(self, url):
+        """True if *url* has been analysed and one of its addresses matched."""
+        return any(matched for _, matched in self.comparisons.get(url, ()))
+
+    def _prefetch(self, urls):
+        """Analyse every URL in *urls* that is not cached yet, concurrently."""
+        todo = [url for url in urls if url not in self.pages]
+        if len(todo) < 2:
+            return
+        log_print(f"[INFO] Step 4: {len(todo)}件のURLを並行ダウンロード")
+        with ThreadPoolExecutor(max_workers=min(PREFETCH_WORKERS, len(todo))) as executor:
+            for url, future in [(url, executor.submit(self.analyse_page, url)) for url in todo]:
+                try:
+                    future.result()
+                except Exception as e:
+                    log_print(f"[WARNING] Step 4: 先読み失敗 — {url}: {e}")
+                    self.pages.setdefault(url, None)
+
+    # ------------------------------------------------------------------
+    # Judgment results
+    # ------------------------------------------------------------------
+
+    def apply_content_judgment(self, judgment, url, matched_address="", reason=None):
+        """Apply a judge_officialsite_content_skill result (Yes/No).
+
+        Returns the next output, or None when the search continues with the
+        URL loop (see next()).
+        """
+        self.pending = None
+        log_print(f"[INFO] === コンテンツ判定結果を受信: {judgment}")
+        log_print(f"[INFO]   URL: {url}")
+        if reason:
+            for line in reason.strip().splitlines():
+                log_print(f"[INFO]   理由: {line}")
+        else:
+            log_print(f"[INFO]   理由: (理由が渡されていません)")
+        matched_address = matched_address or ""
+
+        if judgment.lower() == "yes":
+            log_print(f"[INFO]   → Yes: 公式サイトのトップページと判定")
+
+            if self.criteria_text:
+                log_print(f"[INFO] criteria判定依頼へ進む")
+                page_result = self.fetch_page(url)
+                html_text = page_result["text"] if page_result else ""
+                return self._request({
+                    "action": "request_criteria_judgment",
+                    "facility_name": self.facility_name,
+                    "url": url,
+                    "html_text_preview": html_text[:5000],
+                    "criteria": self.criteria_text,
+                    "question": CRITERIA_QUESTION,
+                    "matched_address": matched_address,
+                    "search_results": [],
+                    "target_address": self.target_address or ""
+                })
+            else:
+                log_print(f"[INFO] criteria.txtなし → 直接成功")
+                return self._success(url, matched_address)
+
+        log_print(f"[INFO]   → No: 公式サイトのトップページでない → スキップ")
+        self.skip_urls.add(url)
+        return None
+
+    def apply_criteria_judgment(self, judgment, url, matched_address="", reason=None):
+        """Apply a criteria.txt eligibility result (eligible/not_eligible).
+
+        Returns the success output, or None when the search continues with
+        the URL loop (see next()).
+        """
+        self.pending = None
+        log_print(f"[INFO] === criteria判定結果を受信: {judgment}")
+        log_print(f"[INFO]   URL: {url}")
+        if reason:
+            for line in reason.strip().splitlines():
+                log_print(f"[INFO]   理由: {line}")
+        matched_address = matched_address or ""
+
+        if judgment.lower() == "eligible":
+            log_print(f"[INFO]   → eligible: 収集対象と判定 → 成功終了")
+            return self._success(url, matched_address)
+
+        elif judgment.lower() == "not_eligible":
+            log_print(f"[INFO]   → not_eligible: 収集対象外と判定 → スキップして検索結果の次のURLへ")
+            self.skip_urls.add(url)
+        return None
+
+    # ------------------------------------------------------------------
+    # Steps 2–6
+    # ------------------------------------------------------------------
+
+    def _input_address_levels(self):
+        """Full and city-level addresses of the input, from one extraction pass."""
+        if self._input_levels is None:
+            self._input_levels = self.engine.extract_address_levels(self.facility_address)
+        return self._input_levels
+
+    def _resolve_target_address(self):
+        """Step 2: extract the target address from the input (once)."""
+        if self.target_address:
+            log_print(f"[INFO] Step 2: Using provided target address: {self.target_address}")
+            return True
+
+        log_print(f"[INFO] Step 2: Extracting address from: {self.facility_address}")
+        extracted_addresses, _ = self._input_address_levels()
+        if not extracted_addresses:
+            return False
+
+        self.target_address = extracted_addresses[0]
+        log_print(f"[INFO] Extracted address: {self.target_address}")
+        return True
+
+    def _search(self):
+        """Step 3: Google search (once). Returns a failure output or None."""
+        if self.search_results is not None:
+            log_print(f"[INFO] Step 3: Using provided search results ({self.search_results.get('count', 0)} URLs)")
+            return None
+
+        _, city_addresses = self._input_address_levels()
+        search_address = city_addresses[0] if city_addresses else self.target_address
+        log_print(f"[INFO] Step 3: Searching Google for: {self.facility_name} {search_address}")
+        query = f"{self.facility_name} {search_address}"
+        search_results = self.engine.google_search(query, num_results=5)
+
+        if "error" in search_results:
+            return self._failure(f"Google検索エラー: {search_results['error']}")
+
+        if not search_results.get("results") or search_results.get("count", 0) == 0:
+            return self._failure("検索結果が見つかりませんでした")
+
+        log_print(f"[INFO] Step 3: 検索結果 {len(search_results['results'])}件")
+        for i, r in enumerate(search_results["results"]):
+            log_print(f"[INFO]   [{i+1}] {r['link']}")
+            log_print(f"[INFO]       title  : {r.get('title', '(なし)')}")
+            snippet = r.get('snippet', '(なし)').replace('\n', ' ')
+            log_print(f"[INFO]       snippet: {snippet[:120]}")
+
+        self.search_results = search_results
+        return None
+
+    def next(self):
+        """Run Steps 2–6 and return the next output (judgment request or result)."""
+        if not self._resolve_target_address():
+            return self._failure("住所の抽出に失敗しました")
+
+        failure = self._search()
+        if failure:
+            return failure
+
+        target_address = self.target_address
+        search_results = self.search_results
+
+        candidates = []
+        for idx, result in enumerate(search_results["results"]):
+            url = result["link"]
+
+            # Skip PDF files
+            if url.lower().endswith('.pdf'):
+                log_print(f"[INFO] Skipping PDF: {url}")
+                continue
+
+            # Skip previously processed/rejected URLs
+            if url in self.skip_urls:
+                log_print(f"[INFO] Skipping previously processed URL: {url}")
+                continue
+
+            candidates.append((idx, url))
+
+        if self.prefetch:
+            self._prefetch([url for _, url in candidates])
+            # Best candidate first: address-matched pages, then search rank
+            candidates.sort(key=lambda c: (not self.address_matched(c[1]), c[0]))
+
+        for idx, url in candidates:
+            log_print(f"[INFO] Step 4: HTMLダウンロード開始 [{idx+1}]: {url}")
+
+            # Step 4: Download HTML (returns {"title": ..., "text": ...})
+            page_result = self.analyse_page(url)
+            if not page_result:
+                log_print(f"[WARNING] Step 4: HTML取得失敗 → スキップ — {url}")
+                continue
+
+            html_text = page_result["text"]
+            page_title = page_result["title"]
+            log_print(f"[INFO] Step 4: HTML取得成功 ({len(html_text)} 文字) title=\"{page_title}\" — {url}")
+
+            # Step 5: Extract addresses from HTML
+            page_addresses = self.page_addresses[url]
+
+            # Step 6a: Compare addresses (record result, do NOT skip on mismatch)
+            address_matched = False
+            matched_address = None
+
+            if page_addresses:
+                log_print(f"[INFO] Step 5: ページ内住所 {len(page_addresses)}件")
+                for i, addr in enumerate(page_addresses):
+                    log_print(f"[INFO]   [{i+1}] {addr}")
+
+                log_print(f"[INFO] Step 6a: 住所照合 (target: {target_address})")
+                for i, (page_addr, matched) in enumerate(self.comparisons[url]):
+                    if matched:
+                        address_matched = True
+                        matched_address = page_addr
+                        log_print(f"[INFO]   比較[{i+1}]: \"{page_addr}\" → 一致")
+                        break
+                    else:
+                        log_print(f"[INFO]   比較[{i+1}]: \"{page_addr}\" → 不一致")
+
+                if not address_matched:
+                    log_print(f"[INFO] Step 6a: 全住所が不一致 (住所照合失敗) — コンテンツ判定は継続")
+            else:
+                log_print(f"[INFO] Step 5: ページ内住所なし — コンテンツ判定は継続")
+
+            # Step 6b: Request content judgment via judge_officialsite_content_skill
+            # (independent of address match result)
+            log_print(f"[INFO] Step 6b: コンテンツ判定依頼 (address_matched={address_matched})")
+            log_print(f"[INFO]   URL    : {url}")
+            log_print(f"[INFO]   title  : {page_title}")
+            preview_for_log = html_text[:200].replace('\n', ' ')
+            log_print(f"[INFO]   preview: {preview_for_log}")
+            return self._request({
+                "action": "request_content_judgment",
+                "facility_name": self.facility_name,
+                "url": url,
+                "title": page_title,
+                "html_text_preview": html_text[:5000],
+                "address_matched": address_matched,
+                "matched_address": matched_address or "",
+                "search_results": search_results.get("results", []),
+                "target_address": target_address
+            })
+
+        # No results found
+        log_print(f"[INFO] === 結果: 失敗 — 全検索結果を処理したが公式サイトが見つかりませんでした")
+        return self._failure("公式サイトが見つかりませんでした")
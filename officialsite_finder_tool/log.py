@@ -0,0 +1,25 @@
+"""Logging helper shared by the officialsite_finder_tool modules."""
+
+import datetime
+import sys
+
+# Log file path (set by main() after arg parsing)
+_log_file = None
+
+
+def set_log_file(path):
+    """Configure the file that log_print appends to (None disables file logging)."""
+    global _log_file
+    _log_file = path
+
+
+def log_print(msg: str):
+    """Print to stderr and append to log file (if configured)."""
+    print(msg, file=sys.stderr)
+    if _log_file:
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with open(_log_file, "a", encoding="utf-8") as f:
+                f.write(f"{timestamp} {msg}\n")
+        except OSError:
+            pass  # don't let logging errors crash the tool
@@ -0,0 +1,377 @@
+"""Session server for the official site finder judgment loop.
+
+Keeps one FinderSession per facility in memory, keyed by a session id, so
+that each judgment round resumes in place: search results, downloaded pages,
+extracted addresses and the skip set are reused instead of being rebuilt by a
+new ``python -m officialsite_finder_tool`` process.
+
+Protocol: JSON-RPC 2.0, one JSON object per line, over stdio (default) or a
+Unix domain socket (--socket PATH).  Requests are handled concurrently, so
+many sessions can be driven at the same time; sessions idle for longer than
+--idle-timeout seconds are evicted.
+
+Methods:
+    start               {"name", "address", ["criteria_file", "search_results",
+                         "target_address", "skip_urls", "prefetch"]}
+    content_judgment    {"session_id", "judgment", ["url", "matched_address", "reason"]}
+    criteria_judgment   {"session_id", "judgment", ["url", "matched_address", "reason"]}
+    close               {"session_id"}
+    stats               {}
+
+start / content_judgment / criteria_judgment return
+{"session_id": ..., "output": <CLI output dict>, "done": bool}.  "url" and
+"matched_address" default to the values of the pending judgment request.
+A session is closed automatically once its output is a final result.
+
+Usage:
+    python -m officialsite_finder_tool.server
+    python -m officialsite_finder_tool.server --socket /tmp/officialsite_finder.sock
+"""
+
+import argparse
+import io
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .engine import (
+    DEFAULT_PAGE_CACHE,
+    DEFAULT_SEARCH_CACHE,
+    ENGINES,
+    create_engine,
+    open_page_cache,
+    open_search_cache,
+)
+from .finder import FinderSession, load_criteria
+from .log import log_print, set_log_file
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+UNKNOWN_SESSION = -32001
+
+
+class RpcError(Exception):
+    """Error returned to the client as a JSON-RPC error object."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class SessionStore:
+    """Thread-safe FinderSession registry with idle eviction.
+
+    Args:
+        engine:        Tool engine shared by all sessions.
+        criteria_file: Default criteria.txt path for new sessions.
+        idle_timeout:  Seconds after which an unused session is evicted.
+        max_sessions:  Upper bound on live sessions; the least recently used
+                       session is evicted when a new one would exceed it.
+    """
+
+    def __init__(self, engine, criteria_file="criteria.txt", idle_timeout=1800, max_sessions=10000):
+        self.engine = engine
+        self.criteria_file = criteria_file
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._sessions = {}  # session_id → [session, last_used, lock]
+        self._criteria = {}  # criteria path → text (read once)
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def criteria_text(self, path):
+        """Return criteria.txt content for *path*, reading the file only once."""
+        with self._lock:
+            if path in self._criteria:
+                return self._criteria[path]
+        text = load_criteria(path)
+        if text:
+            log_print(f"[INFO] Loaded criteria.txt from {path}")
+        else:
+            log_print(f"[WARNING] criteria.txt not found at {path} - criteria judgment will be skipped")
+        with self._lock:
+            self._criteria[path] = text
+        return text
+
+    def evict_idle(self, now=None):
+        """Drop sessions that have been idle longer than idle_timeout."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [sid for sid, (_, last_used, _) in self._sessions.items()
+                       if now - last_used > self.idle_timeout]
+            for sid in expired:
+                del self._sessions[sid]
+            self.evicted += len(expired)
+        for sid in expired:
+            log_print(f"[INFO] Session evicted (idle): {sid}")
+        return len(expired)
+
+    def add(self, session):
+        """Register *session* and return its new id."""
+        session_id = uuid.uuid4().hex
+        self.evict_idle()
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                oldest = min(self._sessions, key=lambda sid: self._sessions[sid][1])
+                del self._sessions[oldest]
+                self.evicted += 1
+                log_print(f"[INFO] Session evicted (max_sessions): {oldest}")
+            self._sessions[session_id] = [session, time.monotonic(), threading.Lock()]
+        return session_id
+
+    def acquire(self, session_id):
+        """Return (session, lock) for *session_id* and mark it as used."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                raise RpcError(UNKNOWN_SESSION, f"Unknown or expired session: {session_id}")
+            entry[1] = time.monotonic()
+            return entry[0], entry[2]
+
+    def remove(self, session_id):
+        """Forget *session_id*. Returns True if it existed."""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+
+# ---------------------------------------------------------------------------
+# Method handlers
+# ---------------------------------------------------------------------------
+
+def _require(params, key):
+    value = params.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise RpcError(INVALID_PARAMS, f"'{key}' is required")
+    return value.strip()
+
+
+def _result(store, session_id, output):
+    done = "success" in output
+    if done:
+        store.remove(session_id)
+    return {"session_id": session_id, "output": output, "done": done}
+
+
+def _start(store, params):
+    facility_name = _require(params, "name")
+    facility_address = _require(params, "address")
+    log_print(f"[INFO] ===== 開始: {facility_name} / {facility_address} =====")
+
+    session = FinderSession(
+        facility_name, facility_address, store.engine,
+        criteria_text=store.criteria_text(params.get("criteria_file") or store.criteria_file),
+        target_address=params.get("target_address"),
+        search_results=params.get("search_results"),
+        skip_urls=params.get("skip_urls") or (),
+        prefetch=params.get("prefetch", True),
+    )
+    session_id = store.add(session)
+    _, lock = store.acquire(session_id)
+    with lock:
+        output = session.next()
+    return _result(store, session_id, output)
+
+
+def _judgment(apply_name):
+    def handler(store, params):
+        session_id = _require(params, "session_id")
+        judgment = _require(params, "judgment")
+        session, lock = store.acquire(session_id)
+        with lock:
+            pending = session.pending or {}
+            url = params.get("url") or pending.get("url")
+            if not url:
+                raise RpcError(INVALID_PARAMS, "'url' is required (no pending judgment request)")
+            matched_address = params.get("matched_address")
+            if matched_address is None:
+                matched_address = pending.get("matched_address", "")
+            output = getattr(session, apply_name)(
+                judgment, url, matched_address=matched_address, reason=params.get("reason"),
+            )
+            if output is None:
+                output = session.next()
+        return _result(store, session_id, output)
+    return handler
+
+
+def _close(store, params):
+    return {"closed": store.remove(_require(params, "session_id"))}
+
+
+def _stats(store, params):
+    stats = {"sessions": len(store), "evicted": store.evicted, "engine": store.engine.name}
+    page_cache = getattr(store.engine, "page_cache", None)
+    if page_cache is not None:
+        stats["page_cache"] = page_cache.stats()
+    search_cache = getattr(store.engine, "search_cache", None)
+    if search_cache is not None:
+        stats["search_cache"] = search_cache.stats()
+    return stats
+
+
+METHODS = {
+    "start": _start,
+    "content_judgment": _judgment("apply_content_judgment"),
+    "criteria_judgment": _judgment("apply_criteria_judgment"),
+    "close": _close,
+    "stats": _stats,
+}
+
+
+def handle_request(store, request):
+    """Handle one decoded JSON-RPC request and return the response dict."""
+    request_id = request.get("id") if isinstance(request, dict) else None
+    try:
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            raise RpcError(INVALID_REQUEST, "Invalid request")
+        handler = METHODS.get(request["method"])
+        if handler is None:
+            raise RpcError(METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, "params must be an object")
+        return {"jsonrpc": "2.0", "id": request_id, "result": handler(store, params)}
+    except RpcError as e:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": e.code, "message": e.message}}
+    except Exception as e:
+        log_print(f"[ERROR] {request.get('method')} failed: {e}")
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": INTERNAL_ERROR, "message": str(e)}}
+
+
+def handle_line(store, line):
+    """Handle one JSON-RPC line and return the response line."""
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        response = {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": f"Parse error: {e}"}}
+    else:
+        response = handle_request(store, request)
+    return json.dumps(response, ensure_ascii=False)
+
+
+# ---------------------------------------------------------------------------
+# Transports
+# ---------------------------------------------------------------------------
+
+def serve_stdio(store, workers=8, stdin=None, stdout=None):
+    """Serve JSON-RPC lines from stdin, writing responses to stdout as they complete."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    write_lock = threading.Lock()
+
+    def _respond(line):
+        response = handle_line(store, line)
+        with write_lock:
+            stdout.write(response + "\n")
+            stdout.flush()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for line in stdin:
+            if line.strip():
+                executor.submit(_respond, line)
+
+
+class _LineHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for raw in self.rfile:
+            line = raw.decode("utf-8").strip()
+            if line:
+                response = handle_line(self.server.store, line)
+                self.wfile.write((response + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+
+def serve_unix(store, path):
+    """Serve JSON-RPC lines on a Unix domain socket (one thread per connection)."""
+    if os.path.exists(path):
+        os.remove(path)
+    with socketserver.ThreadingUnixStreamServer(path, _LineHandler) as server:
+        server.daemon_threads = True
+        server.store = store
+        log_print(f"[INFO] Listening on {path}")
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(path)
+
+
+def _evict_periodically(store, interval):
+    while True:
+        time.sleep(interval)
+        store.evict_idle()
+
+
+def main():
+    # Force UTF-8 encoding for stdio (Windows compatibility)
+    if sys.platform == 'win32':
+        if sys.stdin is sys.__stdin__ and hasattr(sys.stdin, 'buffer'):
+            sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+        if sys.stdout is sys.__stdout__ and hasattr(sys.stdout, 'buffer'):
+            sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+    parser = argparse.ArgumentParser(
+        description="Official site finder session server (JSON-RPC over stdio or a Unix socket)"
+    )
+    parser.add_argument("--socket", help="Unix socket path (default: serve on stdio)")
+    parser.add_argument("--criteria-file", default="criteria.txt", help="Default criteria.txt path for new sessions")
+    parser.add_argument("--idle-timeout", type=float, default=1800, help="Evict sessions idle for this many seconds (default: 1800)")
+    parser.add_argument("--max-sessions", type=int, default=10000, help="Maximum number of live sessions (default: 10000)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent requests on stdio (default: 8)")
+    parser.add_argument("--engine", choices=list(ENGINES), default="inprocess", help="Tool engine (default: inprocess)")
+    parser.add_argument("--page-cache", default=None,
+                        help="Rendered page cache file (default: cache/pages.sqlite3 in project root)")
+    parser.add_argument("--no-page-cache", action="store_true", help="Always download pages (no page cache)")
+    parser.add_argument("--browser-only", action="store_true",
+                        help="Always render pages in Chromium (no plain HTTP fetch first)")
+    parser.add_argument("--search-cache", default=None,
+                        help="Google search cache file (default: cache/search.sqlite3 in project root)")
+    parser.add_argument("--no-search-cache", action="store_true", help="Always call the search API (no search cache)")
+    parser.add_argument("--search-cache-only", action="store_true",
+                        help="Answer searches from the search cache only (offline, no API calls)")
+    parser.add_argument("--log-file", default=None, help="Log file path (default: stderr only)")
+    args = parser.parse_args()
+
+    if args.log_file:
+        set_log_file(args.log_file)
+
+    if args.search_cache_only and args.no_search_cache:
+        parser.error("--search-cache-only cannot be combined with --no-search-cache")
+    page_cache = None if args.no_page_cache else open_page_cache(args.page_cache or DEFAULT_PAGE_CACHE)
+    search_cache = None if args.no_search_cache else open_search_cache(
+        args.search_cache or DEFAULT_SEARCH_CACHE, cache_only=args.search_cache_only
+    )
+    store = SessionStore(
+        create_engine(args.engine, page_cache=page_cache, search_cache=search_cache,
+                      http_first=not args.browser_only),
+        criteria_file=args.criteria_file,
+        idle_timeout=args.idle_timeout,
+        max_sessions=args.max_sessions,
+    )
+    threading.Thread(
+        target=_evict_periodically, args=(store, min(60.0, args.idle_timeout)), daemon=True
+    ).start()
+
+    if args.socket:
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            parser.error("--socket requires Unix domain socket support")
+        serve_unix(store, args.socket)
+    else:
+        serve_stdio(store, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
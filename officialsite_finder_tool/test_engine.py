@@ -0,0 +1,286 @@
+"""Unit tests for officialsite_finder_tool.engine.
+
+Tests cover:
+  1. InProcessEngine returns the same values as SubprocessEngine
+  2. Fallback to the subprocess engine when a tool cannot be imported
+  3. _PooledDownloader - background event loop shared by all callers
+  4. Page and search caches
+  5. create_engine
+"""
+
+import asyncio
+import subprocess
+import threading
+import time
+
+import pytest
+
+from officialsite_finder_tool import engine as engine_module
+from officialsite_finder_tool.engine import (
+    InProcessEngine,
+    SubprocessEngine,
+    _PooledDownloader,
+    create_engine,
+    open_page_cache,
+    open_search_cache,
+)
+
+
+SAMPLE_TEXT = "本社は東京都港区芝公園4丁目2番8号です。支社は大阪府大阪市北区梅田2-4-9。"
+
+
+# ===========================================================================
+# 1. InProcessEngine ↔ SubprocessEngine parity
+# ===========================================================================
+
+class TestEngineParity:
+
+    def test_extract_address(self):
+        assert InProcessEngine().extract_address(SAMPLE_TEXT) == \
+            SubprocessEngine().extract_address(SAMPLE_TEXT)
+
+    def test_extract_city_address(self):
+        assert InProcessEngine().extract_city_address(SAMPLE_TEXT) == \
+            SubprocessEngine().extract_city_address(SAMPLE_TEXT)
+
+    def test_extract_address_levels(self):
+        assert InProcessEngine().extract_address_levels(SAMPLE_TEXT) == \
+            SubprocessEngine().extract_address_levels(SAMPLE_TEXT) == \
+            (InProcessEngine().extract_address(SAMPLE_TEXT), InProcessEngine().extract_city_address(SAMPLE_TEXT))
+
+    def test_extract_address_empty(self):
+        assert InProcessEngine().extract_address("") == []
+
+    @pytest.mark.parametrize("addr1,addr2", [
+        ("東京都港区芝公園4-2-8", "東京都港区芝公園4丁目2番8号"),
+        ("東京都港区芝公園4-2-8", "東京都港区"),
+        ("東京都港区", "大阪府大阪市北区"),
+    ])
+    def test_compare_addresses(self, addr1, addr2):
+        assert InProcessEngine().compare_addresses(addr1, addr2) == \
+            SubprocessEngine().compare_addresses(addr1, addr2)
+
+    @pytest.mark.parametrize("candidates", [
+        ["大阪府大阪市北区", "東京都港区", "東京都港区芝公園4-2-8"],
+        ["大阪府大阪市北区"],
+        [],
+    ])
+    def test_match_any(self, candidates):
+        target = "東京都港区芝公園4丁目2番8号"
+        expected = next((i for i, c in enumerate(candidates)
+                         if InProcessEngine().compare_addresses(target, c)), None)
+        assert InProcessEngine().match_any(target, candidates) == \
+            SubprocessEngine().match_any(target, candidates) == expected
+
+
+# ===========================================================================
+# 2. Fallback
+# ===========================================================================
+
+class _RecordingFallback:
+    def __init__(self):
+        self.calls = []
+
+    def download_html(self, url):
+        self.calls.append(url)
+        return {"title": "fallback", "text": ""}
+
+
+class TestFallback:
+
+    def test_unavailable_tool_uses_fallback(self, monkeypatch):
+        def _fail():
+            raise ImportError("No module named 'playwright'")
+
+        monkeypatch.setitem(engine_module._IMPORTERS, "download", _fail)
+        fallback = _RecordingFallback()
+        engine = InProcessEngine(fallback=fallback)
+
+        assert engine.download_html("https://example.com/") == {"title": "fallback", "text": ""}
+        assert engine.download_html("https://example.com/2") == {"title": "fallback", "text": ""}
+        assert fallback.calls == ["https://example.com/", "https://example.com/2"]
+
+    def test_tool_imported_once(self, monkeypatch):
+        imports = []
+
+        def _importer():
+            imports.append(1)
+            return lambda text: ["東京都港区"]
+
+        monkeypatch.setitem(engine_module._IMPORTERS, "extract_full", _importer)
+        engine = InProcessEngine()
+        engine.extract_address("a")
+        engine.extract_address("b")
+        assert len(imports) == 1
+
+    def test_tool_created_once_under_concurrent_first_calls(self, monkeypatch):
+        imports = []
+        barrier = threading.Barrier(5)
+
+        def _importer():
+            imports.append(1)
+            time.sleep(0.05)
+            return lambda url, output_format: {"title": "t", "text": ""}
+
+        monkeypatch.setitem(engine_module._IMPORTERS, "download", _importer)
+        engine = InProcessEngine()
+
+        def _download():
+            barrier.wait()
+            engine.download_html("https://example.com/")
+
+        threads = [threading.Thread(target=_download) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(imports) == 1
+
+
+# ===========================================================================
+# 3. _PooledDownloader
+# ===========================================================================
+
+class _FakePool:
+    """Stands in for pool.BrowserPool (no Chromium needed)."""
+
+    def __init__(self, size):
+        self.size = size
+        self.loops = set()
+        self.closed = False
+
+    async def fetch(self, url, output_format="json"):
+        self.loops.add(asyncio.get_running_loop())
+        await asyncio.sleep(0.2 if url.endswith("/slow") else 0.01)
+        return {"title": url, "text": output_format}
+
+    async def close(self):
+        self.closed = True
+
+
+class TestPooledDownloader:
+
+    def test_calls_from_many_threads_share_one_loop(self):
+        downloader = _PooledDownloader(_FakePool, size=2)
+        results = {}
+
+        def _download(i):
+            results[i] = downloader(f"https://example.com/{i}")
+
+        threads = [threading.Thread(target=_download, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        downloader.close()
+
+        assert results[3] == {"title": "https://example.com/3", "text": "json"}
+        assert len(downloader._pool.loops) == 1
+        assert downloader._pool.closed
+
+    def test_queued_downloads_do_not_time_out(self, monkeypatch):
+        # The per-page timeout belongs to the pool, which starts it once the
+        # page has a browser
+        monkeypatch.setattr(engine_module, "DOWNLOAD_TIMEOUT", 0.05)
+        downloader = _PooledDownloader(_FakePool, size=1)
+        assert downloader("https://example.com/slow")["title"] == "https://example.com/slow"
+        downloader.close()
+
+
+# ===========================================================================
+# 4. Page and search caches
+# ===========================================================================
+
+class TestPageCache:
+
+    @pytest.mark.parametrize("engine_cls", [InProcessEngine, SubprocessEngine])
+    def test_second_download_is_served_from_cache(self, tmp_path, monkeypatch, engine_cls):
+        downloads = []
+
+        def _download(self, url):
+            downloads.append(url)
+            return {"title": "t", "text": "東京都港区芝公園4-2-8"}
+
+        monkeypatch.setattr(engine_cls, "_download", _download)
+        page_cache = open_page_cache(tmp_path / "pages.sqlite3")
+        engine = engine_cls(page_cache=page_cache)
+
+        assert engine.download_html("https://example.com/") == {"title": "t", "text": "東京都港区芝公園4-2-8"}
+        assert engine_cls(page_cache=page_cache).download_html("https://example.com") == \
+            {"title": "t", "text": "東京都港区芝公園4-2-8"}
+        assert downloads == ["https://example.com/"]
+        assert page_cache.stats()["hits"] == 1
+
+    def test_cached_page_keeps_all_json_fields(self, tmp_path, monkeypatch):
+        page = {"title": "t", "text": "x", "description": "d", "addresses": ["東京都港区芝公園4-2-8"],
+                "postal_addresses": []}
+        monkeypatch.setattr(SubprocessEngine, "_download", lambda self, url: page)
+        page_cache = open_page_cache(tmp_path / "pages.sqlite3")
+        SubprocessEngine(page_cache=page_cache).download_html("https://example.com/")
+        assert page_cache.get("https://example.com/") == page
+
+    @pytest.mark.parametrize("engine_cls", [InProcessEngine, SubprocessEngine])
+    def test_search_cache_only(self, tmp_path, engine_cls):
+        cached = {"results": [{"title": "t", "link": "https://example.com/", "snippet": ""}], "count": 1}
+        search_cache = open_search_cache(tmp_path / "search.sqlite3", cache_only=True)
+        search_cache.put("東京タワー 東京都港区", 5, cached)
+        engine = engine_cls(search_cache=search_cache)
+        assert engine.google_search("東京タワー　東京都港区", num_results=5) == cached
+        assert "error" in engine.google_search("未登録の施設", num_results=5)
+
+    def test_failed_download_is_not_cached(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SubprocessEngine, "_download", lambda self, url: None)
+        page_cache = open_page_cache(tmp_path / "pages.sqlite3")
+        assert SubprocessEngine(page_cache=page_cache).download_html("https://example.com/") is None
+        assert page_cache.stats()["entries"] == 0
+
+
+# ===========================================================================
+# 5. create_engine
+# ===========================================================================
+
+class TestCreateEngine:
+
+    def test_default_is_inprocess(self):
+        assert isinstance(create_engine(), InProcessEngine)
+
+    def test_subprocess(self):
+        assert isinstance(create_engine("subprocess"), SubprocessEngine)
+
+    def test_page_cache_is_passed_to_engine(self, tmp_path):
+        page_cache = open_page_cache(tmp_path / "pages.sqlite3")
+        assert create_engine("subprocess", page_cache=page_cache).page_cache is page_cache
+
+    @pytest.mark.parametrize("name", ["inprocess", "subprocess"])
+    def test_http_first_is_passed_to_engine(self, name):
+        assert create_engine(name).http_first
+        assert not create_engine(name, http_first=False).http_first
+
+    @pytest.mark.parametrize("http_first,key", [(True, "download"), (False, "download_browser")])
+    def test_http_first_selects_downloader(self, monkeypatch, http_first, key):
+        used = []
+        for k in ("download", "download_browser"):
+            monkeypatch.setitem(engine_module._IMPORTERS, k,
+                                lambda k=k: lambda url, fmt: used.append(k) or {"title": k, "text": ""})
+        InProcessEngine(http_first=http_first).download_html("https://example.com/")
+        assert used == [key]
+
+    def test_subprocess_download_passes_http_first(self, monkeypatch):
+        commands = []
+
+        def _run(command, **kwargs):
+            commands.append(command)
+            return subprocess.CompletedProcess(command, 0, stdout='{"title": "t", "text": ""}', stderr="")
+
+        monkeypatch.setattr(engine_module.subprocess, "run", _run)
+        SubprocessEngine().download_html("https://example.com/")
+        SubprocessEngine(http_first=False).download_html("https://example.com/")
+        assert "--http-first" in commands[0] and "--http-first" not in commands[1]
+
+    def test_unknown_engine_raises(self):
+        with pytest.raises(ValueError):
+            create_engine("threads")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,317 @@
+"""Unit tests for officialsite_finder_tool.finder and officialsite_finder_tool.server.
+
+A fake engine replaces the real tools, so no network access is needed.
+
+Tests cover:
+  1. FinderSession - judgment loop steps and per-session caching
+  2. SessionStore  - session lifecycle and idle eviction
+  3. handle_line   - JSON-RPC protocol
+  4. batch         - facility list reading and concurrent first rounds
+"""
+
+import io
+import json
+import time
+
+import pytest
+
+from officialsite_finder_tool.batch import read_facilities, run_batch
+from officialsite_finder_tool.finder import FinderSession, exit_code
+from officialsite_finder_tool.server import SessionStore, handle_line, serve_stdio
+
+
+PAGES = {
+    "https://portal.example.com/shop/1": {"title": "ポータル", "text": "東京都港区芝公園4丁目2番8号 の施設"},
+    "https://www.tokyotower.co.jp/": {"title": "東京タワー", "text": "東京都港区芝公園4-2-8"},
+}
+SEARCH_RESULTS = [
+    {"title": "ポータル", "link": "https://portal.example.com/shop/1", "snippet": ""},
+    {"title": "資料", "link": "https://example.com/file.pdf", "snippet": ""},
+    {"title": "東京タワー", "link": "https://www.tokyotower.co.jp/", "snippet": ""},
+]
+
+
+class FakeEngine:
+    name = "fake"
+
+    def __init__(self):
+        self.downloads = []
+        self.searches = []
+
+    def extract_address(self, text):
+        from extract_full_address_tool import extract_full_addresses_list
+        return extract_full_addresses_list(text)
+
+    def extract_city_address(self, text):
+        from extract_address_tool import extract_addresses_list
+        return extract_addresses_list(text)
+
+    def extract_address_levels(self, text):
+        from extract_full_address_tool import extract_combined_addresses_list, split_address_levels
+        return split_address_levels(extract_combined_addresses_list(text))
+
+    def google_search(self, query, num_results=5):
+        self.searches.append(query)
+        return {"results": SEARCH_RESULTS, "count": len(SEARCH_RESULTS)}
+
+    def download_html(self, url):
+        self.downloads.append(url)
+        return PAGES.get(url)
+
+    def compare_addresses(self, addr1, addr2):
+        from compare_address_full_tool import compare_addresses
+        return compare_addresses(addr1, addr2)
+
+    def match_any(self, target, candidates):
+        from compare_address_full_tool import match_any
+        match = match_any(target, candidates)
+        return match.index if match else None
+
+
+def _session(engine, criteria_text=None, **kwargs):
+    return FinderSession("東京タワー", "東京都港区芝公園4丁目2番8号", engine,
+                         criteria_text=criteria_text, **kwargs)
+
+
+# ===========================================================================
+# 1. FinderSession
+# ===========================================================================
+
+class TestFinderSession:
+
+    def test_first_round_requests_content_judgment(self):
+        engine = FakeEngine()
+        output = _session(engine).next()
+        assert output["action"] == "request_content_judgment"
+        assert output["url"] == "https://portal.example.com/shop/1"
+        assert output["address_matched"] is True
+        assert output["target_address"] == "東京都港区芝公園4丁目2番8号"
+        assert engine.searches == ["東京タワー 東京都港区"]
+
+    def test_no_moves_to_next_url_without_search_or_download_again(self):
+        engine = FakeEngine()
+        session = _session(engine)
+        first = session.next()
+        assert session.apply_content_judgment("No", first["url"]) is None
+        second = session.next()
+        assert second["url"] == "https://www.tokyotower.co.jp/"
+        assert len(engine.searches) == 1
+        assert sorted(engine.downloads) == [
+            "https://portal.example.com/shop/1",
+            "https://www.tokyotower.co.jp/",
+        ]
+
+    def test_yes_without_criteria_succeeds(self):
+        session = _session(FakeEngine())
+        session.next()
+        output = session.apply_content_judgment("Yes", "https://portal.example.com/shop/1", "東京都港区")
+        assert output["success"] is True
+        assert output["official_site_url"] == "https://portal.example.com/shop/1"
+        assert exit_code(output) == 0
+
+    def test_yes_with_criteria_reuses_downloaded_page(self):
+        engine = FakeEngine()
+        session = _session(engine, criteria_text="収集対象: 公式サイト")
+        first = session.next()
+        output = session.apply_content_judgment("Yes", first["url"], first["matched_address"])
+        assert output["action"] == "request_criteria_judgment"
+        assert output["html_text_preview"] == PAGES[first["url"]]["text"]
+        assert engine.downloads.count(first["url"]) == 1
+
+    def test_not_eligible_continues_loop(self):
+        session = _session(FakeEngine(), criteria_text="収集対象: 公式サイト")
+        assert session.apply_criteria_judgment("not_eligible", "https://portal.example.com/shop/1") is None
+        assert session.next()["url"] == "https://www.tokyotower.co.jp/"
+
+    def test_all_urls_skipped_fails(self):
+        session = _session(FakeEngine(), skip_urls=[r["link"] for r in SEARCH_RESULTS])
+        output = session.next()
+        assert output["success"] is False
+        assert exit_code(output) == 1
+
+    def test_provided_search_results_skip_search(self):
+        engine = FakeEngine()
+        _session(engine, search_results=SEARCH_RESULTS[2:]).next()
+        assert engine.searches == []
+
+    def test_prefetch_downloads_all_candidates_once(self):
+        engine = FakeEngine()
+        session = _session(engine)
+        first = session.next()
+        assert sorted(engine.downloads) == sorted(PAGES)
+        session.apply_content_judgment("No", first["url"])
+        session.next()
+        assert len(engine.downloads) == len(PAGES)
+
+    def test_prefetch_offers_address_matched_candidate_first(self):
+        engine = FakeEngine()
+        results = [
+            {"title": "資料", "link": "https://example.com/unmatched", "snippet": ""},
+            {"title": "東京タワー", "link": "https://www.tokyotower.co.jp/", "snippet": ""},
+        ]
+        pages = dict(PAGES, **{"https://example.com/unmatched": {"title": "x", "text": "大阪府大阪市北区梅田2-4-9"}})
+        engine.download_html = lambda url: pages.get(url)
+        session = _session(engine, search_results=results)
+        first = session.next()
+        assert first["url"] == "https://www.tokyotower.co.jp/"
+        assert first["address_matched"] is True
+        session.apply_content_judgment("No", first["url"])
+        second = session.next()
+        assert second["url"] == "https://example.com/unmatched"
+        assert second["address_matched"] is False
+
+    def test_without_prefetch_downloads_lazily_in_rank_order(self):
+        engine = FakeEngine()
+        _session(engine, prefetch=False).next()
+        assert engine.downloads == ["https://portal.example.com/shop/1"]
+
+    def test_extraction_failure(self):
+        session = FinderSession("テスト", "INVALID", FakeEngine())
+        output = session.next()
+        assert output == {
+            "success": False,
+            "facility_name": "テスト",
+            "input_address": "INVALID",
+            "message": "住所の抽出に失敗しました",
+        }
+
+
+# ===========================================================================
+# 2. SessionStore
+# ===========================================================================
+
+class TestSessionStore:
+
+    def test_idle_sessions_are_evicted(self):
+        store = SessionStore(FakeEngine(), idle_timeout=10)
+        session_id = store.add(_session(store.engine))
+        assert len(store) == 1
+        assert store.evict_idle(now=0) == 0
+        assert store.evict_idle(now=time.monotonic() + 11) == 1
+        assert len(store) == 0
+        assert store.evicted == 1
+        assert not store.remove(session_id)
+
+    def test_max_sessions_evicts_least_recently_used(self):
+        store = SessionStore(FakeEngine(), max_sessions=2)
+        first = store.add(_session(store.engine))
+        second = store.add(_session(store.engine))
+        store.acquire(first)  # first becomes most recently used
+        store.add(_session(store.engine))
+        assert len(store) == 2
+        store.acquire(first)
+        with pytest.raises(Exception):
+            store.acquire(second)
+
+    def test_criteria_file_read_once(self, tmp_path):
+        criteria = tmp_path / "criteria.txt"
+        criteria.write_text("基準", encoding="utf-8")
+        store = SessionStore(FakeEngine())
+        assert store.criteria_text(str(criteria)) == "基準"
+        criteria.write_text("変更", encoding="utf-8")
+        assert store.criteria_text(str(criteria)) == "基準"
+
+
+# ===========================================================================
+# 3. JSON-RPC protocol
+# ===========================================================================
+
+def _call(store, method, request_id=1, **params):
+    return json.loads(handle_line(store, json.dumps(
+        {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params},
+        ensure_ascii=False,
+    )))
+
+
+class TestJsonRpc:
+
+    def test_round_trip_to_success(self, tmp_path):
+        store = SessionStore(FakeEngine(), criteria_file=str(tmp_path / "missing.txt"))
+        response = _call(store, "start", name="東京タワー", address="東京都港区芝公園4丁目2番8号")
+        result = response["result"]
+        assert result["done"] is False
+        assert result["output"]["action"] == "request_content_judgment"
+
+        response = _call(store, "content_judgment", session_id=result["session_id"], judgment="No")
+        result = response["result"]
+        assert result["output"]["url"] == "https://www.tokyotower.co.jp/"
+
+        response = _call(store, "content_judgment", session_id=result["session_id"], judgment="Yes")
+        result = response["result"]
+        assert result["done"] is True
+        assert result["output"]["official_site_url"] == "https://www.tokyotower.co.jp/"
+        assert result["output"]["matched_address"] == "東京都港区芝公園4-2-8"
+        assert len(store) == 0
+
+    def test_unknown_session(self):
+        response = _call(SessionStore(FakeEngine()), "content_judgment", session_id="nope", judgment="No")
+        assert response["error"]["code"] == -32001
+
+    def test_missing_params(self):
+        response = _call(SessionStore(FakeEngine()), "start", name="東京タワー")
+        assert response["error"]["code"] == -32602
+
+    def test_unknown_method(self):
+        response = _call(SessionStore(FakeEngine()), "restart")
+        assert response["error"]["code"] == -32601
+
+    def test_parse_error(self):
+        response = json.loads(handle_line(SessionStore(FakeEngine()), "{not json"))
+        assert response["error"]["code"] == -32700
+
+    def test_serve_stdio(self, tmp_path):
+        store = SessionStore(FakeEngine(), criteria_file=str(tmp_path / "missing.txt"))
+        requests = "\n".join(json.dumps(
+            {"jsonrpc": "2.0", "id": i, "method": "start",
+             "params": {"name": "東京タワー", "address": "東京都港区芝公園4丁目2番8号"}},
+            ensure_ascii=False,
+        ) for i in range(3)) + "\n"
+        stdout = io.StringIO()
+        serve_stdio(store, workers=3, stdin=io.StringIO(requests), stdout=stdout)
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert sorted(r["id"] for r in responses) == [0, 1, 2]
+        assert len({r["result"]["session_id"] for r in responses}) == 3
+        assert len(store) == 3
+
+
+# ===========================================================================
+# 4. Batch mode
+# ===========================================================================
+
+class TestBatch:
+
+    def test_read_tsv(self, tmp_path):
+        tsv = tmp_path / "facilities.tsv"
+        tsv.write_text(
+            "施設名\t都道府県\t住所\tHP_改行削除\n"
+            "東京タワー\t東京都\t港区芝公園4丁目2番8号\thttps://www.tokyotower.co.jp/\n",
+            encoding="utf-8",
+        )
+        assert list(read_facilities(str(tsv))) == [(1, "東京タワー", "東京都港区芝公園4丁目2番8号")]
+
+    def test_read_jsonl(self, tmp_path):
+        jsonl = tmp_path / "facilities.jsonl"
+        jsonl.write_text(
+            '{"name": "東京タワー", "address": "東京都港区芝公園4丁目2番8号"}\n\n'
+            '{"name": "国立国会図書館", "address": "東京都千代田区永田町1丁目10番1号"}\n',
+            encoding="utf-8",
+        )
+        rows = list(read_facilities(str(jsonl)))
+        assert [row for row, _, _ in rows] == [1, 2]
+        assert rows[1][1] == "国立国会図書館"
+
+    def test_run_batch_streams_one_record_per_facility(self):
+        facilities = [(i, "東京タワー", "東京都港区芝公園4丁目2番8号") for i in range(1, 21)]
+        facilities.append((21, "", "東京都港区"))
+        out = io.StringIO()
+        count = run_batch(iter(facilities), FakeEngine(), out, workers=4)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert count == 21
+        assert sorted(r["row"] for r in records) == list(range(1, 22))
+        by_row = {r["row"]: r for r in records}
+        assert by_row[1]["output"]["action"] == "request_content_judgment"
+        assert by_row[21]["output"]["success"] is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,220 @@
+"""On-disk cache of rendered pages.
+
+PageCache stores the rendered title and plain text of a page, its metadata
+(description, addresses, ... as a JSON object) and optionally the raw HTML
+in a SQLite file, keyed by a hash of the normalized URL, so a
+page is rendered by Chromium only once however many processes, judgment
+rounds or test runs ask for it.
+
+- Title, text, metadata and HTML are zlib-compressed.
+- Entries written before metadata was stored are misses for "json", so
+  every "json" result carries the same fields.
+- Entries older than ``ttl`` seconds are treated as missing.
+- When the stored size exceeds ``max_bytes``, the least recently used
+  entries are evicted.  The size is kept as a running total and only
+  summed from the table again after another process has written to it.
+- ``hits`` / ``misses`` count lookups made through this instance.
+
+Only successful downloads are cached.  The file can be shared by several
+processes (SQLite locking, WAL journal).
+
+Example:
+    cache = PageCache("cache/pages.sqlite3")
+    page = cache.get(url)                # {"title": ..., "text": ...} or None
+    if page is None:
+        cache.put(url, title, text)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_TTL = 7 * 24 * 3600          # 7 days
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB (compressed)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key         TEXT PRIMARY KEY,
+    url         TEXT NOT NULL,
+    fetched_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size        INTEGER NOT NULL,
+    title       BLOB,
+    text        BLOB,
+    html        BLOB,
+    meta        BLOB
+);
+CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+"""
+
+
+def normalize_url(url):
+    """Normalize *url* for cache lookups.
+
+    Lower-cases the scheme and host, drops default ports, the fragment and
+    an empty path ("https://Example.com" → "https://example.com/").
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    netloc = host if port is None or port == _DEFAULT_PORTS.get(scheme) else f"{host}:{port}"
+    if parts.username:
+        userinfo = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{userinfo}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def cache_key(url):
+    """Cache key of *url*: SHA-256 of the normalized URL."""
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+def _pack(value):
+    return None if value is None else zlib.compress(value.encode("utf-8"))
+
+
+def _unpack(blob):
+    return None if blob is None else zlib.decompress(blob).decode("utf-8")
+
+
+class PageCache:
+    """SQLite-backed page cache with TTL and size-bounded LRU eviction.
+
+    Args:
+        path: SQLite file (parent directories are created).
+        ttl: Seconds an entry stays valid (None = forever).
+        max_bytes: Upper bound on the compressed size of all entries.
+        store_html: Also store the raw HTML (needed for --format=html hits).
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES, store_html=False):
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.store_html = store_html
+        self.hits = 0
+        self.misses = 0
+        parent = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pages)")}
+        if "meta" not in columns:  # cache file from before metadata was stored
+            self._conn.execute("ALTER TABLE pages ADD COLUMN meta BLOB")
+            self._conn.commit()
+        # Running total of the stored size, so put() does not sum the table
+        self._total = None
+        self._data_version = None
+        self._stored_bytes()
+
+    def get(self, url, output_format="json"):
+        """Return the cached page in *output_format*, or None on a miss.
+
+        "json" → {"title": ..., "text": ..., **meta}, "text" → text,
+        "html" → raw HTML (a miss unless the entry was stored with HTML).
+        """
+        key = cache_key(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, title, text, html, meta, size FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[0] > self.ttl:
+                total = self._stored_bytes()
+                self._conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total = total - row[5]
+                row = None
+            if (row is None or (output_format == "html" and row[3] is None)
+                    or (output_format == "json" and row[4] is None)):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        _, title, text, html, meta, _ = row
+        if output_format == "html":
+            return _unpack(html)
+        if output_format == "json":
+            return {"title": _unpack(title), "text": _unpack(text), **json.loads(_unpack(meta))}
+        return _unpack(text)
+
+    def put(self, url, title, text, html=None, meta=None):
+        """Store a rendered page (HTML only when store_html is enabled).
+
+        *meta* holds the page's other "json" fields (e.g. description,
+        addresses); they are returned with title and text.
+        """
+        packed = (_pack(title or ""), _pack(text or ""), _pack(html) if self.store_html else None,
+                  _pack(json.dumps(meta or {}, ensure_ascii=False)))
+        size = sum(len(blob) for blob in packed if blob is not None)
+        now = time.time()
+        key = cache_key(url)
+        with self._lock:
+            total = self._stored_bytes()
+            replaced = self._conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (key, url, fetched_at, accessed_at, size, title, text, html, meta) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, normalize_url(url), now, now, size, *packed),
+            )
+            self._total = total + size - (replaced[0] if replaced else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _stored_bytes(self):
+        """Total size of all entries (caller holds the lock).
+
+        Summed from the table only when the cache is opened or another
+        connection has written to the file since (PRAGMA data_version);
+        otherwise the running total kept by get/put/clear is returned.
+        """
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._total is None or version != self._data_version:
+            self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            self._data_version = version
+        return self._total
+
+    def _evict(self):
+        """Delete least recently used entries until the total size fits max_bytes."""
+        if self.max_bytes is None or self._total <= self.max_bytes:
+            return
+        total = self._total
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM pages ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM pages WHERE key = ?", victims)
+        self._total = total
+
+    def clear(self):
+        """Delete all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.commit()
+            self._total = 0
+
+    def stats(self):
+        """Entry count, stored bytes and the hit/miss counters of this instance."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()
+        return {"entries": entries, "bytes": size, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
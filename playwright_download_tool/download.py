@@ -2,25 +2,239 @@
 
 import asyncio
 import json
+import re
 import sys
 import io
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
-from extract import extract_text
+from extract import clean_text, extract_page, extract_text, postal_addresses
 
 # Force UTF-8 encoding for stdout/stderr (Windows compatibility)
+# Guard prevents double-wrapping when imported in-process by officialsite_finder_tool.
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    if sys.stdout is sys.__stdout__ and hasattr(sys.stdout, 'buffer'):
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    if sys.stderr is sys.__stderr__ and hasattr(sys.stderr, 'buffer'):
+        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
 
-async def get_html_and_extract_text(url: str, output_format: str = "text"):
+# How render_page decides a page has loaded:
+#   domcontentloaded / load / networkidle - the Playwright load state
+#   address - as soon as the page text contains a Japanese address
+#             (at the latest when the network goes idle)
+WAIT_MODES = ("domcontentloaded", "load", "networkidle", "address")
+DEFAULT_WAIT = "networkidle"
+
+# Hard limit in seconds on loading one page; a page still loading at the
+# deadline is used as it is
+DEFAULT_DEADLINE = 20.0
+
+# How often the "address" mode looks at the page text, in seconds
+ADDRESS_POLL_INTERVAL = 0.25
+
+_PREFECTURES = (
+    "北海道|青森県|岩手県|宮城県|秋田県|山形県|福島県|茨城県|栃木県|群馬県|埼玉県|千葉県|東京都|"
+    "神奈川県|新潟県|富山県|石川県|福井県|山梨県|長野県|岐阜県|静岡県|愛知県|三重県|滋賀県|京都府|"
+    "大阪府|兵庫県|奈良県|和歌山県|鳥取県|島根県|岡山県|広島県|山口県|徳島県|香川県|愛媛県|高知県|"
+    "福岡県|佐賀県|長崎県|熊本県|大分県|宮崎県|鹿児島県|沖縄県"
+)
+# Prefecture followed by a municipality: enough to know the address is on the page
+ADDRESS_RE = re.compile(rf"(?:{_PREFECTURES})[^\s、。,]{{1,20}}?[市区町村]")
+
+_BODY_TEXT_JS = "() => document.body ? document.body.innerText : ''"
+
+
+async def _body_text(page):
+    try:
+        return await page.evaluate(_BODY_TEXT_JS) or ""
+    except PlaywrightError:
+        # The document was replaced while we looked (client-side redirect)
+        return ""
+
+
+# Runs inside Chromium: collects what the finder needs so that only this
+# compact payload, not the serialized DOM, crosses to Python.  JSON-LD is read
+# before script elements are removed from the (finished) page.
+_PAGE_PAYLOAD_JS = """() => {
+    const meta = (selector) => {
+        const el = document.querySelector(selector);
+        return el ? (el.getAttribute("content") || "").trim() : "";
+    };
+    const ldJson = Array.from(
+        document.querySelectorAll('script[type="application/ld+json" i]'), (el) => el.textContent);
+    document.querySelectorAll("script, style, noscript").forEach((el) => el.remove());
+    return {
+        title: document.title,
+        description: meta('meta[name="description" i]') || meta('meta[property="og:description" i]'),
+        text: document.body ? document.body.innerText : "",
+        addresses: Array.from(document.querySelectorAll("address"), (el) => el.innerText),
+        ldJson: ldJson,
+    };
+}"""
+
+
+async def extract_in_page(page):
+    """
+    Extract the page's text and address hints inside the browser.
+
+    The visible text is the body's innerText (script, style and noscript
+    removed), cleaned like extract.extract_text.  The page must not be used
+    for anything else afterwards.
+
+    Args:
+        page: Loaded Playwright Page
+
+    Returns:
+        {"title", "text", "description", "addresses", "postal_addresses"}:
+        addresses are the texts of <address> elements, postal_addresses the
+        JSON-LD PostalAddress objects (see extract.postal_addresses)
+    """
+    payload = await page.evaluate(_PAGE_PAYLOAD_JS)
+    addresses = (" ".join(address.split()) for address in payload["addresses"])
+    return {
+        "title": payload["title"],
+        "text": clean_text(payload["text"]),
+        "description": payload["description"],
+        "addresses": [address for address in addresses if address],
+        "postal_addresses": postal_addresses(payload["ldJson"]),
+    }
+
+
+async def _read_page(page, in_browser):
+    """The extract_in_page payload when *in_browser*, else the serialized HTML."""
+    if in_browser:
+        return await extract_in_page(page)
+    return await page.content()
+
+
+async def load_page(page, url: str, wait: str = DEFAULT_WAIT, deadline: float = DEFAULT_DEADLINE):
+    """
+    Navigate *page* to *url* and wait until it has loaded according to *wait*.
+
+    The whole load takes at most *deadline* seconds.  A page that has started
+    rendering but is still loading at the deadline (analytics beacons, chat
+    widgets, long polling) is used as it is; only a page that never
+    responded raises.
+
+    Args:
+        page: Playwright Page to load the URL in
+        url: URL to load
+        wait: One of WAIT_MODES
+        deadline: Maximum seconds to spend on this page
+
+    Returns:
+        What ended the wait: the load state reached, "address" or "deadline"
+
+    Raises:
+        ValueError: If *wait* is not one of WAIT_MODES
+        playwright TimeoutError: If nothing was received before the deadline
+    """
+    if wait not in WAIT_MODES:
+        raise ValueError(f"Unknown wait mode: {wait} (choose from {', '.join(WAIT_MODES)})")
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline
+
+    try:
+        await page.goto(url, wait_until="domcontentloaded" if wait == "address" else wait,
+                        timeout=deadline * 1000)
+    except PlaywrightTimeoutError:
+        if page.url in ("", "about:blank"):
+            raise
+        return "deadline"
+    if wait != "address":
+        return wait
+
+    while True:
+        if ADDRESS_RE.search(await _body_text(page)):
+            return "address"
+        remaining = end - loop.time()
+        if remaining <= 0:
+            return "deadline"
+        try:
+            await page.wait_for_load_state("networkidle", timeout=min(ADDRESS_POLL_INTERVAL, remaining) * 1000)
+        except PlaywrightTimeoutError:
+            continue
+        # Nothing more is loading: the address is not going to appear
+        return "networkidle"
+
+
+async def render_page(page, url: str, output_format: str = "text", cache=None,
+                      wait: str = DEFAULT_WAIT, deadline: float = DEFAULT_DEADLINE, blocker=None,
+                      in_browser: bool = False):
+    """
+    Load *url* in an open Playwright page and return it in *output_format*.
+
+    Args:
+        page: Playwright Page to load the URL in
+        url: URL to download
+        output_format: Output format - "text" for plain text, "html" for raw HTML,
+                       "json" for {"title": ..., "text": ...}
+        cache: Optional cache.PageCache to store the rendered page in
+        wait: When the page counts as loaded (see WAIT_MODES)
+        deadline: Maximum seconds to spend loading the page
+        blocker: Optional block.RequestBlocker; its requests are aborted and
+                 the page's request counters are reported to it
+        in_browser: Extract the text inside Chromium (extract_in_page) instead
+                    of copying the HTML to Python.  Ignored for "html".
+
+    Returns:
+        str for "text"/"html", dict for "json": title, text, description,
+        addresses and postal_addresses (see extract_in_page)
+    """
+    in_browser = in_browser and output_format != "html"
+    if blocker is not None:
+        stats = await blocker.attach(page, url)
+        try:
+            await load_page(page, url, wait, deadline)
+            content = await _read_page(page, in_browser)
+        finally:
+            blocker.finish(stats)
+    else:
+        await load_page(page, url, wait, deadline)
+        content = await _read_page(page, in_browser)
+
+    if in_browser:
+        page_data = content
+    elif cache is None and output_format == "html":
+        return content
+    elif cache is None and output_format == "text":
+        # Extract plain text from HTML (off the event loop: pooled pages share it)
+        return await asyncio.to_thread(extract_text, content)
+    else:
+        # The same fields extract_in_page returns, from the serialized HTML
+        text, meta = await asyncio.to_thread(extract_page, content)
+        page_data = {"title": await page.title(), "text": text, **meta}
+
+    if cache is not None:
+        meta = {key: value for key, value in page_data.items() if key not in ("title", "text")}
+        cache.put(url, page_data["title"], page_data["text"], html=None if in_browser else content, meta=meta)
+    if output_format == "html":
+        return content
+    elif output_format == "json":
+        return page_data
+    return page_data["text"]
+
+
+async def get_html_and_extract_text(url: str, output_format: str = "text", cache=None,
+                                    wait: str = DEFAULT_WAIT, deadline: float = DEFAULT_DEADLINE,
+                                    blocker=None, in_browser: bool = False):
     """
     Download HTML from URL using Playwright and extract plain text.
 
+    Launches a dedicated browser for this one URL.  Use pool.BrowserPool to
+    keep browsers warm across many URLs.
+
     Args:
         url: URL to download
         output_format: Output format - "text" for plain text, "html" for raw HTML,
                        "json" for {"title": ..., "text": ...}
+        cache: Optional cache.PageCache; a cached page is returned without
+               starting a browser, and a downloaded page is stored in it
+        wait: When the page counts as loaded (see WAIT_MODES)
+        deadline: Maximum seconds to spend loading the page
+        blocker: Optional block.RequestBlocker for images, fonts, trackers, …
+        in_browser: Extract the text inside Chromium (see render_page)
 
     Returns:
         str for "text"/"html", dict for "json"
@@ -28,24 +242,17 @@ async def get_html_and_extract_text(url: str, output_format: str = "text"):
     Raises:
         Exception: If page loading or text extraction fails
     """
+    if cache is not None:
+        cached = cache.get(url, output_format)
+        if cached is not None:
+            return cached
+
     async with async_playwright() as p:
         # ヘッドレスモードで起動
         browser = await p.chromium.launch(headless=True)
         page = await browser.new_page()
         try:
-            await page.goto(url, wait_until="networkidle")
-            content = await page.content()
-
-            if output_format == "html":
-                return content
-            elif output_format == "json":
-                title = await page.title()
-                text = extract_text(content)
-                return {"title": title, "text": text}
-            else:
-                # Extract plain text from HTML
-                text = extract_text(content)
-                return text
+            return await render_page(page, url, output_format, cache, wait, deadline, blocker, in_browser)
         except Exception as e:
             raise Exception(f"Error downloading or processing {url}: {e}")
         finally:
@@ -55,25 +262,151 @@ async def get_html_and_extract_text(url: str, output_format: str = "text"):
 async def main():
     """Main entry point for command-line usage."""
     # Parse command-line arguments
-    if len(sys.argv) < 2:
-        print("Usage: python download.py <URL> [--format=text|html|json]", file=sys.stderr)
+    urls = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not urls:
+        print("Usage: python download.py <URL> [<URL> ...] [--format=text|html|json] [--pool-size=N] [--cache=PATH] [--http-first] [--wait=MODE] [--deadline=SECONDS] [--block] [--block-types=T,...] [--block-domains=PATH] [--in-browser]", file=sys.stderr)
         print("Example: python download.py https://example.com", file=sys.stderr)
         print("Example: python download.py https://example.com --format=html", file=sys.stderr)
         print("Example: python download.py https://example.com --format=json", file=sys.stderr)
+        print("Example: python download.py https://a.example https://b.example --pool-size=2", file=sys.stderr)
+        print("Example: python download.py https://example.com --cache=cache/pages.sqlite3", file=sys.stderr)
+        print("Example: python download.py https://example.com --http-first", file=sys.stderr)
+        print("Example: python download.py https://example.com --wait=address --deadline=15", file=sys.stderr)
+        print("Example: python download.py https://example.com --block --block-types=image,font", file=sys.stderr)
+        print("Example: python download.py https://example.com --format=json --in-browser", file=sys.stderr)
         sys.exit(1)
 
-    url = sys.argv[1]
     output_format = "text"  # Default to text output
+    pool_size = 2
+    cache = None
+    http_first = False
+    wait = DEFAULT_WAIT
+    deadline = DEFAULT_DEADLINE
+    block = False
+    block_types = None
+    block_domains = None
+    in_browser = False
+
+    # Parse optional arguments
+    for arg in sys.argv[1:]:
+        if arg.startswith("--format="):
+            output_format = arg.split("=")[1]
+            if output_format not in ["text", "html", "json"]:
+                print(f"Error: Invalid format '{output_format}'. Use 'text', 'html', or 'json'.", file=sys.stderr)
+                sys.exit(1)
+        elif arg.startswith("--pool-size="):
+            try:
+                pool_size = int(arg.split("=")[1])
+            except ValueError:
+                pool_size = 0
+            if pool_size < 1:
+                print(f"Error: Invalid pool size '{arg.split('=')[1]}'.", file=sys.stderr)
+                sys.exit(1)
+        elif arg.startswith("--cache="):
+            from cache import PageCache
+            cache = PageCache(arg.split("=", 1)[1], store_html=True)
+        elif arg == "--http-first":
+            http_first = True
+        elif arg.startswith("--wait="):
+            wait = arg.split("=", 1)[1]
+            if wait not in WAIT_MODES:
+                print(f"Error: Invalid wait mode '{wait}'. Use {', '.join(WAIT_MODES)}.", file=sys.stderr)
+                sys.exit(1)
+        elif arg.startswith("--deadline="):
+            try:
+                deadline = float(arg.split("=", 1)[1])
+            except ValueError:
+                deadline = 0
+            if deadline <= 0:
+                print(f"Error: Invalid deadline '{arg.split('=', 1)[1]}'.", file=sys.stderr)
+                sys.exit(1)
+        elif arg == "--in-browser":
+            in_browser = True
+        elif arg == "--block":
+            block = True
+        elif arg.startswith("--block-types="):
+            block = True
+            block_types = [t for t in arg.split("=", 1)[1].split(",") if t]
+        elif arg.startswith("--block-domains="):
+            from block import read_domain_list
+            block = True
+            try:
+                block_domains = read_domain_list(arg.split("=", 1)[1])
+            except OSError as e:
+                print(f"Error: Cannot read domain list: {e}", file=sys.stderr)
+                sys.exit(1)
 
-    # Parse optional format argument
-    if len(sys.argv) > 2 and sys.argv[2].startswith("--format="):
-        output_format = sys.argv[2].split("=")[1]
-        if output_format not in ["text", "html", "json"]:
-            print(f"Error: Invalid format '{output_format}'. Use 'text', 'html', or 'json'.", file=sys.stderr)
+    blocker = None
+    if block:
+        # Per-page request counters are reported on stderr
+        from block import DEFAULT_BLOCKED_DOMAINS, DEFAULT_BLOCKED_TYPES, RequestBlocker
+        blocker = RequestBlocker(
+            DEFAULT_BLOCKED_TYPES if block_types is None else block_types,
+            DEFAULT_BLOCKED_DOMAINS | (block_domains or set()),
+            on_page=lambda url, stats: print(json.dumps({"url": url, "requests": stats}), file=sys.stderr),
+        )
+
+    if http_first:
+        # Plain HTTP first; Chromium is only launched for pages that need it.
+        # Tier decisions are reported on stderr.
+        from fetch import TieredFetcher
+        from pool import BrowserPool
+
+        pool = BrowserPool(size=min(pool_size, len(urls)), cache=cache, wait=wait, deadline=deadline,
+                           blocker=blocker, in_browser=in_browser)
+        fetcher = TieredFetcher(pool, cache=cache, deadline=deadline)
+        try:
+            results = await fetcher.fetch_many(urls, output_format)
+        finally:
+            await fetcher.close()
+        print(json.dumps({"tiers": fetcher.stats()}), file=sys.stderr)
+        failed = False
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                failed = True
+                if len(urls) > 1:
+                    print(json.dumps({"url": url, "error": str(result)}, ensure_ascii=False))
+                else:
+                    print(f"Error: {result}", file=sys.stderr)
+            elif len(urls) > 1:
+                print(json.dumps({"url": url, "result": result}, ensure_ascii=False))
+            elif isinstance(result, dict):
+                print(json.dumps(result, ensure_ascii=False))
+            else:
+                print(result)
+        if failed:
+            sys.exit(1)
+        return
+
+    if len(urls) > 1:
+        # Several URLs: download them concurrently with warm browsers and
+        # print one JSON line per URL, in input order.
+        from pool import BrowserPool
+
+        failed = False
+        # Browsers are launched on the first cache miss
+        pool = BrowserPool(size=pool_size, cache=cache, wait=wait, deadline=deadline, blocker=blocker,
+                           in_browser=in_browser)
+        try:
+            results = await pool.fetch_many(urls, output_format)
+            await pool.close()
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                failed = True
+                print(json.dumps({"url": url, "error": str(result)}, ensure_ascii=False))
+            else:
+                print(json.dumps({"url": url, "result": result}, ensure_ascii=False))
+        if failed:
             sys.exit(1)
+        return
 
+    url = urls[0]
     try:
-        result = await get_html_and_extract_text(url, output_format)
+        result = await get_html_and_extract_text(url, output_format, cache, wait, deadline, blocker,
+                                                 in_browser)
         if isinstance(result, dict):
             print(json.dumps(result, ensure_ascii=False))
         else:
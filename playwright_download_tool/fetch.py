@@ -0,0 +1,315 @@
+"""Two-tier page fetcher: plain HTTP first, Playwright only when needed.
+
+Most clinic, company and municipal pages carry their address in the HTML
+the server sends, so rendering them in Chromium (and waiting for the network
+to go idle) is wasted work.  TieredFetcher first downloads the page with a
+pooled HTTP client, decodes it (Shift_JIS / EUC-JP pages included) and
+extracts its text.  The page is handed to a BrowserPool only when that
+static HTML is not usable:
+
+- ``error``      the request failed (DNS, TLS, timeout, …)
+- ``status``     the server answered with a 4xx/5xx status
+- ``not_html``   the response is not an HTML document
+- ``js_shell``   the page is an empty single-page-app mount point
+- ``short_text`` the page has less than ``min_text_chars`` characters of text
+
+Every decision is counted (``stats()``), and an optional ``on_decision``
+callback receives ``(url, tier, reason)`` for each page, so the number of
+browser renders avoided can be measured.  The browser pool is only started
+on the first escalation.
+
+With ``deadline`` both tiers share one time budget per page: the HTTP tier
+may use at most half of it, and the browser gets what is left as its load
+deadline, so a slow static fetch followed by a render still finishes in time.
+
+Example:
+    async with TieredFetcher(BrowserPool(size=2)) as fetcher:
+        result = await fetcher.fetch("https://example.com", "json")
+        print(fetcher.stats())   # {"http": 1, "browser": 0, ...}
+"""
+
+import asyncio
+import codecs
+import html as html_lib
+import re
+from collections import Counter
+
+import httpx
+
+from extract import extract_page, page_metadata
+
+# Pages with less text than this are rendered in the browser
+DEFAULT_MIN_TEXT_CHARS = 200
+
+DEFAULT_TIMEOUT = 15.0
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ja,en;q=0.8",
+}
+
+# How far into the document to look for <meta charset>
+_SNIFF_BYTES = 4096
+
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+# Empty mount points of common single-page-app frameworks
+_SPA_ROOT_RE = re.compile(
+    r"""<(div|main|app-root)\b[^>]*\bid\s*=\s*["']?(root|app|__next|__nuxt|___gatsby)\b["']?[^>]*>\s*</\1\s*>""",
+    re.IGNORECASE,
+)
+
+# Labels servers and pages use for the Japanese legacy encodings.  cp932 and
+# euc_jis_2004 are supersets that also decode vendor/extended characters.
+_ENCODING_ALIASES = {
+    "shift_jis": "cp932",
+    "shift-jis": "cp932",
+    "sjis": "cp932",
+    "x-sjis": "cp932",
+    "ms_kanji": "cp932",
+    "windows-31j": "cp932",
+    "euc-jp": "euc_jis_2004",
+    "euc_jp": "euc_jis_2004",
+    "x-euc-jp": "euc_jis_2004",
+}
+
+# Tried in order when nothing declares the encoding.  EUC-JP goes before
+# cp932: EUC-JP only accepts high bytes in 0xA1-0xFE pairs (or after 0x8E /
+# 0x8F), so Shift_JIS text with hiragana or most kanji fails it, while many
+# EUC-JP pages decode as cp932 without errors (as half-width katakana).
+_GUESS_ENCODINGS = ("utf-8", "euc_jis_2004", "cp932")
+
+
+def _lookup_encoding(label):
+    """Python codec name for a charset *label*, or None if unknown."""
+    if not label:
+        return None
+    label = label.strip().strip("\"'").lower()
+    label = _ENCODING_ALIASES.get(label, label)
+    try:
+        return codecs.lookup(label).name
+    except LookupError:
+        return None
+
+
+def detect_encoding(content, content_type=None):
+    """Detect the character encoding of an HTML document.
+
+    Checks, in order, the charset of the Content-Type header, a byte order
+    mark, a ``<meta charset>`` / ``http-equiv`` declaration near the top of
+    the document, and finally which of UTF-8, EUC-JP and Shift_JIS (cp932)
+    decodes the bytes without errors.
+
+    Args:
+        content: Raw response body (bytes).
+        content_type: Value of the Content-Type header, if any.
+
+    Returns:
+        A Python codec name (e.g. "utf-8", "cp932", "euc_jis_2004").
+    """
+    if content_type:
+        match = re.search(r"charset\s*=\s*([^\s;]+)", content_type, re.IGNORECASE)
+        encoding = _lookup_encoding(match.group(1)) if match else None
+        if encoding:
+            return encoding
+
+    if content.startswith(codecs.BOM_UTF8):
+        return "utf-8"
+    if content.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+
+    match = _META_CHARSET_RE.search(content[:_SNIFF_BYTES])
+    encoding = _lookup_encoding(match.group(1).decode("ascii", "ignore")) if match else None
+    if encoding:
+        return encoding
+
+    for encoding in _GUESS_ENCODINGS:
+        try:
+            content.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    return "utf-8"
+
+
+def decode_html(content, content_type=None):
+    """Decode an HTML response body to str (see detect_encoding)."""
+    encoding = detect_encoding(content, content_type)
+    text = content.decode(encoding, errors="replace")
+    return text[1:] if text.startswith("\ufeff") else text
+
+
+def extract_title(html):
+    """The document <title>, unescaped and with whitespace collapsed."""
+    match = _TITLE_RE.search(html)
+    if not match:
+        return ""
+    return " ".join(html_lib.unescape(match.group(1)).split())
+
+
+def escalation_reason(html, text, min_text_chars=DEFAULT_MIN_TEXT_CHARS):
+    """Why static *html* (with extracted *text*) needs a browser, or None if usable."""
+    if len(text) < min_text_chars:
+        return "js_shell" if _SPA_ROOT_RE.search(html) else "short_text"
+    return None
+
+
+def _read_page(content, content_type):
+    """(html, title, text, meta) of a response body; run off the event loop."""
+    html = decode_html(content, content_type)
+    try:
+        text, meta = extract_page(html)
+    except ValueError:
+        text, meta = "", page_metadata("")
+    return html, extract_title(html), text, meta
+
+
+def format_page(html, title, text, output_format, meta=None):
+    """Shape a page like download.render_page: text, raw HTML or {"title", "text", **meta}."""
+    if output_format == "html":
+        return html
+    if output_format == "json":
+        return {"title": title, "text": text, **(meta or {})}
+    return text
+
+
+class TieredFetcher:
+    """Fetch pages over plain HTTP, escalating to a browser pool when needed.
+
+    Args:
+        pool: A pool.BrowserPool (or anything with async fetch(url, format)
+            and close(); fetch also takes deadline= when *deadline* is set)
+            used for escalated pages; None to never escalate.
+        client: Optional httpx.AsyncClient to reuse; by default one pooled
+            client is created and closed with the fetcher.
+        min_text_chars: Static pages with less text are escalated.
+        timeout: HTTP timeout in seconds.
+        cache: Optional cache.PageCache consulted before any request.
+        on_decision: Optional callback(url, tier, reason) called for every
+            page fetched (tier is "http" or "browser", reason None for http).
+        deadline: Optional time budget in seconds for one page across both
+            tiers (see module doc).
+    """
+
+    def __init__(self, pool=None, client=None, min_text_chars=DEFAULT_MIN_TEXT_CHARS,
+                 timeout=DEFAULT_TIMEOUT, cache=None, on_decision=None, deadline=None):
+        self.pool = pool
+        self.min_text_chars = min_text_chars
+        self.deadline = deadline
+        # Total time allowed for the HTTP tier (httpx's timeout is per operation)
+        self.http_timeout = timeout if deadline is None else min(timeout, deadline / 2)
+        self.cache = cache
+        self.on_decision = on_decision
+        self._own_client = client is None
+        self._client = client or httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+        self.tiers = Counter()
+        self.escalations = Counter()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the HTTP client (if owned) and the browser pool."""
+        if self._own_client:
+            await self._client.aclose()
+        if self.pool is not None:
+            await self.pool.close()
+
+    async def fetch_static(self, url):
+        """Download *url* over HTTP.
+
+        Returns:
+            (page, reason): page is (html, title, text, meta) when the static
+            HTML is usable, otherwise None and reason says why (see module
+            doc).  Decoding and parsing run in a worker thread, so a large
+            page does not hold up the other downloads on the event loop.
+        """
+        try:
+            response = await asyncio.wait_for(self._client.get(url), self.http_timeout)
+        except (httpx.HTTPError, asyncio.TimeoutError):
+            return None, "error"
+        if response.status_code >= 400:
+            return None, "status"
+        content_type = response.headers.get("content-type", "")
+        if content_type and "html" not in content_type.lower():
+            return None, "not_html"
+
+        page = await asyncio.to_thread(_read_page, response.content, content_type)
+        html, _, text, _ = page
+        reason = escalation_reason(html, text, self.min_text_chars)
+        if reason is not None:
+            return None, reason
+        return page, None
+
+    async def fetch(self, url, output_format="json"):
+        """Download *url* like download.get_html_and_extract_text, trying HTTP first."""
+        if self.cache is not None:
+            cached = self.cache.get(url, output_format)
+            if cached is not None:
+                return cached
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        page, reason = await self.fetch_static(url)
+        if page is not None:
+            self._record(url, "http", None)
+            # meta has the same fields as a page rendered with in-browser extraction
+            html, title, text, meta = page
+            if self.cache is not None:
+                self.cache.put(url, title, text, html=html, meta=meta)
+            return format_page(html, title, text, output_format, meta)
+
+        if self.pool is None:
+            raise Exception(f"Error downloading or processing {url}: static fetch failed ({reason})")
+        self._record(url, "browser", reason)
+        if self.deadline is None:
+            return await self.pool.fetch(url, output_format)
+        remaining = self.deadline - (loop.time() - start)
+        return await self.pool.fetch(url, output_format, deadline=remaining)
+
+    async def fetch_many(self, urls, output_format="json", concurrency=None):
+        """Download many URLs concurrently (failures are returned as exceptions)."""
+        limit = asyncio.Semaphore(concurrency or 8)
+
+        async def _one(url):
+            async with limit:
+                try:
+                    return await self.fetch(url, output_format)
+                except Exception as e:
+                    return e
+
+        return await asyncio.gather(*(_one(url) for url in urls))
+
+    def _record(self, url, tier, reason):
+        self.tiers[tier] += 1
+        if reason is not None:
+            self.escalations[reason] += 1
+        if self.on_decision is not None:
+            self.on_decision(url, tier, reason)
+
+    def stats(self):
+        """Tier counters: pages served per tier, escalation reasons, browser launches
+        (and the pool's blocked-request totals when it has a blocker)."""
+        stats = {
+            "http": self.tiers["http"],
+            "browser": self.tiers["browser"],
+            "escalations": dict(self.escalations),
+            "browser_launches": getattr(self.pool, "launches", 0),
+        }
+        blocker = getattr(self.pool, "blocker", None)
+        if blocker is not None:
+            stats["requests"] = blocker.totals()
+        return stats
@@ -0,0 +1,291 @@
+"""Pooled Playwright downloader.
+
+BrowserPool keeps a fixed number of headless Chromium instances running and
+hands out a fresh, isolated browser context for every request, so the cost
+of launching Chromium is paid once per browser instead of once per URL.
+
+A browser is recycled (closed and relaunched) after it has served
+``max_pages_per_browser`` pages, or when its processes use more than
+``max_browser_memory_mb`` megabytes of resident memory.  The memory limit
+needs the optional ``psutil`` package; without it only the page limit
+applies.  If the replacement browser cannot be launched, its slot is
+dropped from the pool; once no browser is left, fetches raise.
+
+Example:
+    async with BrowserPool(size=2) as pool:
+        result = await pool.fetch("https://example.com", "json")
+        results = await pool.fetch_many(urls, "json", concurrency=8)
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+from download import DEFAULT_DEADLINE, DEFAULT_WAIT, WAIT_MODES, render_page
+
+try:
+    import psutil
+except ImportError:  # optional: enables memory-based recycling
+    psutil = None
+
+
+class _BrowserSlot:
+    """One pooled browser and its usage counters."""
+
+    def __init__(self, index):
+        self.index = index
+        self.browser = None
+        self.pages_served = 0
+        self.active = 0
+        self.retiring = False
+
+
+class BrowserPool:
+    """A pool of warm headless Chromium browsers.
+
+    Args:
+        size: Number of browser instances to keep running.
+        max_pages_per_browser: Recycle a browser after this many pages
+            (None = never).
+        max_browser_memory_mb: Recycle a browser when the resident memory of
+            its processes exceeds this many MB (None = never; needs psutil).
+        contexts_per_browser: Maximum pages open at once in one browser.
+        launch_options: Extra keyword arguments for chromium.launch().
+        cache: Optional cache.PageCache consulted before a page is opened.
+        wait: When a page counts as loaded (see download.WAIT_MODES).
+        deadline: Maximum seconds to spend loading one page.
+        blocker: Optional block.RequestBlocker applied to every page.
+        in_browser: Extract text inside Chromium instead of copying the HTML
+            to Python (see download.render_page).
+        timeout: Maximum seconds for one page once it has a browser (None =
+            no limit).  Time spent waiting for a free browser is not counted.
+    """
+
+    def __init__(self, size=2, max_pages_per_browser=100, max_browser_memory_mb=None,
+                 contexts_per_browser=4, launch_options=None, cache=None,
+                 wait=DEFAULT_WAIT, deadline=DEFAULT_DEADLINE, blocker=None, in_browser=False,
+                 timeout=None):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        if wait not in WAIT_MODES:
+            raise ValueError(f"wait must be one of {', '.join(WAIT_MODES)}")
+        self.size = size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_browser_memory_mb = max_browser_memory_mb
+        self.contexts_per_browser = contexts_per_browser
+        self.launch_options = {"headless": True, **(launch_options or {})}
+        self.cache = cache
+        self.wait = wait
+        self.deadline = deadline
+        self.blocker = blocker
+        self.in_browser = in_browser
+        self.timeout = timeout
+        self._playwright_cm = None
+        self._playwright = None
+        self._slots = []
+        self._condition = None
+        self._start_lock = asyncio.Lock()
+        self._started = False
+        self.launches = 0
+        self.recycles = 0
+        self.launch_failures = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Start Playwright and launch all browsers."""
+        async with self._start_lock:
+            if self._started:
+                return
+            self._condition = asyncio.Condition()
+            self._playwright_cm = async_playwright()
+            self._playwright = await self._playwright_cm.__aenter__()
+            self._slots = [_BrowserSlot(i) for i in range(self.size)]
+            try:
+                await asyncio.gather(*(self._launch(slot) for slot in self._slots))
+            except Exception:
+                self._started = True
+                await self.close()
+                raise
+            self._started = True
+
+    async def close(self):
+        """Close all browsers and stop Playwright."""
+        if not self._started:
+            return
+        self._started = False
+        for slot in self._slots:
+            if slot.browser is not None:
+                try:
+                    await slot.browser.close()
+                except Exception:
+                    pass
+                slot.browser = None
+        await self._playwright_cm.__aexit__(None, None, None)
+        self._playwright = None
+
+    async def _launch(self, slot):
+        slot.browser = await self._playwright.chromium.launch(**self.launch_options)
+        slot.pages_served = 0
+        slot.retiring = False
+        self.launches += 1
+
+    async def _recycle(self, slot):
+        """Replace *slot*'s browser; drop the slot if no new browser can be launched."""
+        old = slot.browser
+        try:
+            await self._launch(slot)
+            self.recycles += 1
+        except Exception:
+            # Called from page()'s cleanup: never hide the caller's own result
+            self.launch_failures += 1
+            slot.browser = None
+            async with self._condition:
+                self._slots.remove(slot)
+        try:
+            await old.close()
+        except Exception:
+            pass
+
+    async def browser_memory_mb(self, slot):
+        """Resident memory of all processes of *slot*'s browser, in MB (None if unknown)."""
+        if psutil is None or slot.browser is None:
+            return None
+        try:
+            session = await slot.browser.new_browser_cdp_session()
+            try:
+                info = await session.send("SystemInfo.getProcessInfo")
+            finally:
+                await session.detach()
+        except Exception:
+            return None
+        total = 0
+        for process in info.get("processInfo", []):
+            try:
+                total += psutil.Process(process["id"]).memory_info().rss
+            except (psutil.Error, KeyError):
+                continue
+        return total / (1024 * 1024)
+
+    def _pick_slot(self):
+        candidates = [s for s in self._slots
+                      if not s.retiring and s.active < self.contexts_per_browser]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda s: s.active)
+
+    async def _acquire(self):
+        async with self._condition:
+            while True:
+                if not self._slots:
+                    raise RuntimeError("No browser left in the pool (relaunching failed)")
+                slot = self._pick_slot()
+                if slot is not None:
+                    slot.active += 1
+                    return slot
+                await self._condition.wait()
+
+    async def _release(self, slot):
+        slot.pages_served += 1
+        if self.max_pages_per_browser and slot.pages_served >= self.max_pages_per_browser:
+            slot.retiring = True
+        elif self.max_browser_memory_mb and not slot.retiring:
+            memory = await self.browser_memory_mb(slot)
+            if memory is not None and memory > self.max_browser_memory_mb:
+                slot.retiring = True
+
+        async with self._condition:
+            slot.active -= 1
+            recycle = slot.retiring and slot.active == 0
+        if recycle:
+            await self._recycle(slot)
+        async with self._condition:
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def page(self):
+        """Yield a new page in an isolated browser context of a pooled browser."""
+        if not self._started:
+            await self.start()
+        slot = await self._acquire()
+        context = None
+        try:
+            context = await slot.browser.new_context()
+            page = await context.new_page()
+            yield page
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            await self._release(slot)
+
+    async def fetch(self, url, output_format="json", deadline=None):
+        """Download *url* like download.get_html_and_extract_text, using a pooled browser.
+
+        *deadline* shortens the pool's load deadline for this page (e.g. to
+        what is left of a caller's time budget).
+        """
+        if self.cache is not None:
+            cached = self.cache.get(url, output_format)
+            if cached is not None:
+                return cached
+        async with self.page() as page:
+            page_deadline = self.deadline if deadline is None else min(deadline, self.deadline)
+            render = render_page(page, url, output_format, self.cache, self.wait, page_deadline,
+                                 self.blocker, self.in_browser)
+            try:
+                if self.timeout:
+                    return await asyncio.wait_for(render, self.timeout)
+                return await render
+            except asyncio.TimeoutError:
+                raise Exception(f"Error downloading or processing {url}: timed out after {self.timeout}s")
+            except Exception as e:
+                raise Exception(f"Error downloading or processing {url}: {e}")
+
+    async def fetch_many(self, urls, output_format="json", concurrency=None, timeout=None):
+        """Download many URLs concurrently.
+
+        Args:
+            urls: URLs to download.
+            output_format: Output format passed to fetch().
+            concurrency: Maximum downloads in flight (default: all pool capacity).
+            timeout: Per-URL timeout in seconds (None = no extra timeout).
+
+        Returns:
+            List of results in the order of *urls*; a failed download is
+            returned as the exception instance instead of a result.
+        """
+        limit = asyncio.Semaphore(concurrency or self.size * self.contexts_per_browser)
+
+        async def _one(url):
+            async with limit:
+                try:
+                    if timeout:
+                        return await asyncio.wait_for(self.fetch(url, output_format), timeout)
+                    return await self.fetch(url, output_format)
+                except Exception as e:
+                    return e
+
+        return await asyncio.gather(*(_one(url) for url in urls))
+
+    def stats(self):
+        """Pool counters: launches, recycles, pages served per browser and blocked requests."""
+        stats = {
+            "launches": self.launches,
+            "recycles": self.recycles,
+            "launch_failures": self.launch_failures,
+            "browsers": [
+                {"pages_served": s.pages_served, "active": s.active} for s in self._slots
+            ],
+        }
+        if self.blocker is not None:
+            stats["requests"] = self.blocker.totals()
+        return stats
@@ -0,0 +1,152 @@
+"""Tests for request blocking (no Chromium needed)."""
+
+import asyncio
+
+import pytest
+from block import DEFAULT_BLOCKED_DOMAINS, RequestBlocker, read_domain_list
+from download import render_page
+
+
+class _Frame:
+    def __init__(self, parent_frame=None):
+        self.parent_frame = parent_frame
+
+
+MAIN_FRAME = _Frame()
+
+
+class _Request:
+    def __init__(self, url, resource_type, frame=MAIN_FRAME, size=0):
+        self.url = url
+        self.resource_type = resource_type
+        self.frame = frame
+        self.size = size
+
+    async def sizes(self):
+        return {"requestBodySize": 0, "requestHeadersSize": 100,
+                "responseBodySize": self.size, "responseHeadersSize": 0}
+
+
+class _Route:
+    def __init__(self, request):
+        self.request = request
+        self.outcome = None
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+    async def abort(self, error_code="failed"):
+        self.outcome = error_code
+
+
+class _FakePage:
+    """Replays *requests* through the registered route handler on goto()."""
+
+    def __init__(self, requests):
+        self.requests = requests
+        self.routes = []
+        self.url = "about:blank"
+        self.handler = None
+        self.listeners = {}
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+    def on(self, event, callback):
+        self.listeners[event] = callback
+
+    async def goto(self, url, wait_until="load", timeout=30000):
+        self.url = url
+        for request in self.requests:
+            route = _Route(request)
+            await self.handler(route)
+            self.routes.append(route)
+            if route.outcome == "continued":
+                await self.listeners["requestfinished"](request)
+
+    async def content(self):
+        return "<html><head><title>t</title></head><body><p>東京都港区芝公園4-2-8</p></body></html>"
+
+    async def title(self):
+        return "t"
+
+
+PAGE_REQUESTS = [
+    _Request("https://example.com/", "document", size=20_000),
+    _Request("https://example.com/style.css", "stylesheet"),
+    _Request("https://example.com/logo.png", "image"),
+    _Request("https://example.com/app.js", "script", size=5_000),
+    _Request("https://www.googletagmanager.com/gtm.js?id=GTM-X", "script"),
+    _Request("https://stats.g.doubleclick.net/collect", "xhr"),
+    _Request("https://tpc.googlesyndication.com/safeframe/1.html", "document", frame=_Frame(MAIN_FRAME)),
+]
+
+
+class TestBlockReason:
+    """Test suite for RequestBlocker.block_reason."""
+
+    def test_resource_types(self):
+        blocker = RequestBlocker()
+        assert blocker.block_reason("https://example.com/a.woff2", "font") == ("type", "font")
+        assert blocker.block_reason("https://example.com/a.js", "script") is None
+
+    def test_domains_and_subdomains(self):
+        blocker = RequestBlocker()
+        assert blocker.block_reason("https://www.google-analytics.com/g/collect", "xhr") == \
+            ("domain", "google-analytics.com")
+        assert blocker.block_reason("https://googletagmanager.com/gtm.js", "script") == \
+            ("domain", "googletagmanager.com")
+        assert blocker.block_reason("https://notgoogletagmanager.com/x.js", "script") is None
+
+    def test_main_document_is_never_blocked(self):
+        blocker = RequestBlocker(domains={"example.com"})
+        assert blocker.block_reason("https://example.com/", "document", main_document=True) is None
+        assert blocker.block_reason("https://example.com/", "document") == ("domain", "example.com")
+
+    def test_custom_lists(self, tmp_path):
+        path = tmp_path / "domains.txt"
+        path.write_text("# trackers\n.Tracker.example  # comment\n\nads.example.org\n", encoding="utf-8")
+        domains = read_domain_list(path)
+        assert domains == {"tracker.example", "ads.example.org"}
+        blocker = RequestBlocker(resource_types=["media"], domains=DEFAULT_BLOCKED_DOMAINS | domains)
+        assert blocker.block_reason("https://cdn.tracker.example/t.js", "script") == ("domain", "tracker.example")
+        assert blocker.block_reason("https://example.com/logo.png", "image") is None
+
+
+class TestPageBlocking:
+    """Test suite for RequestBlocker attached to a page."""
+
+    def test_render_page_counts_blocked_requests(self):
+        pages = []
+        blocker = RequestBlocker(on_page=lambda url, stats: pages.append((url, stats)))
+        page = _FakePage(PAGE_REQUESTS)
+        result = asyncio.run(render_page(page, "https://example.com/", "json", wait="load", blocker=blocker))
+
+        assert result["title"] == "t"
+        assert [r.outcome for r in page.routes] == [
+            "continued", "blockedbyclient", "blockedbyclient", "continued",
+            "blockedbyclient", "blockedbyclient", "blockedbyclient",
+        ]
+        url, stats = pages[0]
+        assert url == "https://example.com/"
+        assert stats == {
+            "blocked": 5,
+            "blocked_by_type": {"stylesheet": 1, "image": 1, "script": 1, "xhr": 1, "document": 1},
+            "blocked_by_domain": {"googletagmanager.com": 1, "doubleclick.net": 1, "googlesyndication.com": 1},
+            "allowed": 2,
+            "bytes_loaded": 25_000,
+        }
+
+    def test_totals_over_pages(self):
+        blocker = RequestBlocker()
+        for _ in range(2):
+            asyncio.run(render_page(_FakePage(PAGE_REQUESTS), "https://example.com/", "text",
+                                    wait="load", blocker=blocker))
+        totals = blocker.totals()
+        assert totals["pages"] == 2
+        assert totals["blocked"] == 10
+        assert totals["bytes_loaded"] == 50_000
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
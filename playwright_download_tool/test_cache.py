@@ -0,0 +1,157 @@
+"""Tests for the on-disk page cache."""
+
+import asyncio
+import time
+import zlib
+
+import pytest
+from cache import PageCache, cache_key, normalize_url
+from download import get_html_and_extract_text
+
+
+@pytest.fixture
+def cache(tmp_path):
+    page_cache = PageCache(tmp_path / "pages.sqlite3")
+    yield page_cache
+    page_cache.close()
+
+
+class TestNormalizeUrl:
+    """Test suite for normalize_url and cache_key."""
+
+    def test_host_and_scheme_are_lowercased(self):
+        """Test that scheme and host case do not matter."""
+        assert normalize_url("HTTPS://Example.COM/Path") == "https://example.com/Path"
+
+    def test_default_port_fragment_and_empty_path(self):
+        """Test that default ports, fragments and empty paths are normalized."""
+        assert normalize_url("https://example.com:443#top") == "https://example.com/"
+        assert normalize_url("http://example.com:8080/a?b=1") == "http://example.com:8080/a?b=1"
+
+    def test_equivalent_urls_share_a_key(self):
+        """Test that equivalent URLs map to the same key."""
+        assert cache_key("https://Example.com") == cache_key("https://example.com/#x")
+        assert cache_key("https://example.com/a") != cache_key("https://example.com/b")
+
+
+class TestPageCache:
+    """Test suite for PageCache."""
+
+    def test_miss_then_hit(self, cache):
+        """Test that a stored page is returned in every format."""
+        assert cache.get("https://example.com/") is None
+        cache.put("https://example.com/", "Example", "本文")
+        assert cache.get("https://EXAMPLE.com") == {"title": "Example", "text": "本文"}
+        assert cache.get("https://example.com/", "text") == "本文"
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_html_only_when_stored(self, tmp_path, cache):
+        """Test that raw HTML is a miss unless store_html is enabled."""
+        cache.put("https://example.com/", "t", "x", html="<p>x</p>")
+        assert cache.get("https://example.com/", "html") is None
+
+        html_cache = PageCache(tmp_path / "html.sqlite3", store_html=True)
+        html_cache.put("https://example.com/", "t", "x", html="<p>x</p>")
+        assert html_cache.get("https://example.com/", "html") == "<p>x</p>"
+        html_cache.close()
+
+    def test_meta_fields_are_returned_with_json(self, cache):
+        """Test that the page's other json fields are stored and returned."""
+        meta = {"description": "説明", "addresses": ["東京都港区芝公園4-2-8"], "postal_addresses": []}
+        cache.put("https://example.com/", "t", "x", meta=meta)
+        assert cache.get("https://example.com/") == {"title": "t", "text": "x", **meta}
+        assert cache.get("https://example.com/", "text") == "x"
+
+    def test_entries_without_meta_are_json_misses(self, tmp_path):
+        """Test that a cache file from before meta was stored is upgraded and its json entries re-fetched."""
+        import sqlite3
+
+        path = tmp_path / "old.sqlite3"
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE pages (key TEXT PRIMARY KEY, url TEXT NOT NULL, fetched_at REAL NOT NULL, "
+                     "accessed_at REAL NOT NULL, size INTEGER NOT NULL, title BLOB, text BLOB, html BLOB)")
+        conn.execute("INSERT INTO pages VALUES (?, ?, ?, ?, 0, NULL, ?, NULL)",
+                     (cache_key("https://example.com/"), "https://example.com/", time.time(), time.time(),
+                      zlib.compress("本文".encode())))
+        conn.commit()
+        conn.close()
+
+        old = PageCache(path)
+        assert old.get("https://example.com/", "text") == "本文"
+        assert old.get("https://example.com/") is None
+        old.close()
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        """Test that entries older than ttl are not returned."""
+        cache = PageCache(tmp_path / "ttl.sqlite3", ttl=0.05)
+        cache.put("https://example.com/", "t", "x")
+        time.sleep(0.1)
+        assert cache.get("https://example.com/") is None
+        assert cache.stats()["entries"] == 0
+        cache.close()
+
+    def test_lru_eviction_under_byte_budget(self, tmp_path):
+        """Test that the least recently used entries are evicted first."""
+        cache = PageCache(tmp_path / "lru.sqlite3", max_bytes=200)
+        cache.put("https://example.com/1", "t", "一")
+        cache.put("https://example.com/2", "t", "二")
+        one_size = cache.stats()["bytes"] // 2
+        cache.max_bytes = one_size * 2
+        time.sleep(0.01)
+        cache.get("https://example.com/1")  # 1 is now more recently used than 2
+        cache.put("https://example.com/3", "t", "三")
+        assert cache.get("https://example.com/2") is None
+        assert cache.get("https://example.com/1") is not None
+        assert cache.get("https://example.com/3") is not None
+        assert cache.stats()["bytes"] <= cache.max_bytes
+        cache.close()
+
+    def test_put_keeps_a_running_total(self, tmp_path):
+        """Test that put does not sum the table, and the total follows every change."""
+        cache = PageCache(tmp_path / "total.sqlite3", ttl=0.05)
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        cache.put("https://example.com/1", "t", "一" * 100)
+        cache.put("https://example.com/2", "t", "二")
+        cache.put("https://example.com/1", "t", "一")  # replaced
+        assert not any("SUM(size)" in sql for sql in statements)
+        assert cache._total == cache.stats()["bytes"]
+        time.sleep(0.1)
+        assert cache.get("https://example.com/1") is None  # expired and deleted
+        assert cache._total == cache.stats()["bytes"]
+        cache.close()
+
+    def test_running_total_sees_other_instances(self, tmp_path):
+        """Test that writes through another connection are counted before evicting."""
+        first = PageCache(tmp_path / "shared.sqlite3")
+        second = PageCache(tmp_path / "shared.sqlite3")
+        first.put("https://example.com/1", "t", "一")
+        one_size = first.stats()["bytes"]
+        second.put("https://example.com/2", "t", "二")
+        first.max_bytes = one_size * 2
+        time.sleep(0.01)
+        first.put("https://example.com/3", "t", "三")
+        assert first.get("https://example.com/1") is None
+        assert first.stats()["bytes"] == first._total <= first.max_bytes
+        first.close()
+        second.close()
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test that a second process-like instance sees stored pages."""
+        first = PageCache(tmp_path / "shared.sqlite3")
+        first.put("https://example.com/", "t", "x")
+        second = PageCache(tmp_path / "shared.sqlite3")
+        assert second.get("https://example.com/") == {"title": "t", "text": "x"}
+        first.close()
+        second.close()
+
+    def test_downloader_returns_cached_page_without_browser(self, cache):
+        """Test that get_html_and_extract_text serves a hit without Playwright."""
+        cache.put("https://example.com/", "Example", "Example Domain")
+        result = asyncio.run(get_html_and_extract_text("https://example.com/", "json", cache))
+        assert result == {"title": "Example", "text": "Example Domain"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,200 @@
+"""Tests for render_page wait modes and the per-page deadline (no Chromium needed)."""
+
+import asyncio
+import time
+
+import pytest
+from download import ADDRESS_RE, extract_in_page, load_page, render_page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+ADDRESS_HTML = "<html><head><title>会社概要</title></head><body><p>所在地 東京都港区芝公園4丁目2番8号</p></body></html>"
+
+
+class _FakePage:
+    """A Playwright Page whose load states arrive after the given delays (seconds).
+
+    The body text contains an address from *address_after* seconds on; a
+    state that never arrives is None.
+    """
+
+    def __init__(self, domcontentloaded=0.0, load=0.05, networkidle=None, address_after=0.0,
+                 commits=True):
+        self.delays = {"domcontentloaded": domcontentloaded, "load": load, "networkidle": networkidle}
+        self.address_after = address_after
+        self.commits = commits
+        self.url = "about:blank"
+        self.started = None
+
+    def _elapsed(self):
+        return time.monotonic() - self.started
+
+    async def _wait_state(self, state, timeout_ms):
+        delay = self.delays[state]
+        remaining = None if delay is None else delay - self._elapsed()
+        if remaining is None or remaining > timeout_ms / 1000:
+            await asyncio.sleep(timeout_ms / 1000)
+            raise PlaywrightTimeoutError(f"Timeout {timeout_ms}ms exceeded.")
+        await asyncio.sleep(max(0.0, remaining))
+
+    async def goto(self, url, wait_until="load", timeout=30000):
+        self.started = time.monotonic()
+        if self.commits:
+            self.url = url
+        await self._wait_state(wait_until, timeout)
+
+    async def wait_for_load_state(self, state="load", timeout=30000):
+        await self._wait_state(state, timeout)
+
+    async def evaluate(self, expression):
+        if self.address_after is not None and self._elapsed() >= self.address_after:
+            return "所在地 東京都港区芝公園4丁目2番8号"
+        return "読み込み中"
+
+    async def content(self):
+        return ADDRESS_HTML
+
+    async def title(self):
+        return "会社概要"
+
+
+def _load(page, wait, deadline=2.0):
+    start = time.monotonic()
+    ended_by = asyncio.run(load_page(page, "https://example.com/", wait, deadline))
+    return ended_by, time.monotonic() - start
+
+
+class TestLoadPage:
+    """Test suite for load_page."""
+
+    @pytest.mark.parametrize("wait", ["domcontentloaded", "load", "networkidle"])
+    def test_load_states(self, wait):
+        ended_by, _ = _load(_FakePage(networkidle=0.1), wait)
+        assert ended_by == wait
+
+    def test_never_idle_page_is_used_at_the_deadline(self):
+        ended_by, elapsed = _load(_FakePage(networkidle=None), "networkidle", deadline=0.3)
+        assert ended_by == "deadline"
+        assert elapsed < 1.0
+
+    def test_address_mode_returns_before_network_idle(self):
+        ended_by, elapsed = _load(_FakePage(networkidle=None, address_after=0.3), "address")
+        assert ended_by == "address"
+        assert 0.25 <= elapsed < 1.0
+
+    def test_address_mode_stops_when_network_goes_idle(self):
+        ended_by, elapsed = _load(_FakePage(networkidle=0.3, address_after=None), "address")
+        assert ended_by == "networkidle"
+        assert elapsed < 1.0
+
+    def test_address_mode_deadline(self):
+        ended_by, elapsed = _load(_FakePage(networkidle=None, address_after=None), "address", deadline=0.5)
+        assert ended_by == "deadline"
+        assert elapsed < 1.2
+
+    def test_no_response_raises(self):
+        page = _FakePage(domcontentloaded=None, load=None, commits=False)
+        with pytest.raises(PlaywrightTimeoutError):
+            _load(page, "load", deadline=0.2)
+
+    def test_unknown_wait_mode(self):
+        with pytest.raises(ValueError):
+            _load(_FakePage(), "idle")
+
+    def test_render_page_after_deadline(self):
+        page = _FakePage(networkidle=None)
+        result = asyncio.run(render_page(page, "https://example.com/", "json", deadline=0.2))
+        assert result["title"] == "会社概要"
+        assert "東京都港区芝公園" in result["text"]
+
+
+LD_JSON = """{"@context": "https://schema.org", "@graph": [
+  {"@type": "Organization", "name": "東京タワー",
+   "address": {"@type": "PostalAddress", "postalCode": "105-0011", "addressRegion": "東京都",
+               "addressLocality": "港区", "streetAddress": "芝公園4-2-8", "addressCountry": "JP"}}]}"""
+
+
+class _PayloadPage(_FakePage):
+    """A loaded page that answers the in-browser extraction script."""
+
+    def __init__(self):
+        super().__init__(networkidle=0.0)
+        self.content_calls = 0
+        self.html = ADDRESS_HTML
+
+    async def evaluate(self, expression):
+        return {
+            "title": "会社概要",
+            "description": "東京タワーの会社概要です。",
+            "text": "会社概要\n\n  所在地  東京都港区芝公園4丁目2番8号 \n",
+            "addresses": ["〒105-0011\n東京都港区芝公園4-2-8", "  "],
+            "ldJson": [LD_JSON, "{ not json"],
+        }
+
+    async def content(self):
+        self.content_calls += 1
+        return self.html
+
+
+class TestInBrowserExtraction:
+    """Test suite for extract_in_page and render_page(in_browser=True)."""
+
+    def test_payload(self):
+        payload = asyncio.run(extract_in_page(_PayloadPage()))
+        assert payload == {
+            "title": "会社概要",
+            "text": "会社概要\n所在地\n東京都港区芝公園4丁目2番8号",
+            "description": "東京タワーの会社概要です。",
+            "addresses": ["〒105-0011 東京都港区芝公園4-2-8"],
+            "postal_addresses": [{"postalCode": "105-0011", "addressRegion": "東京都", "addressLocality": "港区",
+                                  "streetAddress": "芝公園4-2-8", "addressCountry": "JP"}],
+        }
+
+    def test_html_is_not_copied(self, tmp_path):
+        from cache import PageCache
+
+        cache = PageCache(tmp_path / "pages.sqlite3", store_html=True)
+        page = _PayloadPage()
+        result = asyncio.run(render_page(page, "https://example.com/", "json", cache=cache, in_browser=True))
+        assert page.content_calls == 0
+        assert result["addresses"] == ["〒105-0011 東京都港区芝公園4-2-8"]
+        assert cache.get("https://example.com/") == result
+        text = asyncio.run(render_page(_PayloadPage(), "https://example.com/", "text", in_browser=True))
+        assert text == result["text"]
+        cache.close()
+
+    def test_json_fields_do_not_depend_on_where_text_is_extracted(self):
+        page = _PayloadPage()
+        page.html = ("<html><head><title>会社概要</title><meta name='description' content='東京タワーの会社概要です。'>"
+                     f"<script type='application/ld+json'>{LD_JSON}</script></head>"
+                     "<body><p>所在地</p><address>〒105-0011<br>東京都港区芝公園4-2-8</address></body></html>")
+        in_browser = asyncio.run(render_page(_PayloadPage(), "https://example.com/", "json", in_browser=True))
+        from_html = asyncio.run(render_page(page, "https://example.com/", "json"))
+        assert set(from_html) == set(in_browser)
+        for key in ("description", "addresses", "postal_addresses"):
+            assert from_html[key] == in_browser[key]
+
+    def test_html_format_still_serializes_the_dom(self):
+        page = _PayloadPage()
+        assert asyncio.run(render_page(page, "https://example.com/", "html", in_browser=True)) == ADDRESS_HTML
+        assert page.content_calls == 1
+
+
+class TestAddressPattern:
+    """Test suite for ADDRESS_RE (the "address" wait mode's trigger)."""
+
+    @pytest.mark.parametrize("text", [
+        "所在地：東京都港区芝公園4-2-8",
+        "〒060-0001 北海道札幌市中央区北1条西2丁目",
+        "京都府京都市下京区烏丸通七条下ル",
+        "青森県上北郡六戸町大字犬落瀬",
+    ])
+    def test_addresses(self, text):
+        assert ADDRESS_RE.search(text)
+
+    @pytest.mark.parametrize("text", ["読み込み中…", "東京都 へようこそ。区民の皆様へ", "Loading"])
+    def test_not_addresses(self, text):
+        assert not ADDRESS_RE.search(text)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,11 +1,23 @@
 """Tests for HTML text extraction module."""
 
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import extract
 import pytest
-from extract import extract_text, extract_text_simple
+from extract import (BACKENDS, extract_page, extract_text, extract_text_lxml, extract_text_simple,
+                     page_metadata, postal_addresses)
 
 
 class TestExtractText:
-    """Test suite for extract_text function."""
+    """Test suite for extract_text function (run once per backend)."""
+
+    @pytest.fixture(autouse=True, params=BACKENDS)
+    def backend(self, request, monkeypatch):
+        monkeypatch.setattr(extract, "DEFAULT_BACKEND", request.param)
+        return request.param
 
     def test_simple_html(self):
         """Test extraction from simple HTML."""
@@ -241,6 +253,146 @@ class TestExtractTextSimple:
         assert "Line 2" in result
 
 
+def _random_document(rng):
+    """A well-formed page mixing the whitespace cases extract_text cleans up."""
+    texts = ["東京都港区芝公園4丁目2番8号", "TEL 03-1234-5678", "AT&amp;T", "&nbsp;", "a  b",
+             " ", "  ", "\n", "\n  \n", "\t", "営業時間 9:00～18:00", "&lt;x&gt;", "&#12354;"]
+    voids = ["<br>", "<!-- comment -->", "<img src='x.png'>", "<script>var a = '<p>x</p>';</script>",
+             "<noscript>JavaScript</noscript>"]
+    inline = ["span", "b", "em", "strong", "small"]
+    flow = ["div", "section", "li", "td", "p", "h2", "address", "pre"]
+    # Elements that may only contain phrasing content
+    phrasing_only = {"p", "h2", "address", "pre"}
+
+    def node(depth, phrasing):
+        roll = rng.random()
+        if depth > 3 or roll < 0.35:
+            return rng.choice(texts)
+        if roll < 0.45:
+            return rng.choice(voids)
+        tag = rng.choice(inline) if phrasing or roll < 0.7 else rng.choice(flow)
+        inner_phrasing = phrasing or tag in inline or tag in phrasing_only
+        children = "".join(node(depth + 1, inner_phrasing) for _ in range(rng.randint(0, 4)))
+        if tag == "td":
+            return f"<table><tr><td>{children}</td></tr></table>"
+        if tag == "li":
+            return f"<ul><li>{children}</li></ul>"
+        return f"<{tag} class='c'>{children}</{tag}>"
+
+    body = "".join(node(0, False) for _ in range(rng.randint(1, 8)))
+    head = "<title>会社概要</title><style>p { color: red }</style>"
+    return f"<!DOCTYPE html>\n<html><head>{head}</head><body>{body}</body></html>"
+
+
+class TestBackendConformance:
+    """The lxml backend gives the same text as the bs4 backend."""
+
+    PAGES = [
+        "<html><body><p>Hello World</p></body></html>",
+        "<p>Test <strong>bold</strong> text</p>",
+        "<div>\n  <h1>会社概要</h1>\n  <p>所在地：東京都港区芝公園4-2-8</p>\n</div>",
+        "<p>a  b</p>  <p> c </p>\n\n\n<p>d</p>",
+        "<table>\n<tr>\n <td>住所</td>\n <td>東京都港区\n 芝公園4-2-8</td>\n</tr>\n</table>",
+        "<p>TEL&nbsp;03-1234-5678 &nbsp; FAX&#x3000;03-1234-5679</p>",
+        "<pre>  keep\n\n   spacing  </pre><textarea> a\n b </textarea>",
+        "<!-- header --><p>x<!-- inline -->y</p><?php echo 1; ?>",
+        "<p>a</p><template><p>template row</p></template><p>b</p>",
+        "<head><script>document.write('<p>no</p>')</script></head><body>yes<noscript>no</noscript></body>",
+        "東京都港区芝公園4丁目2番8号",
+    ]
+
+    @pytest.mark.parametrize("html", PAGES)
+    def test_pages(self, html):
+        assert extract_text_lxml(html) == extract_text(html, backend="bs4")
+
+    def test_random_well_formed_pages(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            html = _random_document(rng)
+            assert extract_text_lxml(html) == extract_text(html, backend="bs4"), html
+
+    def test_comment_only_document(self):
+        assert extract_text_lxml("<!-- nothing -->") == extract_text("<!-- nothing -->", backend="bs4") == ""
+
+    def test_bs4_backend_does_not_need_lxml(self):
+        code = ("import sys; sys.modules['lxml'] = None\n"
+                "from extract import extract_text; print(extract_text('<p>x</p>', backend='bs4'))")
+        result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent,
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout == "x\n"
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown extract_text backend"):
+            extract_text("<p>x</p>", backend="selectolax")
+
+
+class TestPostalAddresses:
+    """Test suite for postal_addresses (JSON-LD)."""
+
+    def test_nested_and_listed_addresses(self):
+        blocks = [
+            """{"@type": "LocalBusiness", "name": "クリニック",
+                "address": {"@type": "schema:PostalAddress", "addressRegion": "大阪府",
+                            "addressLocality": "大阪市北区", "streetAddress": "梅田1-1-1",
+                            "postalCode": 5300001}}""",
+            """[{"@type": ["Place"], "location": {"address": {"@type": "http://schema.org/PostalAddress",
+                "addressLocality": "札幌市", "addressCountry": {"@type": "Country", "name": "JP"}}}}]""",
+        ]
+        assert postal_addresses(blocks) == [
+            {"postalCode": "5300001", "addressRegion": "大阪府", "addressLocality": "大阪市北区",
+             "streetAddress": "梅田1-1-1"},
+            {"addressLocality": "札幌市", "addressCountry": "JP"},
+        ]
+
+    def test_invalid_duplicate_and_other_blocks(self):
+        address = '{"@type": "PostalAddress", "streetAddress": "芝公園4-2-8\n"}'
+        blocks = [address, address, "{'@type': 'PostalAddress'}", '{"@type": "Organization", "address": "東京都"}']
+        assert postal_addresses(blocks) == [{"streetAddress": "芝公園4-2-8"}]
+
+
+class TestPageMetadata:
+    """Test suite for page_metadata (static-HTML counterpart of in-browser extraction)."""
+
+    def test_fields(self):
+        html = """<html><head><META NAME="Description" content=""><meta property="og:description" content=" 概要 ">
+        <script type="application/LD+JSON">{"@type": "PostalAddress", "addressRegion": "東京都"}</script></head>
+        <body><address>〒105-0011<br>東京都港区<p>芝公園4-2-8</p><script>x()</script></address><address> </address>
+        </body></html>"""
+        assert page_metadata(html) == {
+            "description": "概要",
+            "addresses": ["〒105-0011 東京都港区 芝公園4-2-8"],
+            "postal_addresses": [{"addressRegion": "東京都"}],
+        }
+
+    def test_empty_page(self):
+        assert page_metadata("") == {"description": "", "addresses": [], "postal_addresses": []}
+
+
+
+class TestExtractPage:
+    """extract_page gives extract_text and page_metadata from one parse."""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_same_as_separate_calls(self, backend):
+        html = """<html><head><meta name="description" content="概要">
+        <script type="application/ld+json">{"@type": "PostalAddress", "addressRegion": "東京都"}</script></head>
+        <body><h1>会社概要</h1><address>〒105-0011<br>東京都港区<p>芝公園4-2-8</p><script>x()</script></address>
+        </body></html>"""
+        assert extract_page(html, backend) == (extract_text(html, backend=backend), page_metadata(html))
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_random_well_formed_pages(self, backend):
+        rng = random.Random(1)
+        for _ in range(200):
+            html = _random_document(rng)
+            assert extract_page(html, backend) == (extract_text(html, backend=backend), page_metadata(html)), html
+
+    def test_empty_html(self):
+        with pytest.raises(ValueError):
+            extract_page("   ")
+
+
 class TestComparison:
     """Test comparing both extraction methods."""
 
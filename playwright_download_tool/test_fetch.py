@@ -0,0 +1,213 @@
+"""Tests for the two-tier (HTTP first, then browser) page fetcher."""
+
+import asyncio
+import threading
+
+import fetch as fetch_module
+import httpx
+import pytest
+from fetch import TieredFetcher, decode_html, detect_encoding, escalation_reason, extract_title
+
+ADDRESS_TEXT = "東京タワー 所在地 東京都港区芝公園4丁目2番8号 " + "営業時間のご案内 " * 30
+
+STATIC_PAGE = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>東京タワー &amp; 会社概要</title>
+<meta name="description" content="東京タワーの会社概要"></head>
+<body><p>{ADDRESS_TEXT}</p><address>東京都港区芝公園4丁目2番8号</address></body></html>"""
+
+JS_SHELL = """<!DOCTYPE html>
+<html><head><title>App</title><script src="/main.js"></script></head>
+<body><noscript>You need to enable JavaScript to run this app.</noscript><div id="root"></div></body></html>"""
+
+
+class _FakePool:
+    """Stands in for pool.BrowserPool (no Chromium needed)."""
+
+    def __init__(self):
+        self.urls = []
+        self.deadlines = []
+        self.launches = 0
+        self.closed = False
+
+    async def fetch(self, url, output_format="json", deadline=None):
+        if not self.launches:
+            self.launches = 1
+        self.urls.append(url)
+        self.deadlines.append(deadline)
+        return {"title": "rendered", "text": "rendered text"}
+
+    async def close(self):
+        self.closed = True
+
+
+def _site(routes):
+    """httpx client serving {path: (status, content_type, body bytes)}."""
+
+    def handler(request):
+        status, content_type, body = routes[request.url.path]
+        return httpx.Response(status, headers={"content-type": content_type}, content=body)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestDetectEncoding:
+    """Test suite for detect_encoding / decode_html."""
+
+    def test_header_charset_wins(self):
+        body = STATIC_PAGE.encode("euc_jp")
+        assert detect_encoding(body, "text/html; charset=EUC-JP") == "euc_jis_2004"
+        assert "東京都港区芝公園" in decode_html(body, "text/html; charset=EUC-JP")
+
+    def test_meta_charset(self):
+        html = STATIC_PAGE.replace('charset="utf-8"', 'charset="Shift_JIS"')
+        body = html.encode("cp932")
+        assert detect_encoding(body, "text/html") == "cp932"
+        assert "東京都港区芝公園" in decode_html(body, "text/html")
+
+    def test_http_equiv_meta(self):
+        html = STATIC_PAGE.replace('<meta charset="utf-8">',
+                                   '<meta http-equiv="Content-Type" content="text/html; charset=x-sjis">')
+        assert detect_encoding(html.encode("cp932")) == "cp932"
+
+    def test_guess_without_declaration(self):
+        html = STATIC_PAGE.replace('<meta charset="utf-8">', "")
+        assert detect_encoding(html.encode("utf-8")) == "utf-8"
+        assert detect_encoding(html.encode("cp932")) == "cp932"
+        assert "東京都港区芝公園" in decode_html(html.encode("euc_jp"))
+
+    def test_guess_euc_jp_that_also_decodes_as_cp932(self):
+        body = "<html><body><p>大阪市北区梅田 本店 営業時間</p></body></html>".encode("euc_jp")
+        body.decode("cp932")
+        assert detect_encoding(body) == "euc_jis_2004"
+        assert "大阪市北区梅田" in decode_html(body)
+
+    def test_bom(self):
+        body = b"\xef\xbb\xbf" + "<p>東京都</p>".encode("utf-8")
+        assert decode_html(body, "text/html; charset=unknown-charset") == "<p>東京都</p>"
+
+
+class TestEscalation:
+    """Test suite for escalation_reason and extract_title."""
+
+    def test_static_page_is_usable(self):
+        assert escalation_reason(STATIC_PAGE, ADDRESS_TEXT) is None
+
+    def test_js_shell(self):
+        assert escalation_reason(JS_SHELL, "You need to enable JavaScript") == "js_shell"
+
+    def test_short_text(self):
+        assert escalation_reason("<p>Loading...</p>", "Loading...") == "short_text"
+
+    def test_title(self):
+        assert extract_title(STATIC_PAGE) == "東京タワー & 会社概要"
+        assert extract_title("<p>no title</p>") == ""
+
+
+class TestTieredFetcher:
+    """Test suite for TieredFetcher."""
+
+    def test_static_page_skips_browser(self):
+        pool = _FakePool()
+        decisions = []
+        client = _site({"/": (200, "text/html; charset=Shift_JIS", STATIC_PAGE.encode("cp932"))})
+
+        async def run():
+            async with TieredFetcher(pool, client=client, on_decision=lambda *d: decisions.append(d)) as fetcher:
+                return await fetcher.fetch("https://example.com/", "json"), fetcher.stats()
+
+        result, stats = asyncio.run(run())
+        assert result["title"] == "東京タワー & 会社概要"
+        assert "東京都港区芝公園4丁目2番8号" in result["text"]
+        # Same fields as a page rendered with in-browser extraction
+        assert result["description"] == "東京タワーの会社概要"
+        assert result["addresses"] == ["東京都港区芝公園4丁目2番8号"]
+        assert result["postal_addresses"] == []
+        assert pool.urls == []
+        assert decisions == [("https://example.com/", "http", None)]
+        assert stats == {"http": 1, "browser": 0, "escalations": {}, "browser_launches": 0}
+
+    def test_unusable_pages_escalate(self):
+        pool = _FakePool()
+        client = _site({
+            "/spa": (200, "text/html", JS_SHELL.encode()),
+            "/forbidden": (403, "text/html", b"Forbidden"),
+            "/file.pdf": (200, "application/pdf", b"%PDF-1.4"),
+            "/ok": (200, "text/html", STATIC_PAGE.encode()),
+        })
+        urls = [f"https://example.com{p}" for p in ("/spa", "/forbidden", "/file.pdf", "/ok")]
+
+        async def run():
+            fetcher = TieredFetcher(pool, client=client)
+            results = await fetcher.fetch_many(urls, "text")
+            await fetcher.close()
+            return results, fetcher.stats()
+
+        results, stats = asyncio.run(run())
+        assert results[0] == {"title": "rendered", "text": "rendered text"}
+        assert "東京都港区芝公園" in results[3]
+        assert sorted(pool.urls) == sorted(urls[:3])
+        assert stats["http"] == 1 and stats["browser"] == 3
+        assert stats["escalations"] == {"js_shell": 1, "status": 1, "not_html": 1}
+        assert pool.closed
+
+    def test_transport_error_without_pool_raises(self):
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        fetcher = TieredFetcher(client=client)
+        with pytest.raises(Exception, match="error"):
+            asyncio.run(fetcher.fetch("https://example.com/"))
+
+    def test_slow_static_fetch_leaves_the_rest_of_the_deadline_to_the_browser(self):
+        async def handler(request):
+            await asyncio.sleep(5)
+            return httpx.Response(200, headers={"content-type": "text/html"}, content=STATIC_PAGE.encode())
+
+        pool = _FakePool()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        fetcher = TieredFetcher(pool, client=client, deadline=0.6)
+
+        async def run():
+            start = asyncio.get_running_loop().time()
+            result = await fetcher.fetch("https://example.com/")
+            return result, asyncio.get_running_loop().time() - start
+
+        result, elapsed = asyncio.run(run())
+        assert result["title"] == "rendered"
+        assert fetcher.stats()["escalations"] == {"error": 1}
+        assert elapsed < 0.5
+        # The HTTP tier used at most half of the budget
+        assert 0.2 < pool.deadlines[0] <= 0.3
+
+    def test_parsing_runs_off_the_event_loop(self, monkeypatch):
+        threads = []
+        read_page = fetch_module._read_page
+
+        def _read_page(content, content_type):
+            threads.append(threading.current_thread())
+            return read_page(content, content_type)
+
+        monkeypatch.setattr(fetch_module, "_read_page", _read_page)
+        client = _site({"/": (200, "text/html", STATIC_PAGE.encode())})
+        result = asyncio.run(TieredFetcher(client=client).fetch("https://example.com/", "text"))
+        assert "東京都港区芝公園" in result
+        assert threads and threads[0] is not threading.main_thread()
+
+    def test_static_page_is_cached(self, tmp_path):
+        from cache import PageCache
+
+        cache = PageCache(tmp_path / "pages.sqlite3", store_html=True)
+        client = _site({"/": (200, "text/html", STATIC_PAGE.encode())})
+        fetcher = TieredFetcher(_FakePool(), client=client, cache=cache)
+        asyncio.run(fetcher.fetch("https://example.com/"))
+        assert cache.get("https://example.com/", "html") == STATIC_PAGE
+        cached = asyncio.run(fetcher.fetch("https://example.com/"))
+        assert cached["title"] == "東京タワー & 会社概要"
+        assert cached["addresses"] == ["東京都港区芝公園4丁目2番8号"]
+        assert fetcher.stats()["http"] == 1
+        cache.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
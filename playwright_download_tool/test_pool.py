@@ -0,0 +1,148 @@
+"""Tests for the browser pool (no Chromium needed)."""
+
+import asyncio
+
+import pool as pool_module
+import pytest
+from pool import BrowserPool
+
+
+class _FakeContext:
+    async def new_page(self):
+        return object()
+
+    async def close(self):
+        pass
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    async def new_context(self):
+        return _FakeContext()
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeChromium:
+    """chromium.launch() that fails while *fail* is set."""
+
+    def __init__(self):
+        self.fail = False
+        self.launches = 0
+
+    async def launch(self, **options):
+        if self.fail:
+            raise RuntimeError("launch failed")
+        self.launches += 1
+        return _FakeBrowser()
+
+
+class _FakePlaywright:
+    def __init__(self):
+        self.chromium = _FakeChromium()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    playwright = _FakePlaywright()
+    monkeypatch.setattr(pool_module, "async_playwright", lambda: playwright)
+    return playwright
+
+
+def _render_after(seconds_by_url):
+    async def render_page(page, url, output_format, *args):
+        await asyncio.sleep(seconds_by_url.get(url, 0.0))
+        return {"title": url, "text": ""}
+    return render_page
+
+
+class TestTimeout:
+    """Test suite for BrowserPool(timeout=...)."""
+
+    def test_time_waiting_for_a_browser_is_not_counted(self, fake_playwright, monkeypatch):
+        monkeypatch.setattr(pool_module, "render_page", _render_after({f"u{i}": 0.15 for i in range(4)}))
+        urls = [f"u{i}" for i in range(4)]
+
+        async def run():
+            async with BrowserPool(size=1, contexts_per_browser=1, timeout=0.3) as pool:
+                return await pool.fetch_many(urls)
+
+        results = asyncio.run(run())
+        assert [r["title"] for r in results] == urls
+
+    def test_slow_page_times_out(self, fake_playwright, monkeypatch):
+        monkeypatch.setattr(pool_module, "render_page", _render_after({"slow": 5.0}))
+
+        async def run():
+            async with BrowserPool(size=1, timeout=0.1) as pool:
+                return await pool.fetch_many(["slow", "fast"])
+
+        slow, fast = asyncio.run(run())
+        assert isinstance(slow, Exception) and "timed out" in str(slow)
+        assert fast == {"title": "fast", "text": ""}
+
+    def test_caller_deadline_shortens_the_load_deadline(self, fake_playwright, monkeypatch):
+        deadlines = []
+
+        async def render_page(page, url, output_format, cache, wait, deadline, *args):
+            deadlines.append(deadline)
+            return {"title": url, "text": ""}
+
+        monkeypatch.setattr(pool_module, "render_page", render_page)
+
+        async def run():
+            async with BrowserPool(size=1, deadline=20) as pool:
+                await pool.fetch("a", deadline=7.5)
+                await pool.fetch("b", deadline=60)
+                await pool.fetch("c")
+
+        asyncio.run(run())
+        assert deadlines == [7.5, 20, 20]
+
+
+class TestRecycling:
+    """Test suite for relaunching browsers."""
+
+    def test_recycled_browser_is_replaced(self, fake_playwright, monkeypatch):
+        monkeypatch.setattr(pool_module, "render_page", _render_after({}))
+
+        async def run():
+            async with BrowserPool(size=1, max_pages_per_browser=1) as pool:
+                results = [await pool.fetch(url) for url in ("a", "b", "c")]
+                return results, pool.stats()
+
+        results, stats = asyncio.run(run())
+        assert [r["title"] for r in results] == ["a", "b", "c"]
+        assert stats["recycles"] == 3 and stats["launch_failures"] == 0
+
+    def test_failed_relaunch_drops_the_slot(self, fake_playwright, monkeypatch):
+        monkeypatch.setattr(pool_module, "render_page", _render_after({}))
+
+        async def run():
+            async with BrowserPool(size=2, max_pages_per_browser=1, contexts_per_browser=1) as pool:
+                fake_playwright.chromium.fail = True
+                # The page that triggers the failed relaunch still gets its result
+                first = await pool.fetch("a")
+                second = await pool.fetch("b")
+                # No browser left: fetches raise instead of waiting forever
+                rest = await asyncio.wait_for(pool.fetch_many(["c"]), 1.0)
+                return first, second, rest, pool.stats()
+
+        first, second, rest, stats = asyncio.run(run())
+        assert first["title"] == "a" and second["title"] == "b"
+        assert isinstance(rest[0], RuntimeError)
+        assert stats["launch_failures"] == 2
+        assert stats["browsers"] == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
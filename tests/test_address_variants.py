@@ -21,13 +21,10 @@ Covers:
 """
 
 import json
-import sys
-from pathlib import Path
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent / ".claude" / "skills" / "compare_address_full_skill"))
-from compare_address_full import compare_addresses, normalize_address
+from compare_address_full_tool import compare_addresses, normalize_address
 from extract_full_address_tool import extract_full_addresses_list
 
 # Address as it appears in tokyotower.co.jp/company/ HTML
@@ -0,0 +1,169 @@
+"""Tests for google_search_tool.client (AsyncSearchClient).
+
+Requests go to a local stub HTTP server, so no API key or network is needed.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from google_search_tool import AsyncSearchClient
+from google_search_tool.cache import SearchCache
+from google_search_tool.client import TokenBucket, format_results
+
+
+class StubCSE:
+    """Local stand-in for the Custom Search API.
+
+    Every query gets one result whose title is the query.  Queries listed in
+    ``failures`` first answer with the given status codes, in order.
+    """
+
+    def __init__(self):
+        self.failures = {}
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay = 0.0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                with stub._lock:
+                    stub.requests.append(params)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    pending = stub.failures.get(params["q"])
+                    status = pending.pop(0) if pending else 200
+                time.sleep(stub.delay)
+                if status == 200:
+                    body = {"items": [{"title": params["q"], "link": f"https://example.com/{params['q']}", "snippet": ""}]}
+                else:
+                    body = {"error": {"code": status}}
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with stub._lock:
+                    stub.in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/customsearch/v1"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubCSE()
+    yield server
+    server.close()
+
+
+def _client(stub, **kwargs):
+    options = {"api_key": "test-api-key", "cse_id": "test-cse-id", "base_url": stub.url,
+               "rate": 1000, "burst": 1000, "backoff": 0.01}
+    options.update(kwargs)
+    return AsyncSearchClient(**options)
+
+
+class TestAsyncSearchClient:
+    """Tests for AsyncSearchClient against the stub server."""
+
+    async def test_search(self, stub):
+        """Test that a search returns the same shape as search()."""
+        async with _client(stub) as client:
+            result = await client.search("東京タワー", num_results=3)
+        assert result == {
+            "results": [{"title": "東京タワー", "link": "https://example.com/東京タワー", "snippet": ""}],
+            "count": 1,
+        }
+        assert stub.requests[0] == {"key": "test-api-key", "cx": "test-cse-id", "q": "東京タワー", "num": "3"}
+
+    async def test_retries_429_and_5xx(self, stub):
+        """Test that transient errors are retried until success."""
+        stub.failures["q"] = [429, 503]
+        async with _client(stub) as client:
+            result = await client.search("q")
+        assert result["count"] == 1
+        assert client.retries == 2
+        assert len(stub.requests) == 3
+
+    async def test_gives_up_after_max_retries(self, stub):
+        """Test that the last error is returned when retries run out."""
+        stub.failures["q"] = [500, 500, 500]
+        async with _client(stub, max_retries=2) as client:
+            result = await client.search("q")
+        assert "status 500" in result["error"]
+        assert len(stub.requests) == 3
+
+    async def test_client_errors_are_not_retried(self, stub):
+        """Test that 4xx errors other than 429 fail immediately."""
+        stub.failures["q"] = [403]
+        async with _client(stub) as client:
+            result = await client.search("q")
+        assert "status 403" in result["error"]
+        assert len(stub.requests) == 1
+
+    async def test_search_many_keeps_order_under_concurrency_cap(self, stub):
+        """Test that search_many returns results in query order."""
+        stub.delay = 0.02
+        queries = [f"q{i}" for i in range(40)]
+        async with _client(stub, concurrency=4) as client:
+            results = await client.search_many(iter(queries), num_results=1)
+        assert [r["results"][0]["title"] for r in results] == queries
+        assert stub.max_in_flight <= 4
+
+    async def test_search_many_uses_cache(self, stub, tmp_path):
+        """Test that cached queries are not sent again."""
+        cache = SearchCache(str(tmp_path / "search.sqlite3"))
+        async with _client(stub, cache=cache) as client:
+            await client.search_many(["a", "b"])
+            results = await client.search_many(["a", "b", "c"])
+        assert [r["results"][0]["title"] for r in results] == ["a", "b", "c"]
+        assert len(stub.requests) == 3
+
+    async def test_missing_credentials(self, stub):
+        """Test that missing credentials are reported without a request."""
+        async with _client(stub, api_key="", cse_id="") as client:
+            result = await client.search("q")
+        assert "error" in result
+        assert stub.requests == []
+
+
+class TestTokenBucket:
+    """Tests for the token bucket rate limiter."""
+
+    async def test_rate_is_enforced_after_burst(self):
+        """Test that requests beyond the burst wait for new tokens."""
+        bucket = TokenBucket(rate=50, capacity=5)
+        start = time.monotonic()
+        for _ in range(15):
+            await bucket.acquire()
+        # 5 immediate + 10 at 50/s ≈ 0.2 s
+        assert time.monotonic() - start >= 0.18
+
+    def test_rate_must_be_positive(self):
+        """Test that a non-positive rate is rejected."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+
+
+def test_format_results_empty():
+    """Test that a response without items has no results."""
+    assert format_results({}) == {"results": [], "count": 0}
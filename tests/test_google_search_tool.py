@@ -11,6 +11,7 @@ import pytest
 from pytest_httpx import HTTPXMock
 
 from google_search_tool import search
+from google_search_tool.cache import SearchCache, normalize_query
 
 
 @pytest.fixture
@@ -286,6 +287,73 @@ class TestSearch:
             assert result["results"][i - 1]["snippet"] == f"Snippet for result {i}"
 
 
+class TestSearchCache:
+    """Tests for the persistent search cache."""
+
+    def test_normalize_query(self):
+        """Test that width, case and whitespace differences are ignored."""
+        assert normalize_query("  東京タワー　東京都港区 ") == "東京タワー 東京都港区"
+        assert normalize_query("ＴＥＳＴ  Query") == "test query"
+
+    def test_second_search_is_served_from_cache(
+        self, httpx_mock: HTTPXMock, mock_env_vars, sample_search_response, tmp_path
+    ):
+        """Test that a repeated query does not call the API again."""
+        httpx_mock.add_response(json=sample_search_response)
+        cache = SearchCache(str(tmp_path / "search.sqlite3"))
+
+        first = search("test query", num_results=3, cache=cache)
+        second = search("TEST　query", num_results=3, cache=cache)
+
+        assert second == first
+        assert len(httpx_mock.get_requests()) == 1
+        assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_num_results_is_part_of_the_key(
+        self, httpx_mock: HTTPXMock, mock_env_vars, sample_search_response, tmp_path
+    ):
+        """Test that a different num_results is a separate entry."""
+        httpx_mock.add_response(json=sample_search_response)
+        httpx_mock.add_response(json=sample_search_response)
+        cache = SearchCache(str(tmp_path / "search.sqlite3"))
+
+        search("test query", num_results=3, cache=cache)
+        search("test query", num_results=5, cache=cache)
+
+        assert len(httpx_mock.get_requests()) == 2
+
+    def test_errors_are_not_cached(self, httpx_mock: HTTPXMock, mock_env_vars, tmp_path):
+        """Test that failed searches are retried."""
+        httpx_mock.add_response(status_code=500, text="Internal Server Error")
+        httpx_mock.add_response(json={"items": []})
+        cache = SearchCache(str(tmp_path / "search.sqlite3"))
+
+        assert "error" in search("test query", cache=cache)
+        assert search("test query", cache=cache) == {"results": [], "count": 0}
+
+    def test_cache_only_miss_does_not_call_api(self, mock_env_vars, tmp_path):
+        """Test that cache-only mode returns an error on a miss."""
+        cache = SearchCache(str(tmp_path / "search.sqlite3"), cache_only=True)
+        result = search("test query", cache=cache)
+        assert "error" in result
+        assert "cache" in result["error"]
+
+    def test_expired_entry_is_a_miss(self, tmp_path):
+        """Test that entries older than ttl are ignored."""
+        cache = SearchCache(str(tmp_path / "search.sqlite3"), ttl=-1)
+        cache.put("test query", 10, {"results": [], "count": 0})
+        assert cache.get("test query", 10) is None
+
+    def test_max_entries_keeps_most_recently_used(self, tmp_path):
+        """Test that the least recently used entries are removed."""
+        cache = SearchCache(str(tmp_path / "search.sqlite3"), max_entries=2)
+        for query in ["a", "b", "c"]:
+            cache.put(query, 10, {"results": [], "count": 0})
+        assert cache.get("a", 10) is None
+        assert cache.get("c", 10) is not None
+        assert cache.stats()["entries"] == 2
+
+
 class TestCLI:
     """Tests for the CLI interface."""
 
@@ -364,6 +432,23 @@ class TestCLI:
         assert "query" in result.stdout
         assert "--num-results" in result.stdout
         assert "--pretty" in result.stdout
+        assert "--cache-only" in result.stdout
+
+    def test_cli_cache_only(self, tmp_path):
+        """Test that --cache-only answers from the cache without API keys."""
+        cache_path = str(tmp_path / "search.sqlite3")
+        cached = {"results": [{"title": "t", "link": "https://example.com", "snippet": "s"}], "count": 1}
+        SearchCache(cache_path).put("test", 10, cached)
+
+        result = subprocess.run(
+            [sys.executable, "-m", "google_search_tool", "test", "--cache", cache_path, "--cache-only"],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "GOOGLE_API_KEY": "", "GOOGLE_CSE_ID": ""},
+        )
+
+        assert result.returncode == 0
+        assert json.loads(result.stdout) == cached
 
     def test_json_output_format(self, httpx_mock: HTTPXMock, mock_env_vars):
         """Test that main function outputs valid JSON."""